@@ -0,0 +1,100 @@
+"""
+Benchmark des profils de connexion : débit de commits d'écriture et latence
+des lectures concurrentes pour chaque profil de PRAGMA.
+
+Usage : python -m benchmarks.bench_connection_profiles [--commits N] [--readers N]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from src.modules.database_connector import ConnectionPool, PRAGMA_PROFILES
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_profile(profile, commits=2000, readers=4, seed_rows=10000):
+    """Mesure un profil sur une base temporaire et retourne les résultats."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pool = ConnectionPool(os.path.join(tmp_dir, "bench.db"), size=readers, profile=profile)
+        try:
+            with pool.writer_connection() as connection:
+                connection.execute("CREATE TABLE sys_logs (id INTEGER PRIMARY KEY, operation_type TEXT, table_name TEXT, details TEXT)")
+                connection.executemany(
+                    "INSERT INTO sys_logs (operation_type, table_name, details) VALUES (?, ?, ?)",
+                    (("SEED", "bench", str(i)) for i in range(seed_rows)),
+                )
+                connection.commit()
+
+            stop = threading.Event()
+            latencies = []
+            latencies_lock = threading.Lock()
+
+            def reader(worker_id):
+                local = []
+                key = worker_id
+                while not stop.is_set():
+                    with pool.reader_connection() as connection:
+                        start = time.perf_counter()
+                        connection.execute("SELECT details FROM sys_logs WHERE id = ?", (key % seed_rows + 1,)).fetchone()
+                        local.append(time.perf_counter() - start)
+                    key += 7919
+                with latencies_lock:
+                    latencies.extend(local)
+
+            threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+            for thread in threads:
+                thread.start()
+
+            start = time.perf_counter()
+            for i in range(commits):
+                with pool.writer_connection() as connection:
+                    connection.execute(
+                        "INSERT INTO sys_logs (operation_type, table_name, details) VALUES (?, ?, ?)",
+                        ("INSERT", "bench", str(i)),
+                    )
+                    connection.commit()
+            elapsed = time.perf_counter() - start
+
+            stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            pool.close()
+
+    return {
+        "profile": profile,
+        "commits_per_sec": round(commits / elapsed, 1),
+        "reads": len(latencies),
+        "read_latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p95": round(_percentile(latencies, 95) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+            "mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--profiles", nargs="*", default=list(PRAGMA_PROFILES))
+    args = parser.parse_args()
+
+    results = [bench_profile(profile, args.commits, args.readers) for profile in args.profiles]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
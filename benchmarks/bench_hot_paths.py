@@ -0,0 +1,322 @@
+"""
+Benchmark des chemins critiques de CRUDOperator, QueryExecutor et SchemaManager sur des
+données synthétiques reproductibles (voir benchmarks.datagen) : insertion unitaire et en
+masse, lecture ponctuelle et par plage, mise à jour et suppression par prédicat,
+changements de schéma, export et pagination. Chaque cas est mesuré pour chaque volumétrie
+et résumé en percentiles (ms) au format JSON.
+
+Le cache de résultats est désactivé par défaut pour mesurer les accès SQLite
+(--result-cache pour le garder actif).
+
+Usage : python -m benchmarks.bench_hot_paths [--rows 1k 100k 10M] [--samples N] [--output results.json]
+        python -m benchmarks.bench_hot_paths --compare baseline.json [--threshold 0.10]
+        python -m benchmarks.bench_hot_paths --input results.json --compare baseline.json
+Avec --compare, le code de sortie vaut 1 si une régression est détectée.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.datagen import BENCH_COLUMNS, chunks, generate_records, generate_rows
+from src.modules.crud_operator import CRUDOperator
+from src.modules.data_viewer import DataViewer
+from src.modules.database_connector import DatabaseConnector
+from src.modules.keyset_paginator import KeysetPaginator
+from src.modules.query_executor import QueryExecutor
+from src.modules.query_profiler import percentile
+from src.modules.schema_manager import SchemaManager
+
+TABLE = "bench_items"
+CASES = (
+    "insert_bulk", "read_point", "read_range", "query_point", "query_aggregate",
+    "paginate_next", "paginate_seek", "export_csv", "update_predicate", "insert_single",
+    "delete_predicate", "add_column", "rename_column", "create_index", "alter_column_type",
+)
+# Métriques comparées au baseline
+COMPARED_METRICS = ("p50_ms", "p95_ms")
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_count(value):
+    """'10k' -> 10000, '10M' -> 10000000"""
+    text = str(value).strip().lower().replace("_", "")
+    if text and text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+def summarize(samples, rows=None):
+    """Percentiles (ms) d'une série de durées en secondes ; débit en lignes/s si `rows` est fourni"""
+    total = sum(samples)
+    summary = {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "max_ms": round(max(samples) * 1000, 3) if samples else 0.0,
+        "total_s": round(total, 4),
+    }
+    if rows is not None:
+        summary["rows_per_sec"] = round(rows / total, 1) if total else 0.0
+    return summary
+
+
+def _timed(action, count):
+    """Exécute action(i) `count` fois et retourne la durée de chaque appel"""
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        action(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class HotPathBenchmark:
+    """Une volumétrie : base temporaire, chargement, puis les cas dans l'ordre de CASES"""
+
+    def __init__(self, db_path, rows, samples=200, repeat=3, batch_size=10000, span=100,
+                 seed=42, result_cache=False):
+        self.db_path = db_path
+        self.rows = rows
+        self.samples = samples
+        self.repeat = repeat
+        self.batch_size = batch_size
+        self.span = max(1, min(span, rows))
+        self.seed = seed
+        self.result_cache = result_cache
+        self.rng = random.Random(seed)
+
+    def _random_id(self, *_):
+        return self.rng.randint(1, self.rows)
+
+    def _random_range(self, *_):
+        start = self.rng.randint(1, self.rows - self.span + 1)
+        return start, start + self.span - 1
+
+    def run(self, cases=CASES):
+        DatabaseConnector._instance = None
+        self.connector = DatabaseConnector(self.db_path)
+        try:
+            self.schema = SchemaManager(self.db_path)
+            self.crud = CRUDOperator(self.db_path)
+            self.executor = QueryExecutor(self.db_path)
+            self.viewer = DataViewer(self.db_path)
+            self.connector.get_result_cache().enabled = self.result_cache
+            self.schema.create_table(TABLE, BENCH_COLUMNS)
+            results = {}
+            # Le chargement est toujours exécuté : les autres cas en dépendent
+            load = self.bench_insert_bulk()
+            if "insert_bulk" in cases:
+                results["insert_bulk"] = load
+            # Ordre de CASES quel que soit l'ordre demandé : les cas de schéma modifient la table en dernier
+            for case in CASES:
+                if case in cases and case != "insert_bulk":
+                    results[case] = getattr(self, f"bench_{case}")()
+            return results
+        finally:
+            self.connector.close_connection()
+            DatabaseConnector._instance = None
+
+    def bench_insert_bulk(self):
+        # Lots générés hors chronomètre : seul create_many est mesuré
+        samples = []
+        for chunk in chunks(generate_rows(self.rows, self.seed), self.batch_size):
+            start = time.perf_counter()
+            self.crud.create_many(TABLE, chunk, batch_size=len(chunk))
+            samples.append(time.perf_counter() - start)
+        return summarize(samples, self.rows)
+
+    def bench_read_point(self):
+        ids = [self._random_id() for _ in range(self.samples)]
+        return summarize(_timed(lambda i: self.crud.read(TABLE, "WHERE id = ?", (ids[i],)), self.samples))
+
+    def bench_read_range(self):
+        ranges = [self._random_range() for _ in range(self.samples)]
+        samples = _timed(lambda i: self.crud.read(TABLE, "WHERE id BETWEEN ? AND ?", ranges[i]), self.samples)
+        return summarize(samples, self.span * self.samples)
+
+    def bench_query_point(self):
+        ids = [self._random_id() for _ in range(self.samples)]
+        query = f"SELECT * FROM {TABLE} WHERE id = ?"
+        return summarize(_timed(lambda i: self.executor.execute_query(query, (ids[i],)), self.samples))
+
+    def bench_query_aggregate(self):
+        ranges = [self._random_range() for _ in range(self.samples)]
+        query = f"""
+            SELECT category, COUNT(*) AS items, AVG(price) AS avg_price, SUM(quantity) AS quantity
+            FROM {TABLE} WHERE id BETWEEN ? AND ? GROUP BY category
+        """
+        return summarize(_timed(lambda i: self.executor.execute_query(query, ranges[i]), self.samples))
+
+    def bench_paginate_next(self):
+        paginator = KeysetPaginator(self.connector, TABLE, key="id", page_size=self.span)
+        paginator.first_page()
+        pages = max(1, self.rows // self.span)
+
+        def next_page(i):
+            # Retour en tête à la dernière page
+            if paginator.page + 1 >= pages:
+                paginator.first_page()
+            else:
+                paginator.next_page()
+
+        return summarize(_timed(next_page, self.samples))
+
+    def bench_paginate_seek(self):
+        paginator = KeysetPaginator(self.connector, TABLE, key="id", page_size=self.span)
+        pages = max(1, self.rows // self.span)
+        targets = [self.rng.randrange(pages) for _ in range(self.samples)]
+        return summarize(_timed(lambda i: paginator.goto_page(targets[i]), self.samples))
+
+    def bench_export_csv(self):
+        path = os.path.join(os.path.dirname(self.db_path), "export.csv")
+        samples = _timed(lambda i: self.viewer.export_data(TABLE, path), self.repeat)
+        os.remove(path)
+        return summarize(samples, self.rows * self.repeat)
+
+    def bench_update_predicate(self):
+        ranges = [self._random_range() for _ in range(self.samples)]
+        samples = _timed(lambda i: self.crud.update(TABLE, {"quantity": i % 100 + 1}, "id BETWEEN ? AND ?", ranges[i]),
+                         self.samples)
+        return summarize(samples, self.span * self.samples)
+
+    def bench_insert_single(self):
+        records = list(generate_records(self.samples, self.seed + 1))
+        return summarize(_timed(lambda i: self.crud.create(TABLE, records[i]), self.samples))
+
+    def bench_delete_predicate(self):
+        # Blocs disjoints : chaque suppression porte sur `span` lignes existantes
+        blocks = self.rng.sample(range(self.rows // self.span), min(self.samples, self.rows // self.span))
+        samples = _timed(
+            lambda i: self.crud.delete(TABLE, "id BETWEEN ? AND ?",
+                                       (blocks[i] * self.span + 1, (blocks[i] + 1) * self.span)),
+            len(blocks),
+        )
+        return summarize(samples, self.span * len(blocks))
+
+    def bench_add_column(self):
+        return summarize(_timed(lambda i: self.schema.add_column(TABLE, f"extra_{i}", "TEXT"), self.repeat))
+
+    def bench_rename_column(self):
+        names = ("notes", "comments")
+        return summarize(_timed(lambda i: self.schema.rename_column(TABLE, names[i % 2], names[(i + 1) % 2]),
+                                self.repeat))
+
+    def bench_create_index(self):
+        def create_and_drop(i):
+            name = self.schema.create_index(TABLE, ["category", "price"], f"idx_bench_{i}")
+            self.schema.drop_index(name)
+
+        return summarize(_timed(create_and_drop, self.repeat))
+
+    def bench_alter_column_type(self):
+        # Reconstruction complète de la table, par lots
+        types = ("NUMERIC", "REAL")
+        samples = _timed(lambda i: self.schema.alter_column_type(TABLE, "price", types[i % 2],
+                                                                 batch_size=self.batch_size), self.repeat)
+        return summarize(samples, self.rows * self.repeat)
+
+
+def run(row_counts, cases=CASES, **options):
+    """Exécute les cas pour chaque volumétrie et retourne le document JSON (meta + résultats)"""
+    results = {}
+    for rows in row_counts:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            benchmark = HotPathBenchmark(os.path.join(tmp_dir, "bench.db"), rows, **options)
+            results[str(rows)] = benchmark.run(cases)
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "rows": list(row_counts),
+            "options": options,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.10, min_delta_ms=0.05):
+    """
+    Compare deux documents de résultats cas par cas et volumétrie par volumétrie.
+    Une métrique de COMPARED_METRICS est en régression si elle dépasse le baseline de plus de
+    `threshold` (fraction) et d'au moins `min_delta_ms` (bruit des mesures sub-milliseconde).
+    """
+    comparisons = []
+    for rows, cases in current["results"].items():
+        for case, summary in cases.items():
+            reference = baseline.get("results", {}).get(rows, {}).get(case)
+            if reference is None:
+                continue
+            for metric in COMPARED_METRICS:
+                before, after = reference[metric], summary[metric]
+                change = (after - before) / before if before else 0.0
+                if change > threshold and after - before >= min_delta_ms:
+                    status = "regression"
+                elif change < -threshold and before - after >= min_delta_ms:
+                    status = "improvement"
+                else:
+                    status = "ok"
+                comparisons.append({
+                    "case": case,
+                    "rows": int(rows),
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": round(change, 4),
+                    "status": status,
+                })
+    regressions = [item for item in comparisons if item["status"] == "regression"]
+    return {"threshold": threshold, "regressions": len(regressions), "comparisons": comparisons}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", type=parse_count, default=[1_000, 10_000, 100_000],
+                        help="volumétries (ex: 1k 100k 10M)")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--samples", type=int, default=200, help="mesures par cas unitaire")
+    parser.add_argument("--repeat", type=int, default=3, help="mesures par cas lourd (export, schéma)")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--span", type=int, default=100, help="lignes par plage, page ou prédicat")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--result-cache", action="store_true")
+    parser.add_argument("--output", help="fichier JSON des résultats (à réutiliser comme baseline)")
+    parser.add_argument("--input", help="résultats existants à comparer au lieu d'exécuter le benchmark")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON à comparer")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as file:
+            document = json.load(file)
+    else:
+        document = run(
+            args.rows, args.cases, samples=args.samples, repeat=args.repeat, batch_size=args.batch_size,
+            span=args.span, seed=args.seed, result_cache=args.result_cache,
+        )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(document, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        report = compare(document, baseline, args.threshold)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report["regressions"] else 0)
+    print(json.dumps(document, indent=2))
+
+
+if __name__ == "__main__":
+    main()
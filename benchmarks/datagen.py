@@ -0,0 +1,67 @@
+"""
+Générateurs de données synthétiques reproductibles pour les benchmarks : une graine donne
+toujours les mêmes lignes. Les lignes sont produites en flux, on peut donc générer de
+1k à 10M lignes sans les matérialiser.
+"""
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+# Table de référence : entier (clé), textes de cardinalités variées, réel, booléen, date,
+# texte nullable de longueur variable et BLOB
+BENCH_COLUMNS = {
+    "id": "INTEGER PRIMARY KEY",
+    "customer": "TEXT",
+    "category": "TEXT",
+    "quantity": "INTEGER",
+    "price": "REAL",
+    "active": "BOOLEAN",
+    "created_on": "DATE",
+    "notes": "TEXT",
+    "payload": "BLOB",
+}
+
+CATEGORIES = ("books", "games", "garden", "music", "office", "sports", "tools", "toys")
+WORDS = ("alpha", "delta", "rapide", "lent", "bleu", "rouge", "client", "commande",
+         "livraison", "retour", "stock", "remise", "urgent", "note", "facture", "export")
+EPOCH = date(2015, 1, 1)
+# Proportion de valeurs NULL dans la colonne notes
+NULL_RATIO = 0.2
+
+
+def generate_rows(count, seed=42, start=1):
+    """
+    Génère `count` tuples dans l'ordre de BENCH_COLUMNS, avec des identifiants consécutifs
+    à partir de `start`. Deux appels avec la même graine produisent les mêmes lignes.
+    """
+    rng = random.Random(seed)
+    customers = max(1, count // 10)
+    for row_id in range(start, start + count):
+        yield (
+            row_id,
+            f"customer_{rng.randrange(customers):06d}",
+            rng.choice(CATEGORIES),
+            rng.randint(1, 100),
+            round(rng.uniform(0.5, 1000.0), 2),
+            int(rng.random() < 0.5),
+            (EPOCH + timedelta(days=rng.randrange(3650))).isoformat(),
+            None if rng.random() < NULL_RATIO else " ".join(rng.choices(WORDS, k=rng.randint(3, 12))),
+            rng.randbytes(rng.randint(0, 64)),
+        )
+
+
+def generate_records(count, seed=42):
+    """Comme generate_rows, en dicts sans la clé `id` (attribuée par SQLite), pour les insertions unitaires"""
+    columns = [column for column in BENCH_COLUMNS if column != "id"]
+    for row in generate_rows(count, seed):
+        yield dict(zip(columns, row[1:]))
+
+
+def chunks(rows, size):
+    """Découpe un flux de lignes en listes de `size` lignes au plus"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,132 @@
+import itertools
+import logging
+import sqlite3
+import threading
+from PyQt5 import QtCore
+
+
+class JobSignals(QtCore.QObject):
+    """Signals emitted by a DatabaseJob from its worker thread."""
+    finished = QtCore.pyqtSignal(int, object)
+    failed = QtCore.pyqtSignal(int, object)
+    cancelled = QtCore.pyqtSignal(int)
+
+
+class DatabaseJob(QtCore.QRunnable):
+    """Run a database call on a QThreadPool worker and report back through signals."""
+
+    def __init__(self, job_id, func, args, kwargs):
+        super(DatabaseJob, self).__init__()
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.thread_id = None
+        self.is_cancelled = False
+
+    def run(self):
+        """Execute the call; sqlite interruptions are reported as cancellations."""
+        self.thread_id = threading.get_ident()
+        if self.is_cancelled:
+            self.signals.cancelled.emit(self.job_id)
+            return
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except sqlite3.OperationalError as e:
+            # Only an interrupted statement was actually cancelled; its transaction was rolled back
+            if "interrupted" in str(e):
+                self.signals.cancelled.emit(self.job_id)
+            else:
+                self.signals.failed.emit(self.job_id, e)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, e)
+        else:
+            # The work completed (and any write committed) even if cancel came too late: report it
+            self.signals.finished.emit(self.job_id, result)
+        finally:
+            # A late cancel must not interrupt the next job run on this thread
+            self.thread_id = None
+
+
+class JobRunner(QtCore.QObject):
+    """
+    Dispatch database calls to background workers. Callbacks always run on the
+    GUI thread because the job signals are delivered to this object's slots.
+    """
+    busy_changed = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, connector, max_workers=None, parent=None):
+        super(JobRunner, self).__init__(parent)
+        self.connector = connector
+        self.pool = QtCore.QThreadPool(self)
+        if max_workers:
+            self.pool.setMaxThreadCount(max_workers)
+        self._ids = itertools.count(1)
+        self._jobs = {}
+
+    def submit(self, func, *args, message="Loading...", on_success=None, on_error=None, on_cancel=None, **kwargs):
+        """Queue func(*args, **kwargs) and return the job id."""
+        job_id = next(self._ids)
+        job = DatabaseJob(job_id, func, args, kwargs)
+        job.setAutoDelete(False)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+        self._jobs[job_id] = (job, message, on_success, on_error, on_cancel)
+        self.pool.start(job)
+        self.busy_changed.emit(True, message)
+        return job_id
+
+    def active_count(self):
+        """Return the number of queued or running jobs."""
+        return len(self._jobs)
+
+    def cancel(self, job_id):
+        """Cancel a job: skip it if queued, interrupt its SQL statement if running."""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return False
+        job = entry[0]
+        job.is_cancelled = True
+        if job.thread_id is not None:
+            self.connector.interrupt(job.thread_id)
+        return True
+
+    def cancel_all(self):
+        """Cancel every queued or running job."""
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def wait_for_done(self, msecs=-1):
+        """Block until all jobs have finished (used when closing the window)."""
+        return self.pool.waitForDone(msecs)
+
+    def _finish(self, job_id):
+        entry = self._jobs.pop(job_id, None)
+        if not self._jobs:
+            self.busy_changed.emit(False, "")
+        elif entry is not None:
+            next_message = next(iter(self._jobs.values()))[1]
+            self.busy_changed.emit(True, next_message)
+        return entry
+
+    @QtCore.pyqtSlot(int, object)
+    def _on_finished(self, job_id, result):
+        entry = self._finish(job_id)
+        if entry and entry[2]:
+            entry[2](result)
+
+    @QtCore.pyqtSlot(int, object)
+    def _on_failed(self, job_id, error):
+        entry = self._finish(job_id)
+        logging.error(f"Database job {job_id} failed: {error}")
+        if entry and entry[3]:
+            entry[3](error)
+
+    @QtCore.pyqtSlot(int)
+    def _on_cancelled(self, job_id):
+        entry = self._finish(job_id)
+        logging.info(f"Database job {job_id} cancelled")
+        if entry and entry[4]:
+            entry[4]()
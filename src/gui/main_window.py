@@ -5,28 +5,26 @@ from gui.widgets.input_form_widget import InputFormWidget
 from gui.widgets.export_button_widget import ExportButtonWidget
 from gui.widgets.status_message_widget import StatusMessageWidget
 from gui.widgets.data_table_widget import DataTableWidget
-from gui.widgets.confirmation_dialog import ConfirmationDialog
 from gui.widgets.loading_spinner import LoadingSpinner
 from gui.widgets.notification_banner import NotificationBanner
 from gui.widgets.tabbed_interface import TabbedInterface
 from gui.widgets.search_bar import SearchBar
 from gui.widgets.pagination_control import PaginationControl
-from gui.widgets.file_uploader import FileUploader
-from gui.widgets.chart_display import ChartDisplay
-from gui.widgets.user_profile import UserProfile
-from gui.widgets.feedback_form import FeedbackForm
-from gui.widgets.help_dialog import HelpDialog
-from gui.widgets.notification_settings import NotificationSettings
 from utils.settings_manager import SettingsManager
 from utils.logging_util import LoggingUtil
+from utils.startup_profiler import startup_profiler
 from modules.crud_operator import CRUDOperator
-from modules.data_viewer import DataViewer
 from modules.schema_manager import SchemaManager
 from modules.query_executor import QueryExecutor
 from modules.database_connector import DatabaseConnector
+from modules.keyset_paginator import KeysetPaginator
+from gui.job_runner import JobRunner
 import sys
 import os
 
+# Rows read per worker job when browsing a table
+TABLE_BATCH_SIZE = 500
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 class MainWindow(QMainWindow):
@@ -37,12 +35,25 @@ class MainWindow(QMainWindow):
         
         # Initialize core components with database path
         db_path = "sgbd_simulator.db"
-        self.settings_manager = SettingsManager()
-        self.logging_spinner = LoggingUtil()
-        self.crud_operator = CRUDOperator(db_path)
-        self.query_executor = QueryExecutor(db_path)
-        self.schema_manager = SchemaManager(db_path)
-        self.data_viewer = DataViewer(db_path)
+        self.db_path = db_path
+        with startup_profiler.measure("init", "SettingsManager"):
+            self.settings_manager = SettingsManager()
+            self.logging_spinner = LoggingUtil()
+        with startup_profiler.measure("init", "DatabaseConnector"):
+            self.connector = DatabaseConnector(db_path, profile=self.settings_manager.get_database_profile())
+            self.connector.connect()
+        with startup_profiler.measure("init", "CRUDOperator"):
+            self.crud_operator = CRUDOperator(db_path)
+        with startup_profiler.measure("init", "QueryExecutor"):
+            self.query_executor = QueryExecutor(db_path)
+        with startup_profiler.measure("init", "SchemaManager"):
+            self.schema_manager = SchemaManager(db_path)
+        # Export/import services and dialogs are created on first use (see the properties below)
+        self._data_viewer = None
+        self._data_importer = None
+        self._confirmation_dialog = None
+        self.jobs = JobRunner(self.connector)
+        self._page_job = None
         
         # Central widget setup
         central_widget = QWidget()
@@ -55,14 +66,72 @@ class MainWindow(QMainWindow):
         self.notification_banner = NotificationBanner()
         self.status_message = StatusMessageWidget()
         self.loading_spinner = LoadingSpinner()
+        self.loading_spinner.hide()
+        self.loading_spinner.cancel_requested.connect(self.jobs.cancel_all)
+        self.jobs.busy_changed.connect(self.loading_spinner.set_busy)
         layout.addWidget(self.notification_banner)
         layout.addWidget(self.loading_spinner)
         
-        # Main tabbed interface
+        # Main tabbed interface: only the primary tab is built now, the others when first shown
+        self._lazy_tabs = {}
+        self.metadata_table = None
         self.tabs = TabbedInterface()
         self.tabs.currentChanged.connect(self.handle_tab_change)
         layout.addWidget(self.tabs)
         
+        with startup_profiler.measure("init", "Database Management tab"):
+            self._build_database_tab()
+        self._add_lazy_tab("System Tables", self._build_system_tables_tab)
+        self._add_lazy_tab("Query Editor", self._build_query_editor_tab)
+        self._add_lazy_tab("Query Performance", self._build_query_performance_tab)
+        self._add_lazy_tab("Schema Manager", self._build_schema_tab)
+        self._add_lazy_tab("Import/Export", self._build_import_export_tab)
+        self._add_lazy_tab("Settings", self._build_settings_tab)
+        self._add_lazy_tab("Help & Feedback", self._build_help_tab)
+        
+        # Add status message at bottom
+        layout.addWidget(self.status_message)
+        logging.info("Main window initialization completed")
+
+    def _add_lazy_tab(self, title, builder):
+        """Add a placeholder tab whose content is built by builder(layout) the first time it is shown."""
+        placeholder = QWidget()
+        QVBoxLayout(placeholder)
+        self._lazy_tabs[title] = (placeholder, builder)
+        self.tabs.addTab(placeholder, title)
+
+    def _ensure_tab_built(self, index):
+        title = self.tabs.tabText(index)
+        pending = self._lazy_tabs.pop(title, None)
+        if pending is None:
+            return
+        placeholder, builder = pending
+        logging.debug(f"Setting up {title} tab")
+        with startup_profiler.measure("lazy", f"{title} tab"):
+            builder(placeholder.layout())
+
+    @property
+    def data_viewer(self):
+        if self._data_viewer is None:
+            from modules.data_viewer import DataViewer
+            self._data_viewer = DataViewer(self.db_path)
+        return self._data_viewer
+
+    @property
+    def data_importer(self):
+        if self._data_importer is None:
+            from modules.data_importer import DataImporter
+            self._data_importer = DataImporter(self.db_path)
+        return self._data_importer
+
+    @property
+    def confirmation_dialog(self):
+        if self._confirmation_dialog is None:
+            from gui.widgets.confirmation_dialog import ConfirmationDialog
+            self._confirmation_dialog = ConfirmationDialog()
+        return self._confirmation_dialog
+
+    def _build_database_tab(self):
         # Database Management Tab (Primary)
         logging.debug("Setting up Database Management tab")
         db_management = QWidget()
@@ -78,6 +147,11 @@ class MainWindow(QMainWindow):
         self.refresh_table_list()  # Method to populate the list
         table_list_layout.addWidget(QLabel("Available Tables:"))
         table_list_layout.addWidget(self.table_list)
+        self.current_table = None
+        self.search_index_button = QPushButton("Enable Full-Text Search")
+        self.search_index_button.setEnabled(False)
+        self.search_index_button.clicked.connect(self.toggle_search_index)
+        table_list_layout.addWidget(self.search_index_button)
         
         # CRUD Operations Panel
         logging.debug("Setting up CRUD operations panel")
@@ -121,7 +195,7 @@ class MainWindow(QMainWindow):
     
         # Column Operations Form
         self.column_ops_form = InputFormWidget()
-        self.column_ops_form.add_field("Operation", "text", "add_column/rename_column")
+        self.column_ops_form.add_field("Operation", "text", "add_column/rename_column/alter_column/drop_column")
         self.column_ops_form.add_field("Table", "text", "Table name")
         self.column_ops_form.add_field("Column Info", "text", "old_name:new_name or name:type")
         self.column_ops_form.set_submit_handler(self.handle_column_operation)
@@ -133,9 +207,15 @@ class MainWindow(QMainWindow):
         logging.debug("Setting up data display components")
         self.data_table = DataTableWidget()
         self.search_bar = SearchBar()
-        self.search_bar.search_input.textChanged.connect(self.handle_search)
+        self.search_bar.search_requested.connect(self.handle_search)
+        self.data_table.search_requested.connect(self.handle_search)
         self.pagination = PaginationControl()
         self.pagination.page_changed.connect(self.load_table_data)
+        self.table_paginator = KeysetPaginator(
+            self.connector, "sys_tables", key="id", page_size=self.pagination.items_per_page,
+            select="""t.*,
+                (SELECT COUNT(*) FROM sys_columns c WHERE c.table_id = t.id) AS column_count,
+                (SELECT COUNT(*) FROM sys_constraints con WHERE con.table_id = t.id) AS constraint_count""")
     
         # Layout Assembly
         db_layout.addWidget(table_list_panel)
@@ -145,12 +225,8 @@ class MainWindow(QMainWindow):
         db_layout.addWidget(self.data_table)
         db_layout.addWidget(self.pagination)
         self.tabs.addTab(db_management, "Database Management")
-        
-        # System Tables Tab
-        logging.debug("Setting up System Tables tab")
-        sys_tables = QWidget()
-        sys_layout = QVBoxLayout(sys_tables)
-        
+
+    def _build_system_tables_tab(self, sys_layout):
         # Buttons for system tables management
         buttons_layout = QHBoxLayout()
         refresh_btn = QPushButton("Refresh")
@@ -177,12 +253,8 @@ class MainWindow(QMainWindow):
         self.sys_table_form.set_submit_handler(self.handle_system_table_operation)
         sys_layout.addWidget(self.sys_table_form)
         
-        self.tabs.addTab(sys_tables, "System Tables")
-        
-        # Query Editor Tab with Logs
-        logging.debug("Setting up Query Editor tab")
-        query_widget = QWidget()
-        query_layout = QVBoxLayout(query_widget)
+
+    def _build_query_editor_tab(self, query_layout):
         self.query_input = InputFormWidget()
         self.query_input.add_field("SQL Query", "text", "Enter your SQL query here")
         self.query_input.set_submit_handler(self.execute_query)
@@ -191,12 +263,44 @@ class MainWindow(QMainWindow):
         query_layout.addWidget(self.query_input)
         query_layout.addWidget(self.query_results)
         query_layout.addWidget(self.query_logs)
-        self.tabs.addTab(query_widget, "Query Editor")
-        
-        logging.info("Main window initialization completed")        
-        # Schema Manager Tab with Metadata
-        schema_widget = QWidget()
-        schema_layout = QVBoxLayout(schema_widget)
+
+    def _build_query_performance_tab(self, perf_layout):
+        # Top offenders, slow query log and index advisor
+        perf_buttons = QHBoxLayout()
+        self.perf_order_selector = QComboBox()
+        self.perf_order_selector.addItems(["total", "p95"])
+        self.perf_order_selector.currentTextChanged.connect(self.refresh_query_performance)
+        perf_refresh_btn = QPushButton("Refresh")
+        perf_refresh_btn.clicked.connect(self.refresh_query_performance)
+        perf_buttons.addWidget(QLabel("Top queries by:"))
+        perf_buttons.addWidget(self.perf_order_selector)
+        perf_buttons.addWidget(perf_refresh_btn)
+        perf_layout.addLayout(perf_buttons)
+        self.cache_stats_label = QLabel()
+        perf_layout.addWidget(self.cache_stats_label)
+        self.top_queries_view = DataTableWidget()
+        self.slow_queries_view = DataTableWidget()
+        perf_layout.addWidget(self.top_queries_view)
+        perf_layout.addWidget(QLabel("Slow query log:"))
+        perf_layout.addWidget(self.slow_queries_view)
+
+        advisor_buttons = QHBoxLayout()
+        recommend_btn = QPushButton("Analyze && Recommend Indexes")
+        recommend_btn.clicked.connect(self.refresh_index_advice)
+        create_index_btn = QPushButton("Create Selected Index")
+        create_index_btn.clicked.connect(self.create_recommended_index)
+        advisor_buttons.addWidget(recommend_btn)
+        advisor_buttons.addWidget(create_index_btn)
+        perf_layout.addWidget(QLabel("Index advisor:"))
+        perf_layout.addLayout(advisor_buttons)
+        self.index_advice_view = DataTableWidget()
+        self.unused_indexes_view = DataTableWidget()
+        perf_layout.addWidget(self.index_advice_view)
+        perf_layout.addWidget(QLabel("Unused indexes (maintained on every write):"))
+        perf_layout.addWidget(self.unused_indexes_view)
+        self.index_recommendations = {}
+
+    def _build_schema_tab(self, schema_layout):
         self.schema_form = InputFormWidget()
         self.schema_form.add_field("Operation", "text", "create_table/alter_table")
         self.schema_form.add_field("Table Name", "text", "Enter table name")
@@ -208,371 +312,491 @@ class MainWindow(QMainWindow):
         schema_layout.addWidget(self.schema_form)
         schema_layout.addWidget(self.schema_table)
         schema_layout.addWidget(self.metadata_table)
-        self.tabs.addTab(schema_widget, "Schema Manager")
-        
-        # Data Import/Export Tab
-        import_export = QWidget()
-        import_layout = QVBoxLayout(import_export)
+        if self.current_table:
+            self._update_table_metadata(self.current_table)
+
+    def _build_import_export_tab(self, import_layout):
+        # The chart canvas pulls in matplotlib: imported only when this tab is first shown
+        from gui.widgets.file_uploader import FileUploader
+        from gui.widgets.chart_display import ChartDisplay
         self.file_uploader = FileUploader()
         self.chart_display = ChartDisplay()
         self.file_uploader.file_uploaded.connect(self.handle_file_import)
         import_layout.addWidget(self.file_uploader)
         import_layout.addWidget(self.chart_display)
-        self.tabs.addTab(import_export, "Import/Export")
-        
-        # Settings & Profile Tab
-        settings_widget = QWidget()
-        settings_layout = QVBoxLayout(settings_widget)
+
+    def _build_settings_tab(self, settings_layout):
+        from gui.widgets.user_profile import UserProfile
+        from gui.widgets.notification_settings import NotificationSettings
         self.user_profile = UserProfile(self.settings_manager)
         self.notification_settings = NotificationSettings(self.settings_manager)
         settings_layout.addWidget(self.user_profile)
         settings_layout.addWidget(self.notification_settings)
-        self.tabs.addTab(settings_widget, "Settings")
-        
-        # Help & Feedback Tab
-        help_widget = QWidget()
-        help_layout = QVBoxLayout(help_widget)
+
+    def _build_help_tab(self, help_layout):
+        from gui.widgets.help_dialog import HelpDialog
+        from gui.widgets.feedback_form import FeedbackForm
         self.help_dialog = HelpDialog()
         self.feedback_form = FeedbackForm()
         help_layout.addWidget(self.help_dialog)
         help_layout.addWidget(self.feedback_form)
-        self.tabs.addTab(help_widget, "Help & Feedback")
-        
-        # Add status message at bottom
-        layout.addWidget(self.status_message)
-        
-        # Initialize confirmation dialog
-        self.confirmation_dialog = ConfirmationDialog()
 
     def handle_tab_change(self, index):
-        self.loading_spinner.show_spinner("Loading tab content...")
-        QtCore.QTimer.singleShot(1000, self.loading_spinner.hide_spinner)
+        self._ensure_tab_built(index)
+        self.loading_spinner.set_busy(self.jobs.active_count() > 0)
+        if self.tabs.tabText(index) == "Query Performance":
+            self.refresh_query_performance()
+
+    def run_job(self, message, func, *args, on_success=None, on_error=None, error_prefix="Database error", **kwargs):
+        """
+        Run a database call on a worker thread; callbacks are delivered on the GUI thread.
+        on_error(exception) runs after the error is shown, and with None if the job is cancelled.
+        """
+        def handle_error(e):
+            self.status_message.show_error(f"{error_prefix}: {str(e)}")
+            if on_error:
+                on_error(e)
+
+        def handle_cancel():
+            self.status_message.show_info("Operation cancelled")
+            if on_error:
+                on_error(None)
+
+        return self.jobs.submit(
+            func, *args,
+            message=message,
+            on_success=on_success,
+            on_error=handle_error,
+            on_cancel=handle_cancel,
+            **kwargs
+        )
 
     def handle_insert(self, data):
-        self.loading_spinner.show_spinner("Inserting data...")
-        QtCore.QTimer.singleShot(1000, lambda: self.perform_insert(data))
+        self.perform_insert(data)
 
     def perform_insert(self, data):
-        result = self.crud_operator.create(data['Table'], dict(item.split(':') for item in data['Data'].split(',')))
-        self.data_table.set_data([result]) if result else None
-        self.loading_spinner.hide_spinner()
+        values = dict(item.split(':') for item in data['Data'].split(','))
+        self.run_job("Inserting data...", self.crud_operator.create, data['Table'], values,
+                     on_success=lambda row_id: self.status_message.show_success(f"Record inserted with ID {row_id}"),
+                     error_prefix="Insert error")
 
     def handle_update(self, data):
-        self.loading_spinner.show_spinner("Updating data...")
-        QtCore.QTimer.singleShot(1000, lambda: self.perform_update(data))
+        self.perform_update(data)
 
     def perform_update(self, data):
-        result = self.crud_operator.update(data['Table'], 
-            dict(item.split(':') for item in data['Data'].split(',')), 
-            data['Condition'], ())
-        self.data_table.set_data([result]) if result else None
-        self.loading_spinner.hide_spinner()
+        values = dict(item.split(':') for item in data['Data'].split(','))
+        self.run_job("Updating data...", self.crud_operator.update, data['Table'], values, data['Condition'], (),
+                     on_success=lambda _: self.status_message.show_success("Records updated"),
+                     error_prefix="Update error")
 
     def handle_delete(self, data):
-        self.loading_spinner.show_spinner("Deleting data...")
-        QtCore.QTimer.singleShot(1000, lambda: self.perform_delete(data))
+        self.perform_delete(data)
 
     def perform_delete(self, data):
-        self.crud_operator.delete(data['Table'], data['Condition'], ())
-        self.data_table.clear()
-        self.loading_spinner.hide_spinner()
+        def on_success(_):
+            self.data_table.clear()
+            self.status_message.show_success("Records deleted")
+
+        self.run_job("Deleting data...", self.crud_operator.delete, data['Table'], data['Condition'], (),
+                     on_success=on_success, error_prefix="Delete error")
 
     def handle_create_table(self, data):
-        self.loading_spinner.show_spinner("Creating table...")
-        QtCore.QTimer.singleShot(1000, lambda: self.perform_create_table(data))
+        self.perform_create_table(data)
 
     def perform_create_table(self, data):
-        result = self.schema_manager.create_table(
-            data['Table Name'],
-            dict(col.split(':') for col in data['Columns'].split(',')),
-            data['Constraints'].split(',') if data['Constraints'] else None)
-        self.data_table.set_data([result]) if result else None
-        self.loading_spinner.hide_spinner()
-        self.refresh_table_list()
+        self.run_job("Creating table...", self.schema_manager.create_table,
+                     data['Table Name'],
+                     dict(col.split(':') for col in data['Columns'].split(',')),
+                     data['Constraints'].split(',') if data['Constraints'] else None,
+                     on_success=lambda _: self.refresh_table_list(),
+                     error_prefix="Create table error")
 
-    def handle_search(self):
-        search_text = self.search_bar.get_search_text()
+    def handle_search(self, search_text=None):
+        if search_text is None:
+            search_text = self.search_bar.get_search_text()
+        if self.current_table and self.data_table.server_search:
+            if not search_text.strip():
+                self.handle_table_selection(self.current_table)
+                return
+            # Ranked FTS5 lookup: only the best matches reach the widget
+            self.run_job("Searching...", self.crud_operator.search, self.current_table, search_text, 200,
+                         on_success=self._show_table_results, error_prefix="Search error")
+            return
         table_conditions = "WHERE table_name LIKE ? OR description LIKE ?"
         params = (f"%{search_text}%", f"%{search_text}%")
-        results = self.crud_operator.read("sys_tables", table_conditions, params)
-        
+        self.run_job("Searching...", self.crud_operator.read, "sys_tables", table_conditions, params,
+                     on_success=self._show_table_results, error_prefix="Search error")
+
+    def toggle_search_index(self):
+        table_name = self.current_table
+        if not table_name:
+            return
+        if self.data_table.server_search:
+            self.run_job("Dropping search index...", self.crud_operator.disable_search, table_name,
+                         on_success=lambda _: self._set_search_mode(False), error_prefix="Search index error")
+        else:
+            self.run_job("Building search index...", self.crud_operator.enable_search, table_name,
+                         on_success=lambda _: self._set_search_mode(True), error_prefix="Search index error")
+
+    def _set_search_mode(self, enabled):
+        self.data_table.set_server_search(enabled)
+        self.search_index_button.setText("Disable Full-Text Search" if enabled else "Enable Full-Text Search")
+
+    def _show_table_results(self, results):
         if results:
             self.data_table.set_data(results)
         else:
             self.data_table.clear()
 
+    def _load_page(self, page):
+        rows = self.table_paginator.goto_page(page)
+        return rows, self.table_paginator.total_pages()
+
     def load_table_data(self, page):
-        limit = self.pagination.items_per_page
-        offset = (page - 1) * limit
-        query = """
-            SELECT t.*, COUNT(c.id) as column_count, 
-                   (SELECT COUNT(*) FROM sys_constraints WHERE table_id = t.id) as constraint_count
-            FROM sys_tables t
-            LEFT JOIN sys_columns c ON t.id = c.table_id
-            GROUP BY t.id
-            LIMIT ? OFFSET ?
-        """
-        results = self.query_executor.execute_query(query, (limit, offset))
-        
-        if results:
-            self.data_table.set_data([dict(zip([desc[0] for desc in self.query_executor.get_column_names()], row)) for row in results])
-        else:
-            self.data_table.clear()
+        # Keyset pagination on sys_tables.id: every page costs the same as the first one
+        def on_success(outcome):
+            if self._page_job != job_id:
+                return
+            rows, total_pages = outcome
+            self.pagination.set_total_pages(total_pages)
+            self._show_table_results(rows)
+
+        # Only the last requested page is shown: a page still loading is superseded,
+        # and one that completed despite the cancel is ignored
+        if self._page_job is not None:
+            self.jobs.cancel(self._page_job)
+        self._page_job = job_id = self.run_job("Loading page...", self._load_page, page,
+                                               on_success=on_success, error_prefix="Pagination error")
+
+    def _run_query_with_logs(self, query):
+        results = self.query_executor.execute_query(query)
+        self.query_executor.flush_logs()
+        log_query = "SELECT operation_timestamp, operation_type, status, message FROM sys_logs ORDER BY operation_timestamp DESC LIMIT 10"
+        return results, self.query_executor.execute_query(log_query)
 
     def execute_query(self):
         form_data = self.query_input.fields["SQL Query"].text()
-        try:
-            results = self.query_executor.execute_query(form_data)
-            
+
+        def on_success(outcome):
+            results, log_results = outcome
             if results:
-                headers = [desc[0] for desc in self.query_executor.get_column_names()]
-                data = [dict(zip(headers, row)) for row in results]
-                self.query_results.set_data(data)
+                self.query_results.set_data(results)
             else:
                 self.query_results.clear()
-            
-            log_query = "SELECT operation_timestamp, operation_type, status, message FROM sys_logs ORDER BY operation_timestamp DESC LIMIT 10"
-            log_results = self.query_executor.execute_query(log_query)
-            
+
             if log_results:
-                log_data = [dict(zip(["Timestamp", "Operation", "Status", "Message"], row)) for row in log_results]
+                log_data = [dict(zip(["Timestamp", "Operation", "Status", "Message"], row.values())) for row in log_results]
                 self.query_logs.set_data(log_data)
             else:
                 self.query_logs.clear()
-            
+
             self.status_message.show_success("Query executed successfully")
-        except Exception as e:
-            self.status_message.show_error(f"Query error: {str(e)}")
+
+        self.run_job("Executing query...", self._run_query_with_logs, form_data,
+                     on_success=on_success, error_prefix="Query error")
+
+    def _run_schema_operation(self, form_data):
+        if form_data["operation"] == "create_table":
+            self.schema_manager.create_table(
+                form_data["table_name"],
+                form_data["columns"],
+                form_data["constraints"]
+            )
+
+            metadata_query = """
+                SELECT t.table_name, c.column_name, c.data_type, c.is_nullable,
+                       con.constraint_type, con.constraint_definition
+                FROM sys_tables t
+                LEFT JOIN sys_columns c ON t.id = c.table_id
+                LEFT JOIN sys_constraints con ON t.id = con.table_id
+                WHERE t.table_name = ?
+            """
+            return self.query_executor.execute_query(metadata_query, (form_data["table_name"],))
+
+        elif form_data["operation"] == "alter_table":
+            self.schema_manager.rename_table(
+                form_data["table_name"],
+                form_data["new_name"]
+            )
+        return None
 
     def handle_schema_operation(self):
-        form_data = {
-            "operation": self.schema_form.fields["Operation"].text(),
-            "table_name": self.schema_form.fields["Table Name"].text(),
-            "columns": eval(self.schema_form.fields["Columns"].text()),
-            "constraints": self.schema_form.fields["Constraints"].text()
-        }
-        
         try:
+            form_data = {
+                "operation": self.schema_form.fields["Operation"].text(),
+                "table_name": self.schema_form.fields["Table Name"].text(),
+                "columns": eval(self.schema_form.fields["Columns"].text()),
+                "constraints": self.schema_form.fields["Constraints"].text()
+            }
+        except Exception as e:
+            self.status_message.show_error(f"Schema operation error: {str(e)}")
+            return
+
+        def on_success(metadata):
             if form_data["operation"] == "create_table":
-                result = self.schema_manager.create_table(
-                    form_data["table_name"],
-                    form_data["columns"],
-                    form_data["constraints"]
-                )
-                
-                metadata_query = """
-                    SELECT t.table_name, c.column_name, c.data_type, c.is_nullable,
-                           con.constraint_type, con.constraint_definition
-                    FROM sys_tables t
-                    LEFT JOIN sys_columns c ON t.id = c.table_id
-                    LEFT JOIN sys_constraints con ON t.id = con.table_id
-                    WHERE t.table_name = ?
-                """
-                metadata = self.query_executor.execute_query(metadata_query, (form_data["table_name"],))
-                
                 if metadata:
                     headers = ["Table Name", "Column Name", "Data Type", "Nullable", "Constraint Type", "Constraint Definition"]
-                    data = [dict(zip(headers, row)) for row in metadata]
+                    data = [dict(zip(headers, row.values())) for row in metadata]
                     self.metadata_table.set_data(data)
                 else:
                     self.metadata_table.clear()
-                
-            elif form_data["operation"] == "alter_table":
-                self.schema_manager.rename_table(
-                    form_data["table_name"],
-                    form_data["new_name"]
-                )
             self.status_message.show_success("Schema operation completed")
             self.schema_form.clear_fields()
             self.refresh_table_list()
-        except Exception as e:
-            self.status_message.show_error(f"Schema operation error: {str(e)}")
 
-    def handle_file_import(self, file_path):        
-        try:
-            # Add implementation for file import
-            self.status_message.show_success("File imported successfully")
-            self.refresh_table_list()
-        except Exception as e:
-            self.status_message.show_error(f"Import error: {str(e)}")
+        self.run_job("Applying schema operation...", self._run_schema_operation, form_data,
+                     on_success=on_success, error_prefix="Schema operation error")
+
+    def handle_file_import(self, file_paths):
+        for file_path in file_paths:
+            self.run_job(f"Importing {os.path.basename(file_path)}...", self.data_importer.import_file, file_path,
+                         on_success=self._show_import_result, error_prefix="Import error")
+
+    def _show_import_result(self, stats):
+        imported = stats["rows"] - stats["resumed_from"]
+        resumed = f" (resumed after {stats['resumed_from']} rows)" if stats["resumed_from"] else ""
+        self.status_message.show_success(
+            f"Imported {imported} rows into {stats['table']} at {stats['rows_per_sec']:.0f} rows/s{resumed}")
+        self.file_uploader.clear_files()
+        self.refresh_table_list()
 
     def closeEvent(self, event):
+        self.jobs.cancel_all()
+        self.jobs.wait_for_done()
         self.crud_operator.close()
         self.query_executor.close()
-        self.data_viewer.close()
+        if self._data_viewer is not None:
+            self._data_viewer.close()
+        if self._data_importer is not None:
+            self._data_importer.close()
         event.accept()
 
-    def handle_column_operation(self, form_data):
-        try:
-            if form_data["operation"] == "add_column":
-                metadata_query = """
-                    ALTER TABLE ? ADD COLUMN ? ? 
-                    """ + ("NOT NULL" if not form_data["is_nullable"] else "")
-                self.query_executor.execute_query(
-                    metadata_query, 
-                    (form_data["table_name"], 
-                    form_data["column_name"], 
-                    form_data["data_type"])
-                )
-                
-                self._update_table_metadata(form_data["table_name"])
-                self._log_operation(
-                    "ALTER", 
-                    form_data["table_name"], 
-                    f"Added column: {form_data['column_name']}"
-                )
-                
-            elif form_data["operation"] == "drop_column":
-                metadata_query = "ALTER TABLE ? DROP COLUMN ?"
-                self.query_executor.execute_query(
-                    metadata_query,
-                    (form_data["table_name"], form_data["column_name"])
-                )
-                
-                self._update_table_metadata(form_data["table_name"])
-                self._log_operation(
-                    "ALTER", 
-                    form_data["table_name"], 
-                    f"Dropped column: {form_data['column_name']}"
-                )
-                
-            elif form_data["operation"] == "modify_column":
-                metadata_query = """
-                    ALTER TABLE ? MODIFY COLUMN ? ? 
-                    """ + ("NOT NULL" if not form_data["is_nullable"] else "")
-                self.query_executor.execute_query(
-                    metadata_query,
-                    (form_data["table_name"], 
-                    form_data["column_name"], 
-                    form_data["new_data_type"])
-                )
-                
-                self._update_table_metadata(form_data["table_name"])
-                self._log_operation(
-                    "ALTER", 
-                    form_data["table_name"], 
-                    f"Modified column: {form_data['column_name']}"
-                )
-                
-            self.status_message.show_success("Column operation completed successfully")
-            self.schema_form.clear_fields()
+    def handle_column_operation(self):
+        """
+        Column Info is "name:type" for add_column/alter_column, "old_name:new_name" for
+        rename_column and "name" for drop_column. Operations SQLite cannot do natively
+        rebuild the table in batches on a worker thread.
+        """
+        fields = self.column_ops_form.fields
+        operation = fields["Operation"].text().strip().lower()
+        table_name = fields["Table"].text().strip()
+        column_info = [part.strip() for part in fields["Column Info"].text().split(":", 1)]
+        operations = {
+            "add_column": (self.schema_manager.add_column, 2),
+            "rename_column": (self.schema_manager.rename_column, 2),
+            "alter_column": (self.schema_manager.alter_column_type, 2),
+            "drop_column": (self.schema_manager.drop_column, 1),
+        }
+        if operation not in operations:
+            self.status_message.show_error(f"Unknown column operation: {operation}")
+            return
+        func, arity = operations[operation]
+        if not table_name or len(column_info) != arity or not all(column_info):
+            self.status_message.show_error("Column operation error: invalid Table or Column Info")
+            return
+
+        def on_success(_):
+            self.status_message.show_success(f"{operation} on {table_name} completed")
+            self.column_ops_form.clear_fields()
             self.refresh_table_list()
-                
-        except Exception as e:
-            self.status_message.show_error(f"Column operation error: {str(e)}")
-            logging.error(f"Column operation failed: {str(e)}")
+
+        self.run_job(f"Altering {table_name}...", func, table_name, *column_info,
+                     on_success=on_success, error_prefix="Column operation error")
 
     def refresh_system_tables(self):
         current_table = self.sys_table_selector.currentText()
         self.load_system_table(current_table)
     
     def load_system_table(self, table_name):
-        try:
-            results = self.crud_operator.read(table_name)
+        def on_success(results):
             if results:
                 self.sys_tables_view.set_data(results)
                 self.status_message.show_success(f"Loaded {table_name} successfully")
             else:
                 self.sys_tables_view.clear()
                 self.status_message.show_info(f"No data in {table_name}")
-        except Exception as e:
-            self.status_message.show_error(f"Error loading {table_name}: {str(e)}")
-            logging.error(f"Failed to load system table {table_name}: {str(e)}")
+
+        self.run_job(f"Loading {table_name}...", self.crud_operator.read, table_name,
+                     on_success=on_success, error_prefix=f"Error loading {table_name}")
+
+    def refresh_query_performance(self, *args):
+        order_by = self.perf_order_selector.currentText()
+
+        def load():
+            return (self.query_executor.top_queries(order_by), self.query_executor.slow_queries(),
+                    self.query_executor.result_cache_stats())
+
+        def on_success(result):
+            top_queries, slow_queries, cache = result
+            self.cache_stats_label.setText(
+                f"Result cache: {cache['hit_ratio']:.0%} hit ratio ({cache['hits']} hits, {cache['misses']} misses), "
+                f"{cache['entries']} entries, {cache['bytes'] / (1 << 20):.1f} / {cache['max_bytes'] / (1 << 20):.0f} MB, "
+                f"{cache['evictions']} evictions")
+            rows = [{
+                "Query": row["query"],
+                "Calls": row["count"],
+                "Total (ms)": round(row["total_ms"], 2),
+                "p95 (ms)": round(row["p95_ms"], 2),
+                "Max (ms)": round(row["max_ms"], 2),
+                "Rows": row["rows"],
+                "VM steps": row["vm_steps"],
+                "Full scan": row["scanned_tables"] or "",
+            } for row in top_queries]
+            self._show_rows(self.top_queries_view, rows)
+            self._show_rows(self.slow_queries_view, slow_queries)
+
+        self.run_job("Loading query statistics...", load, on_success=on_success,
+                     error_prefix="Query statistics error")
+
+    def refresh_index_advice(self):
+        def load():
+            return self.query_executor.recommend_indexes(), self.query_executor.unused_indexes()
+
+        def on_success(result):
+            recommendations, unused = result
+            self.index_recommendations = {rec["index_name"]: rec for rec in recommendations}
+            self._show_rows(self.index_advice_view, [{
+                "Index": rec["index_name"],
+                "Table": rec["table"],
+                "Columns": ", ".join(rec["columns"]),
+                "Covering": "yes" if rec["covering"] else "",
+                "Executions": rec["executions"],
+                "Table rows": rec["table_rows"],
+                "Rows per lookup": rec["estimated_rows_per_lookup"],
+                "Rows saved": rec["estimated_rows_saved"],
+            } for rec in recommendations])
+            self._show_rows(self.unused_indexes_view, [{
+                "Index": index["index_name"],
+                "Table": index["table"],
+                "Columns": ", ".join(index["columns"]),
+                "Writes observed": index["writes"],
+            } for index in unused])
+
+        self.run_job("Analyzing workload...", load, on_success=on_success, error_prefix="Index advisor error")
+
+    def create_recommended_index(self):
+        selected = self.index_advice_view.get_selected_row_data()
+        recommendation = self.index_recommendations.get(selected["Index"]) if selected else None
+        if recommendation is None:
+            self.status_message.show_info("Select a recommended index first")
+            return
+
+        def on_success(index_name):
+            self.status_message.show_success(f"Index {index_name} created")
+            self.refresh_index_advice()
+
+        self.run_job("Creating index...", self.query_executor.index_advisor.apply, recommendation,
+                     self.schema_manager, on_success=on_success, error_prefix="Create index error")
+
+    def _show_rows(self, view, rows):
+        if rows:
+            view.set_data(rows)
+        else:
+            view.clear()
+
+    def _run_system_table_operation(self, table_name, operation, form_data):
+        if operation == "INSERT":
+            data_dict = dict(item.split(":") for item in form_data["Data"].split(","))
+            return self.crud_operator.create(table_name, data_dict)
+
+        elif operation == "UPDATE":
+            data_dict = dict(item.split(":") for item in form_data["Data"].split(","))
+            conditions = form_data["Condition"]
+            return self.crud_operator.update(table_name, data_dict, conditions, ())
+
+        elif operation == "DELETE":
+            conditions = form_data["Condition"]
+            self.crud_operator.delete(table_name, conditions, ())
+            return None
+
+        raise ValueError(f"Invalid operation: {operation}")
 
     def handle_system_table_operation(self, form_data):
-        try:
-            table_name = self.sys_table_selector.currentText()
-            operation = form_data["Operation"].upper()
-            
-            if operation == "INSERT":
-                data_dict = dict(item.split(":") for item in form_data["Data"].split(","))
-                result = self.crud_operator.create(table_name, data_dict)
-                if result:
-                    self.sys_tables_view.set_data([result])
-                
-            elif operation == "UPDATE":
-                data_dict = dict(item.split(":") for item in form_data["Data"].split(","))
-                conditions = form_data["Condition"]
-                result = self.crud_operator.update(table_name, data_dict, conditions, ())
-                if result:
-                    self.sys_tables_view.set_data([result])
-                
-            elif operation == "DELETE":
-                conditions = form_data["Condition"]
-                self.crud_operator.delete(table_name, conditions, ())
+        table_name = self.sys_table_selector.currentText()
+        operation = form_data["Operation"].upper()
+
+        def on_success(result):
+            if operation == "DELETE":
                 self.sys_tables_view.clear()
-                
-            else:
-                raise ValueError(f"Invalid operation: {operation}")
-            
+            elif result:
+                self.sys_tables_view.set_data([result])
             self.status_message.show_success(f"{operation} operation completed successfully")
             self.refresh_system_tables()
             self.sys_table_form.clear_fields()
-            
-        except Exception as e:
-            self.status_message.show_error(f"System table operation error: {str(e)}")
-            logging.error(f"System table operation failed: {str(e)}")
+
+        def on_error(e):
+            if e is not None:
+                logging.error(f"System table operation failed: {str(e)}")
+
+        self.run_job(f"Running {operation} on {table_name}...", self._run_system_table_operation,
+                     table_name, operation, form_data,
+                     on_success=on_success, on_error=on_error, error_prefix="System table operation error")
 
     def handle_table_selection(self, item):
-        try:
-            table_name = item.text()
-            results = self.crud_operator.read(table_name)
-            
-            if results:
-                self.data_table.set_data(results)
-                
-                self.insert_form.fields["Table"].setText(table_name)
-                self.update_form.fields["Table"].setText(table_name)
-                self.delete_form.fields["Table"].setText(table_name)
-                
+        table_name = item if isinstance(item, str) else item.text()
+        self.current_table = table_name
+        self.search_index_button.setEnabled(True)
+        self.insert_form.fields["Table"].setText(table_name)
+        self.update_form.fields["Table"].setText(table_name)
+        self.delete_form.fields["Table"].setText(table_name)
+
+        def load():
+            # Catalog lookups and the first batch run on the worker; no cursor outlives the job
+            columns, rows, position = self.crud_operator.read_batch(table_name, limit=TABLE_BATCH_SIZE)
+            table = self.query_executor.catalog.table(table_name)
+            return self.crud_operator.search_enabled(table_name), table, columns, rows, position
+
+        def on_success(result):
+            if table_name != self.current_table:
+                # Another table was selected while this one was loading
+                return
+            search_enabled, table, columns, rows, position = result
+            self._set_search_mode(search_enabled)
+            self.data_table.set_fetcher(
+                columns, lambda start, deliver: self._fetch_table_batch(table_name, start, deliver), rows, position)
+            self._show_table_metadata(table)
+            if rows:
                 self.status_message.show_success(f"Loaded table {table_name} successfully")
             else:
-                self.data_table.clear()
                 self.status_message.show_info(f"No data in table {table_name}")
-                    
-        except Exception as e:
-            self.status_message.show_error(f"Error loading table: {str(e)}")
-            logging.error(f"Failed to load table {table_name}: {str(e)}")
+
+        self.run_job(f"Loading {table_name}...", load, on_success=on_success, error_prefix="Error loading table")
+
+    def _fetch_table_batch(self, table_name, position, deliver):
+        """Read the next batch of the browsed table on a worker; the view gets it through deliver."""
+        self.run_job(f"Loading {table_name}...", self.crud_operator.read_batch, table_name, position, TABLE_BATCH_SIZE,
+                     on_success=lambda result: deliver(result[1], result[2]),
+                     on_error=lambda _: deliver([], None), error_prefix="Error loading table")
     
     def refresh_table_list(self):
-        try:
-            results = self.query_executor.execute_query(
-                "SELECT table_name FROM sys_tables WHERE table_type = 'USER'"
-            )
-            
+        def on_success(results):
             self.table_list.clear()
             
             if results:
-                for row in results:
-                    self.table_list.addItem(row[0])
+                self.table_list.addItems(results)
                 self.status_message.show_success("Table list refreshed successfully")
             else:
                 self.status_message.show_info("No tables found")
-                    
-        except Exception as e:
-            self.status_message.show_error(f"Error refreshing table list: {str(e)}")
-            logging.error(f"Failed to refresh table list: {str(e)}")
+
+        self.run_job("Refreshing tables...", self.query_executor.catalog.table_names, 'USER',
+                     on_success=on_success, error_prefix="Error refreshing table list")
 
     def _update_table_metadata(self, table_name):
-        try:
-            metadata_query = """
-                SELECT column_name, data_type, is_nullable, 
-                    column_default, character_maximum_length
-                FROM sys_columns 
-                WHERE table_name = ?
-                ORDER BY ordinal_position
-            """
-            metadata = self.query_executor.execute_query(metadata_query, (table_name,))
-            
-            if metadata:
-                headers = ["Column Name", "Data Type", "Nullable", "Default Value", "Max Length"]
-                data = [dict(zip(headers, row)) for row in metadata]
-                self.metadata_table.set_data(data)
-            else:
-                self.metadata_table.clear()
-                    
-        except Exception as e:
-            logging.error(f"Failed to update metadata for table {table_name}: {str(e)}")
+        """Show the column definitions of table_name, looked up in the catalog on a worker."""
+        self.run_job(f"Loading {table_name} metadata...", self.query_executor.catalog.table, table_name,
+                     on_success=self._show_table_metadata, error_prefix="Metadata error")
+
+    def _show_table_metadata(self, table):
+        if self.metadata_table is None:
+            # Schema Manager tab not built yet: filled in when it is first shown
+            return
+        if table and table.column_info:
+            headers = ["Column Name", "Data Type", "Nullable", "Default Value", "Primary Key"]
+            data = [dict(zip(headers, (col[1], col[2], not col[3], col[4], bool(col[5]))))
+                    for col in table.column_info]
+            self.metadata_table.set_data(data)
+        else:
+            self.metadata_table.clear()
 
     def _log_operation(self, operation_type, table_name, message):
         try:
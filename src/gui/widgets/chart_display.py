@@ -1,12 +1,13 @@
 from PyQt5 import QtWidgets, QtCore
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
 class ChartDisplay(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super(ChartDisplay, self).__init__(parent)
         self.layout = QtWidgets.QVBoxLayout(self)
-        self.figure = plt.figure()
+        # A standalone Figure: pyplot's global figure manager is neither imported nor needed
+        self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
         self.layout.addWidget(self.canvas)
 
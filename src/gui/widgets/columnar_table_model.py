@@ -0,0 +1,147 @@
+from PyQt5 import QtCore
+
+
+class ColumnarTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model keeping rows as one list per column. Rows can come from an
+    iterator of row batches (e.g. QueryExecutor.stream_query(..., row_format='tuple'))
+    or from an asynchronous fetcher (see set_fetcher): only the batches the view asks
+    for through canFetchMore/fetchMore are pulled.
+    """
+
+    def __init__(self, parent=None):
+        super(ColumnarTableModel, self).__init__(parent)
+        self.headers = []
+        self.columns = []
+        self.row_total = 0
+        self._source = None
+        self._fetch = None
+        self._position = None
+        self._pending = False
+        # Bumped on every reset so that batches requested for a previous source are dropped
+        self._generation = 0
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.row_total
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self.columns[index.column()][index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            if isinstance(value, bool):
+                return str(value)
+            if isinstance(value, (int, float)):
+                return value
+            return str(value) if value is not None else ""
+        if role == QtCore.Qt.CheckStateRole and isinstance(value, bool):
+            return QtCore.Qt.Checked if value else QtCore.Qt.Unchecked
+        if role == QtCore.Qt.TextAlignmentRole and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+        if role == QtCore.Qt.UserRole:
+            return value
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return section + 1
+
+    def set_headers(self, headers):
+        """Reset the model with new column headers and no rows."""
+        self.beginResetModel()
+        self._close_source()
+        self.headers = list(headers)
+        self.columns = [[] for _ in self.headers]
+        self.row_total = 0
+        self.endResetModel()
+
+    def set_source(self, headers, batches):
+        """Attach an iterator of row batches; rows are fetched as the view scrolls."""
+        self.set_headers(headers)
+        self._source = iter(batches)
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def set_fetcher(self, headers, fetch, rows=(), position=None):
+        """
+        Pull rows through fetch(position, deliver), which must read the batch starting at
+        `position` off the GUI thread and then call deliver(rows, next_position) on the GUI
+        thread (next_position None once the end is reached). `rows` and `position` are the
+        batch already read and where the next one starts; position None means no more rows.
+        """
+        self.set_headers(headers)
+        self.append_rows(list(rows))
+        if position is not None:
+            self._fetch = fetch
+            self._position = position
+
+    def _deliver(self, generation, rows, position):
+        if generation != self._generation:
+            return
+        self._pending = False
+        self._position = position
+        if position is None:
+            self._fetch = None
+        self.append_rows(list(rows))
+
+    def append_rows(self, rows):
+        """Append a list of row sequences to the column arrays."""
+        if not rows:
+            return
+        if not self.headers:
+            self.set_headers([str(i + 1) for i in range(len(rows[0]))])
+        first = self.row_total
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        for column_index, column in enumerate(zip(*rows)):
+            self.columns[column_index].extend(column)
+        self.row_total += len(rows)
+        self.endInsertRows()
+
+    def row(self, row_index):
+        """Return one row as a tuple."""
+        return tuple(column[row_index] for column in self.columns)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._source is not None or (self._fetch is not None and not self._pending)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if self._fetch is not None:
+            if not self._pending:
+                self._pending = True
+                generation = self._generation
+                self._fetch(self._position, lambda rows, position: self._deliver(generation, rows, position))
+            return
+        if self._source is None:
+            return
+        batch = next(self._source, None)
+        if not batch:
+            self._close_source()
+            return
+        self.append_rows(batch)
+
+    def has_more(self):
+        """Return True while the attached source or fetcher may still produce rows."""
+        return self._source is not None or self._fetch is not None
+
+    def clear(self):
+        """Remove all rows and release the source cursor."""
+        self.beginResetModel()
+        self._close_source()
+        self.columns = [[] for _ in self.headers]
+        self.row_total = 0
+        self.endResetModel()
+
+    def _close_source(self):
+        self._generation += 1
+        self._fetch, self._position, self._pending = None, None, False
+        source, self._source = self._source, None
+        if source is not None and hasattr(source, "close"):
+            source.close()
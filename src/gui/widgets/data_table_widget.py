@@ -1,23 +1,43 @@
 from PyQt5 import QtWidgets, QtCore
+from gui.widgets.columnar_table_model import ColumnarTableModel
 
 class DataTableWidget(QtWidgets.QWidget):
-    def __init__(self, parent=None):
+    # Emitted (debounced) with the search text when server-side search is enabled
+    search_requested = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None, debounce_ms=250):
         super(DataTableWidget, self).__init__(parent)
         self.layout = QtWidgets.QVBoxLayout(self)
         
-        # Create table widget with better display
-        self.table = QtWidgets.QTableWidget(self)
+        # Virtualized view: rows live in a columnar model and are fetched lazily
+        self.model = ColumnarTableModel(self)
+        self.proxy = QtCore.QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(-1)
+        self.proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.proxy.rowsInserted.connect(self.update_row_count)
+        self.proxy.modelReset.connect(self.update_row_count)
+
+        self.table = QtWidgets.QTableView(self)
+        self.table.setModel(self.proxy)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         self.table.setAlternatingRowColors(True)
         self.table.setSortingEnabled(True)
         self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        # ResizeToContents would measure every row; size from the visible rows only
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
         
         # Add search/filter functionality
         self.search_input = QtWidgets.QLineEdit()
         self.search_input.setPlaceholderText("Rechercher...")
-        self.search_input.textChanged.connect(self.filter_table)
+        self.server_search = False
+        self.filter_timer = QtCore.QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(debounce_ms)
+        self.filter_timer.timeout.connect(self._apply_search)
+        self.search_input.textChanged.connect(self.filter_timer.start)
         
         # Add row count label
         self.row_count_label = QtWidgets.QLabel()
@@ -30,15 +50,15 @@ class DataTableWidget(QtWidgets.QWidget):
         
         # Style
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 background: white;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #0078D7;
                 color: white;
             }
@@ -60,47 +80,24 @@ class DataTableWidget(QtWidgets.QWidget):
 
     def set_headers(self, headers):
         """Set the column headers for the table."""
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model.set_headers(headers)
         self.table.horizontalHeader().setDefaultAlignment(QtCore.Qt.AlignLeft)
 
     def add_row(self, row_data):
         """Add a row of data to the table."""
-        row_position = self.table.rowCount()
-        self.table.insertRow(row_position)
-        
-        for column, data in enumerate(row_data):
-            item = QtWidgets.QTableWidgetItem()
-            
-            # Handle different data types
-            if isinstance(data, (int, float)):
-                item.setData(QtCore.Qt.DisplayRole, data)
-                item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
-            elif isinstance(data, bool):
-                item.setCheckState(QtCore.Qt.Checked if data else QtCore.Qt.Unchecked)
-                item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
-            else:
-                item.setText(str(data) if data is not None else "")
-            
-            self.table.setItem(row_position, column, item)
-        
-        self.update_row_count()
+        self.model.append_rows([tuple(row_data)])
 
     def clear(self):
         """Clear all rows from the table."""
-        self.table.setRowCount(0)
+        self.model.clear()
         self.update_row_count()
 
     def get_selected_row_data(self):
         """Return the data of the selected row as a dictionary."""
-        selected_row = self.table.currentRow()
-        if selected_row >= 0:
-            row_data = {}
-            for column in range(self.table.columnCount()):
-                header = self.table.horizontalHeaderItem(column).text()
-                item = self.table.item(selected_row, column)
-                row_data[header] = item.text() if item else None
-            return row_data
+        index = self.table.currentIndex()
+        if index.isValid():
+            source_row = self.proxy.mapToSource(index).row()
+            return dict(zip(self.model.headers, self.model.row(source_row)))
         return None
 
     def set_data(self, data):
@@ -114,32 +111,52 @@ class DataTableWidget(QtWidgets.QWidget):
         if isinstance(data[0], dict):
             headers = list(data[0].keys())
             self.set_headers(headers)
-            for row_dict in data:
-                self.add_row([row_dict[header] for header in headers])
+            self.model.append_rows([tuple(row_dict[header] for header in headers) for row_dict in data])
         else:
-            for row_data in data:
-                self.add_row(row_data)
-                
+            self.model.append_rows([tuple(row_data) for row_data in data])
+        self._resize_columns()
+
+    def set_stream(self, headers, batches):
+        """Display rows pulled lazily from an iterator of row batches (a streaming cursor)."""
+        self.table.horizontalHeader().setDefaultAlignment(QtCore.Qt.AlignLeft)
+        self.model.set_source(headers, batches)
+        self._resize_columns()
+
+    def set_fetcher(self, headers, fetch, rows=(), position=None):
+        """Display `rows`, then pull further batches through fetch(position, deliver) as the view scrolls."""
+        self.table.horizontalHeader().setDefaultAlignment(QtCore.Qt.AlignLeft)
+        self.model.set_fetcher(headers, fetch, rows, position)
+        self._resize_columns()
         self.update_row_count()
 
+    def _resize_columns(self):
+        # Only the rows currently laid out in the viewport are measured
+        for column in range(self.model.columnCount()):
+            self.table.resizeColumnToContents(column)
+
+    def set_server_search(self, enabled):
+        """Send search text to search_requested (e.g. an FTS index) instead of filtering fetched rows."""
+        self.server_search = enabled
+        if enabled:
+            self.proxy.setFilterFixedString("")
+
+    def _apply_search(self):
+        text = self.search_input.text()
+        if self.server_search:
+            self.search_requested.emit(text)
+        else:
+            self.filter_table(text)
+
     def filter_table(self, text):
-        """Filter table rows based on search text."""
-        for row in range(self.table.rowCount()):
-            row_hidden = True
-            for column in range(self.table.columnCount()):
-                item = self.table.item(row, column)
-                if item and text.lower() in item.text().lower():
-                    row_hidden = False
-                    break
-            self.table.setRowHidden(row, row_hidden)
-        
+        """Filter the rows fetched so far based on search text."""
+        self.proxy.setFilterFixedString(text)
         self.update_row_count()
 
-    def update_row_count(self):
+    def update_row_count(self, *args):
         """Update the row count label."""
-        visible_rows = sum(1 for row in range(self.table.rowCount()) 
-                         if not self.table.isRowHidden(row))
-        total_rows = self.table.rowCount()
+        visible_rows = self.proxy.rowCount()
+        total_rows = self.model.rowCount()
+        more = "+" if self.model.has_more() else ""
         self.row_count_label.setText(
-            f"Affichage de {visible_rows} ligne(s) sur {total_rows} au total"
+            f"Affichage de {visible_rows} ligne(s) sur {total_rows}{more} au total"
         )
@@ -1,12 +1,20 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
 class LoadingSpinner(QtWidgets.QWidget):
+    cancel_requested = QtCore.pyqtSignal()
+
     def __init__(self, parent=None):
         super(LoadingSpinner, self).__init__(parent)
         self.layout = QtWidgets.QVBoxLayout(self)
         self.spinner = QtWidgets.QLabel("Loading...", self)
         self.spinner.setAlignment(QtCore.Qt.AlignCenter)
+        self.message_label = QtWidgets.QLabel("", self)
+        self.message_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.cancel_button = QtWidgets.QPushButton("Cancel", self)
+        self.cancel_button.clicked.connect(self.cancel_requested.emit)
         self.layout.addWidget(self.spinner)
+        self.layout.addWidget(self.message_label)
+        self.layout.addWidget(self.cancel_button, alignment=QtCore.Qt.AlignCenter)
 
         self.setStyleSheet("""
             LoadingSpinner {
@@ -23,11 +31,19 @@ class LoadingSpinner(QtWidgets.QWidget):
 
     def show_spinner(self, message="Loading..."):
         """Show the spinner with a custom message."""
-        # self.spinner.setText(message)
+        self.message_label.setText(message)
         self.animation.start()
         self.show()
 
     def hide_spinner(self):
         """Hide the spinner."""
         self.animation.stop()
-        self.hide()
\ No newline at end of file
+        self.message_label.clear()
+        self.hide()
+
+    def set_busy(self, busy, message="Loading..."):
+        """Show or hide the spinner from the state of running jobs."""
+        if busy:
+            self.show_spinner(message)
+        else:
+            self.hide_spinner()
\ No newline at end of file
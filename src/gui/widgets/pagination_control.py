@@ -10,10 +10,16 @@ class PaginationControl(QtWidgets.QWidget):
         self.prev_button = QtWidgets.QPushButton("Previous", self)
         self.next_button = QtWidgets.QPushButton("Next", self)
         self.page_label = QtWidgets.QLabel("Page 1", self)
+        self.page_input = QtWidgets.QSpinBox(self)
+        self.page_input.setMinimum(1)
+        self.page_input.setMaximum(1)
+        self.go_button = QtWidgets.QPushButton("Go", self)
 
         self.layout.addWidget(self.prev_button)
         self.layout.addWidget(self.page_label)
         self.layout.addWidget(self.next_button)
+        self.layout.addWidget(self.page_input)
+        self.layout.addWidget(self.go_button)
 
         self.setStyleSheet("""
             QPushButton {
@@ -33,14 +39,35 @@ class PaginationControl(QtWidgets.QWidget):
 
         self.prev_button.clicked.connect(self.previous_page)
         self.next_button.clicked.connect(self.next_page)
+        self.go_button.clicked.connect(lambda: self.set_page(self.page_input.value()))
 
         self.current_page = 1
+        self.total_pages = None  # Unknown until set_total_pages is called
         self.items_per_page = 10  # Default value for items per page
+        self.update_controls()
+
+    def set_total_pages(self, total_pages):
+        """Set the (approximate) number of pages and clamp navigation to it."""
+        self.total_pages = max(1, int(total_pages))
+        self.page_input.setMaximum(self.total_pages)
+        self.update_controls()
+
+    def update_controls(self):
+        """Refresh the label and enable navigation buttons from the page count."""
+        if self.total_pages:
+            self.page_label.setText(f"Page {self.current_page} / ~{self.total_pages}")
+        else:
+            self.page_label.setText(f"Page {self.current_page}")
+        self.prev_button.setEnabled(self.current_page > 1)
+        self.next_button.setEnabled(self.total_pages is None or self.current_page < self.total_pages)
 
     def set_page(self, page):
         """Set the current page and update the label."""
-        self.current_page = page
-        self.page_label.setText(f"Page {self.current_page}")
+        if self.total_pages:
+            page = min(page, self.total_pages)
+        self.current_page = max(1, page)
+        self.page_input.setValue(self.current_page)
+        self.update_controls()
         self.page_changed.emit(self.current_page)
 
     def previous_page(self):
@@ -51,5 +78,5 @@ class PaginationControl(QtWidgets.QWidget):
 
     def next_page(self):
         """Navigate to the next page."""
-        self.current_page += 1
-        self.set_page(self.current_page)
\ No newline at end of file
+        if self.total_pages is None or self.current_page < self.total_pages:
+            self.set_page(self.current_page + 1)
\ No newline at end of file
@@ -1,7 +1,10 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
 class SearchBar(QtWidgets.QWidget):
-    def __init__(self, parent=None):
+    # Emitted once typing has paused for debounce_ms, instead of on every keystroke
+    search_requested = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None, debounce_ms=300):
         super(SearchBar, self).__init__(parent)
         self.layout = QtWidgets.QHBoxLayout(self)
         self.search_input = QtWidgets.QLineEdit(self)
@@ -17,10 +20,21 @@ class SearchBar(QtWidgets.QWidget):
 
         self.clear_button.clicked.connect(self.clear_search)
 
+        self.debounce_timer = QtCore.QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self._emit_search)
+        self.search_input.textChanged.connect(self.debounce_timer.start)
+        self.search_input.returnPressed.connect(self._emit_search)
+
     def get_search_text(self):
         """Return the current text in the search input."""
         return self.search_input.text()
 
+    def _emit_search(self):
+        self.debounce_timer.stop()
+        self.search_requested.emit(self.get_search_text())
+
     def clear_search(self):
         """Clear the search input."""
         self.search_input.clear()
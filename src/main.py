@@ -1,10 +1,20 @@
 import os
 import signal
-from PyQt5.QtWidgets import QApplication
 import sys
-from gui.main_window import MainWindow
+from utils.startup_profiler import startup_profiler
+
+# Startup imports, timed one by one with --profile-startup (each entry excludes the modules loaded before it)
+STARTUP_COMPONENTS = (
+    "PyQt5.QtWidgets",
+    "modules.database_connector",
+    "modules.crud_operator",
+    "modules.query_executor",
+    "modules.schema_manager",
+    "gui.main_window",
+)
 
 def signal_handler(signum, frame):
+    from PyQt5.QtWidgets import QApplication
     QApplication.quit()
     sys.exit(0)
 
@@ -19,12 +29,27 @@ def setup_console():
     print("\033[38;5;226m⚡ Welcome to SGDB! ⚡\033[0m")  # Yellow color
 
 def main():
+    profile_startup = "--profile-startup" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--profile-startup")
+        startup_profiler.enabled = True
+    for name in STARTUP_COMPONENTS:
+        startup_profiler.import_module(name)
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from gui.main_window import MainWindow
+
     signal.signal(signal.SIGINT, signal_handler)
     setup_console()
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    with startup_profiler.measure("init", "QApplication"):
+        app = QApplication(sys.argv)
+    with startup_profiler.measure("init", "MainWindow (total)"):
+        window = MainWindow()
+        window.show()
+    if profile_startup:
+        # Printed once the event loop runs, after the first paint; tabs opened later are reported as they load
+        QTimer.singleShot(0, lambda: print(startup_profiler.report()))
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,170 @@
+import logging
+import queue
+import threading
+import time
+
+_STOP = object()
+
+INSERT_LOG_QUERY = """
+    INSERT INTO sys_logs (operation_type, table_name, status, message, details)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class AuditLogWriter:
+    """
+    Écriture asynchrone de sys_logs : les opérations déposent leurs entrées dans une file
+    bornée, un thread d'arrière-plan les écrit par lots (executemany, une transaction par lot).
+    Un lot qui ne peut pas être écrit est reporté dans le journal applicatif (logging), jamais perdu.
+    policy : 'block' (le producteur attend), 'drop' (entrée ignorée si la file est pleine)
+    ou 'sample' (au-delà de la moitié de la file, seule une entrée sur `sample_every` est gardée).
+    """
+
+    POLICIES = ('block', 'drop', 'sample')
+
+    def __init__(self, connector, max_queue=10000, batch_size=256, max_latency=0.5, policy='block', sample_every=10):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Politique de file inconnue : {policy}")
+        self.connector = connector
+        self.batch_size = max(1, int(batch_size))
+        self.max_latency = max_latency
+        self.policy = policy
+        self.sample_every = max(1, int(sample_every))
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._flush_requested = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "sampled_out": 0, "batches": 0, "errors": 0,
+                       "fallback": 0}
+        self._sample_counter = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AuditLogWriter", daemon=True)
+        self._thread.start()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def log(self, operation_type, table_name, status='SUCCESS', message=None, details=None):
+        """Dépose une entrée de journal dans la file selon la politique de saturation"""
+        if self._closed:
+            raise RuntimeError("Le journal d'audit est fermé")
+        record = (operation_type, table_name, status, message, details)
+
+        if self.policy == 'block':
+            self._queue.put(record)
+        else:
+            if self.policy == 'sample' and self._queue.qsize() >= self._queue.maxsize // 2:
+                with self._stats_lock:
+                    self._sample_counter += 1
+                    keep = self._sample_counter % self.sample_every == 0
+                if not keep:
+                    self._count("sampled_out")
+                    return
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._count("dropped")
+                return
+        self._count("enqueued")
+
+    def log_after_transaction(self, operation_type, table_name, status='SUCCESS', message=None, details=None):
+        """
+        Dépose l'entrée à la fin de la transaction englobante du thread (tout de suite hors transaction) :
+        une entrée SUCCESS seulement si cette transaction est validée, une erreur dans tous les cas.
+        """
+        self.connector.after_transaction(
+            lambda: self.log(operation_type, table_name, status, message, details),
+            on_commit=status == 'SUCCESS')
+
+    def _insert(self, batch):
+        self.connector.get_connection()
+        # Attente sans délai du verrou d'écriture du processus : une longue transaction d'un autre
+        # thread retarde le lot au lieu de le faire échouer (PoolTimeoutError)
+        with self.connector.pool.writer_connection(timeout=-1):
+            with self.connector.transaction() as cursor:
+                cursor.executemany(INSERT_LOG_QUERY, batch)
+
+    def _write(self, batch):
+        try:
+            # Un lot annulé n'a rien écrit : il peut être rejoué tel quel si la base est verrouillée
+            self.connector.retry("AUDIT_LOG", self._insert, batch)
+            self.connector.get_result_cache().invalidate("sys_logs")
+            self._count("written", len(batch))
+            self._count("batches")
+        except Exception as e:
+            self._count("errors")
+            logging.error(f"Échec d'écriture de {len(batch)} entrée(s) sys_logs : {e}")
+            self._fallback(batch)
+
+    def _fallback(self, batch):
+        """Reporte dans le journal applicatif les entrées qui n'ont pas pu être écrites dans sys_logs"""
+        for operation_type, table_name, status, message, details in batch:
+            logging.warning(f"sys_logs (non écrit) : {operation_type} {table_name} {status} "
+                            f"message={message!r} details={details!r}")
+        self._count("fallback", len(batch))
+
+    def _run(self):
+        stop = False
+        while not stop:
+            record = self._queue.get()
+            if record is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [record]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.batch_size and not self._flush_requested.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(record)
+
+            # Vider sans attendre ce qui est déjà dans la file, par lots complets
+            while len(batch) < self.batch_size and (stop or self._flush_requested.is_set()):
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    self._queue.task_done()
+                    stop = True
+                    continue
+                batch.append(record)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self):
+        """Écrit de façon synchrone toutes les entrées en attente"""
+        if not self._thread.is_alive():
+            return
+        self._flush_requested.set()
+        try:
+            self._queue.join()
+        finally:
+            self._flush_requested.clear()
+
+    def stats(self):
+        """Retourne les compteurs du journal d'audit"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def close(self):
+        """Vide la file puis arrête le thread d'écriture"""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_requested.set()
+        self._queue.put(_STOP)
+        self._thread.join()
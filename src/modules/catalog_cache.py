@@ -0,0 +1,283 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from .partitioning import PartitionLayout, load_layouts
+
+
+def split_table_name(table_name: str) -> Tuple[Optional[str], str]:
+    """'archive.orders' -> ('archive', 'orders') ; 'orders' et 'main.orders' -> (None, 'orders')"""
+    schema, _, name = table_name.rpartition('.')
+    schema = schema.strip('"[]`')
+    name = name.strip('"[]`')
+    if not schema or schema.lower() == 'main':
+        return None, name
+    return schema, name
+
+
+def qualified_name(table_name: str) -> str:
+    """Nom canonique d'une table : préfixé par le schéma sauf pour la base principale"""
+    schema, name = split_table_name(table_name)
+    return f"{schema}.{name}" if schema else name
+
+
+def table_pragma(pragma: str, table_name: str) -> str:
+    """PRAGMA portant sur une table, éventuellement d'une base attachée : PRAGMA archive.table_info(orders)"""
+    schema, name = split_table_name(table_name)
+    return f'PRAGMA "{schema}".{pragma}("{name}")' if schema else f'PRAGMA {pragma}("{name}")'
+
+
+class IndexInfo(NamedTuple):
+    """Index d'une table : nom, unicité, origine ('c' CREATE INDEX, 'u' UNIQUE, 'pk'), index partiel et colonnes dans l'ordre de la clé"""
+    name: str
+    unique: bool
+    origin: str
+    partial: bool
+    columns: Tuple[str, ...]
+
+
+class TableInfo(NamedTuple):
+    """Description d'une table telle que vue par SQLite, complétée par son entrée dans sys_tables"""
+    name: str
+    table_id: Optional[int]
+    table_type: Optional[str]
+    # Lignes brutes de PRAGMA table_info : (cid, name, type, notnull, dflt_value, pk)
+    column_info: Tuple[tuple, ...]
+    indexes: Tuple[IndexInfo, ...]
+    # 'table' ou 'view' d'après sqlite_master (None pour les tables internes comme sqlite_master)
+    object_type: Optional[str] = None
+    # Tables référencées par les clés étrangères, et présence de triggers (écritures en cascade)
+    references: Tuple[str, ...] = ()
+    has_triggers: bool = False
+
+    @property
+    def columns(self) -> List[str]:
+        return [col[1] for col in self.column_info]
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        return {col[1]: col[2] for col in self.column_info}
+
+    @property
+    def primary_key(self) -> List[str]:
+        return [col[1] for col in sorted((col for col in self.column_info if col[5]), key=lambda col: col[5])]
+
+    @property
+    def rowid_column(self) -> Optional[str]:
+        """Colonne INTEGER PRIMARY KEY (alias du rowid), s'il y en a une"""
+        primary = [col for col in self.column_info if col[5]]
+        if len(primary) == 1 and (primary[0][2] or '').upper() == 'INTEGER':
+            return primary[0][1]
+        return None
+
+
+class CatalogCache:
+    """
+    Cache mémoire du catalogue partagé par tous les modules : identifiant sys_tables, colonnes,
+    types et index de chaque table. Une recherche en régime établi est un accès dictionnaire.
+    Les tables des bases attachées sont désignées par leur nom qualifié (« archive.orders ») ;
+    « main.orders » et « orders » désignent la même entrée.
+    Les DDL passant par SchemaManager, QueryExecutor ou CRUDOperator invalident explicitement
+    les tables concernées ; les DDL d'autres connexions sont détectés par PRAGMA schema_version,
+    relu au plus toutes les `validate_interval` secondes (0 : à chaque recherche).
+    """
+
+    def __init__(self, connector, validate_interval: float = 1.0):
+        self.connector = connector
+        self.validate_interval = validate_interval
+        self._tables: Dict[str, TableInfo] = {}
+        self._table_names: Dict[Optional[str], List[str]] = {}
+        # Découpage des tables partitionnées (sys_partitions), chargé en une requête
+        self._partitions: Optional[Dict[str, PartitionLayout]] = None
+        self._schema_version = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _lookup(self, load, cursor=None):
+        """Exécute `load(cursor)` sur le curseur fourni (transaction en cours) ou sur une connexion de lecture"""
+        if cursor is not None:
+            self._validate(cursor)
+            return load(cursor)
+        with self.connector.read_cursor() as read_cursor:
+            self._validate(read_cursor)
+            return load(read_cursor)
+
+    def _validate(self, cursor) -> None:
+        """Vide le cache si le schéma a été modifié par une autre connexion"""
+        now = time.monotonic()
+        if self._schema_version is not None and now - self._checked_at < self.validate_interval:
+            return
+        # Une version par base : principale puis bases attachées
+        schema_version = []
+        for schema in ('main', *sorted(self.connector.attached())):
+            cursor.execute(f'PRAGMA "{schema}".schema_version')
+            schema_version.append(cursor.fetchone()[0])
+        schema_version = tuple(schema_version)
+        with self._lock:
+            if self._schema_version is not None and schema_version != self._schema_version:
+                logging.info(f"Schéma modifié (version {self._schema_version} -> {schema_version}), catalogue en cache vidé.")
+                self._tables.clear()
+                self._table_names.clear()
+                self._partitions = None
+                self.invalidations += 1
+            self._schema_version = schema_version
+            self._checked_at = now
+
+    def _is_fresh(self) -> bool:
+        return self._schema_version is not None and time.monotonic() - self._checked_at < self.validate_interval
+
+    def table(self, table_name: str, cursor=None) -> Optional[TableInfo]:
+        """Description de la table (None si elle n'existe ni dans SQLite ni dans sys_tables)"""
+        table_name = qualified_name(table_name)
+        entry = self._tables.get(table_name)
+        if entry is not None and self._is_fresh():
+            self.hits += 1
+            return entry
+
+        def load(cursor):
+            entry = self._tables.get(table_name)
+            if entry is not None:
+                return entry
+            entry = self._load_table(cursor, table_name)
+            if entry is not None:
+                with self._lock:
+                    self._tables[table_name] = entry
+            return entry
+
+        self.misses += 1
+        return self._lookup(load, cursor)
+
+    def _load_table(self, cursor, table_name: str) -> Optional[TableInfo]:
+        schema, name = split_table_name(table_name)
+        master = f'"{schema}".sqlite_master' if schema else 'sqlite_master'
+        try:
+            cursor.execute(table_pragma('table_info', table_name))
+        except sqlite3.OperationalError:
+            # Base attachée inconnue (détachée entre-temps)
+            return None
+        column_info = tuple(tuple(row) for row in cursor.fetchall())
+        try:
+            cursor.execute("SELECT id, table_type FROM sys_tables WHERE table_name = ?", (table_name,))
+            registered = cursor.fetchone()
+        except sqlite3.OperationalError:
+            # Catalogue système pas encore créé
+            registered = None
+        if not column_info and registered is None:
+            return None
+        indexes = []
+        references = ()
+        if column_info:
+            cursor.execute(table_pragma('index_list', table_name))
+            for index in cursor.fetchall():
+                cursor.execute(table_pragma('index_info', f"{schema}.{index[1]}" if schema else index[1]))
+                columns = tuple(row[2] for row in sorted(cursor.fetchall()))
+                indexes.append(IndexInfo(index[1], bool(index[2]), index[3], bool(index[4]), columns))
+            cursor.execute(table_pragma('foreign_key_list', table_name))
+            # Les clés étrangères d'une base attachée référencent des tables de cette même base
+            references = tuple(sorted({f"{schema}.{row[2]}" if schema else row[2] for row in cursor.fetchall()}))
+        cursor.execute(f"""
+            SELECT type, name FROM {master}
+            WHERE name = ? OR (type = 'trigger' AND tbl_name = ?)
+        """, (name, name))
+        objects = cursor.fetchall()
+        object_type = next((row[0] for row in objects if row[1] == name and row[0] in ('table', 'view')), None)
+        return TableInfo(
+            table_name,
+            registered[0] if registered else None,
+            registered[1] if registered else None,
+            column_info,
+            tuple(indexes),
+            object_type,
+            references,
+            any(row[0] == 'trigger' for row in objects),
+        )
+
+    def table_id(self, table_name: str, cursor=None) -> Optional[int]:
+        """Identifiant de la table dans sys_tables (None si elle n'y est pas enregistrée)"""
+        entry = self.table(table_name, cursor)
+        return entry.table_id if entry else None
+
+    def columns(self, table_name: str, cursor=None) -> List[str]:
+        """Noms des colonnes dans l'ordre de la table (liste vide si la table n'existe pas)"""
+        entry = self.table(table_name, cursor)
+        return entry.columns if entry else []
+
+    def column_types(self, table_name: str, cursor=None) -> Dict[str, str]:
+        entry = self.table(table_name, cursor)
+        return entry.column_types if entry else {}
+
+    def indexes(self, table_name: str, cursor=None) -> List[IndexInfo]:
+        entry = self.table(table_name, cursor)
+        return list(entry.indexes) if entry else []
+
+    def table_names(self, table_type: Optional[str] = 'USER', cursor=None) -> List[str]:
+        """Tables enregistrées dans sys_tables, filtrées par type ('USER', 'SYSTEM' ou None pour toutes)"""
+        names = self._table_names.get(table_type)
+        if names is not None and self._is_fresh():
+            self.hits += 1
+            return list(names)
+
+        def load(cursor):
+            if table_type is None:
+                cursor.execute("SELECT table_name FROM sys_tables ORDER BY id")
+            else:
+                cursor.execute("SELECT table_name FROM sys_tables WHERE table_type = ? ORDER BY id", (table_type,))
+            names = [row[0] for row in cursor.fetchall()]
+            with self._lock:
+                self._table_names[table_type] = names
+            return list(names)
+
+        self.misses += 1
+        return self._lookup(load, cursor)
+
+    def partition_layout(self, table_name: str, cursor=None) -> Optional[PartitionLayout]:
+        """Découpage de la table si elle est partitionnée (voir SchemaManager.create_partitioned_table), sinon None"""
+        layouts = self._partitions
+        if layouts is not None and self._is_fresh():
+            self.hits += 1
+            return layouts.get(table_name)
+
+        def load(cursor):
+            layouts = self._partitions
+            if layouts is None:
+                try:
+                    cursor.execute("""
+                        SELECT table_name, partition_name, partition_key, lower_bound, upper_bound
+                        FROM sys_partitions
+                    """)
+                    layouts = load_layouts(cursor.fetchall())
+                except sqlite3.OperationalError:
+                    # Aucune table partitionnée n'a encore été créée
+                    layouts = {}
+                with self._lock:
+                    self._partitions = layouts
+            return layouts.get(table_name)
+
+        self.misses += 1
+        return self._lookup(load, cursor)
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """Oublie une table (ou tout le catalogue) après un DDL ou un changement de sys_tables"""
+        with self._lock:
+            if table_name is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(qualified_name(table_name), None)
+            self._table_names.clear()
+            self._partitions = None
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        lookups = self.hits + self.misses
+        return {
+            "tables": len(self._tables),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "schema_version": self._schema_version,
+        }
@@ -1,16 +1,59 @@
 import logging
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from itertools import chain, islice
 from .database_connector import DatabaseConnector
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+@lru_cache(maxsize=512)
+def _insert_sql(table_name: str, columns: Tuple[str, ...]) -> str:
+    """Construit (une seule fois par table et jeu de colonnes) la requête d'insertion"""
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+@lru_cache(maxsize=512)
+def _update_sql(table_name: str, columns: Tuple[str, ...], conditions: str) -> str:
+    """Construit la requête de mise à jour"""
+    set_clause = ', '.join([f"{key} = ?" for key in columns])
+    return f"UPDATE {table_name} SET {set_clause} WHERE {conditions}"
+
+
+# À incrémenter à chaque modification de _create_system_tables
+SYSTEM_SCHEMA_VERSION = 1
+
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_index_name(table_name: str) -> str:
+    """Nom de la table FTS5 fantôme associée à une table utilisateur"""
+    return f"{table_name}_fts"
+
+
+def build_match_query(text: str, prefix: bool = True) -> str:
+    """
+    Transforme une saisie libre en requête MATCH FTS5 : chaque mot est cité (la syntaxe
+    FTS5 de l'utilisateur est neutralisée) et, avec prefix, devient une recherche par préfixe.
+    """
+    suffix = '*' if prefix else ''
+    return ' '.join(f'"{token}"{suffix}' for token in _SEARCH_TOKEN.findall(text))
+
 
 class CRUDOperator:
     def __init__(self, db_path: str):
         """Initialisation avec le chemin de la base de données SQLite"""
         self.connector = DatabaseConnector(db_path)
         self.connector.connect()
-        self._create_system_tables()
+        self.index_advisor = self.connector.get_index_advisor()
+        self.catalog = self.connector.get_catalog_cache()
+        self.result_cache = self.connector.get_result_cache()
+        # Version de schéma des métadonnées de chaque table
+        self._metadata_versions = {}
+        self.connector.ensure_schema('crud_operator', SYSTEM_SCHEMA_VERSION, self._create_system_tables)
 
-    def _create_system_tables(self):
-        """Crée les tables système nécessaires"""
+    def _create_system_tables(self, cursor):
+        """Crée les tables système nécessaires (une fois par base, voir DatabaseConnector.ensure_schema)"""
         queries = [
             """
             CREATE TABLE IF NOT EXISTS sys_tables (
@@ -92,113 +135,144 @@ class CRUDOperator:
             ('sys_logs', 'SYSTEM', 'Table containing system operation logs')
         ]
         
-        with self.connector.transaction() as cursor:
-            for query in queries:
-                cursor.execute(query)
+        for query in queries:
+            cursor.execute(query)
+        
+        # Insert system tables metadata
+        for table_name, table_type, description in system_tables:
+            cursor.execute("""
+                INSERT OR IGNORE INTO sys_tables (table_name, table_type, description)
+                VALUES (?, ?, ?)
+            """, (table_name, table_type, description))
             
-            # Insert system tables metadata
-            for table_name, table_type, description in system_tables:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO sys_tables (table_name, table_type, description)
-                    VALUES (?, ?, ?)
-                """, (table_name, table_type, description))
-                
-                # Get the table_id for the system table
-                cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
-                table_id = cursor.fetchone()[0]
-                
-                # Get column information for system tables
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns_info = cursor.fetchall()
-                
-                # Get foreign key information
-                cursor.execute(f"PRAGMA foreign_key_list({table_name})")
-                fk_info = {col[3]: (col[2], col[4]) for col in cursor.fetchall()}
+            # Get the table_id for the system table
+            cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
+            table_id = cursor.fetchone()[0]
+            
+            # Get column information for system tables
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            columns_info = cursor.fetchall()
+            
+            # Get foreign key information
+            cursor.execute(f"PRAGMA foreign_key_list({table_name})")
+            fk_info = {col[3]: (col[2], col[4]) for col in cursor.fetchall()}
+            
+            # Get index information
+            cursor.execute(f"PRAGMA index_list({table_name})")
+            index_info = cursor.fetchall()
+            
+            # Insert system columns metadata with enhanced information
+            for position, col in enumerate(columns_info, 1):
+                column_name = col[1]
+                is_pk = bool(col[5])  # pk flag from PRAGMA table_info
+                is_fk = column_name in fk_info
+                ref_table = fk_info[column_name][0] if is_fk else None
+                ref_column = fk_info[column_name][1] if is_fk else None
                 
-                # Get index information
-                cursor.execute(f"PRAGMA index_list({table_name})")
-                index_info = cursor.fetchall()
+                cursor.execute("""
+                    INSERT OR IGNORE INTO sys_columns (
+                        table_id, column_name, data_type, is_nullable,
+                        column_default, ordinal_position, is_primary_key,
+                        is_foreign_key, referenced_table, referenced_column,
+                        character_maximum_length
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    table_id, column_name, col[2], not col[3],
+                    col[4], position, is_pk, is_fk, ref_table,
+                    ref_column, None
+                ))
                 
-                # Insert system columns metadata with enhanced information
-                for position, col in enumerate(columns_info, 1):
-                    column_name = col[1]
-                    is_pk = bool(col[5])  # pk flag from PRAGMA table_info
-                    is_fk = column_name in fk_info
-                    ref_table = fk_info[column_name][0] if is_fk else None
-                    ref_column = fk_info[column_name][1] if is_fk else None
-                    
+                # Add constraint information
+                if is_pk:
                     cursor.execute("""
-                        INSERT OR IGNORE INTO sys_columns (
-                            table_id, column_name, data_type, is_nullable,
-                            column_default, ordinal_position, is_primary_key,
-                            is_foreign_key, referenced_table, referenced_column,
-                            character_maximum_length
+                        INSERT OR IGNORE INTO sys_constraints (
+                            table_id, constraint_name, constraint_type,
+                            column_name
                         )
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        VALUES (?, ?, ?, ?)
                     """, (
-                        table_id, column_name, col[2], not col[3],
-                        col[4], position, is_pk, is_fk, ref_table,
-                        ref_column, None
+                        table_id,
+                        f"pk_{table_name}_{column_name}",
+                        "PRIMARY KEY",
+                        column_name
                     ))
-                    
-                    # Add constraint information
-                    if is_pk:
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO sys_constraints (
-                                table_id, constraint_name, constraint_type,
-                                column_name
-                            )
-                            VALUES (?, ?, ?, ?)
-                        """, (
-                            table_id,
-                            f"pk_{table_name}_{column_name}",
-                            "PRIMARY KEY",
-                            column_name
-                        ))
-                    
-                    if is_fk:
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO sys_constraints (
-                                table_id, constraint_name, constraint_type,
-                                column_name, referenced_table, referenced_column
-                            )
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (
-                            table_id,
-                            f"fk_{table_name}_{column_name}",
-                            "FOREIGN KEY",
-                            column_name,
-                            ref_table,
-                            ref_column
-                        ))
                 
-                # Add index information
-                for idx in index_info:
-                    cursor.execute(f"PRAGMA index_info({idx[1]})")
-                    idx_columns = cursor.fetchall()
-                    for idx_col in idx_columns:
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO sys_indexes (
-                                table_id, index_name, column_name,
-                                is_unique, is_primary
-                            )
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (
-                            table_id,
-                            idx[1],
-                            columns_info[idx_col[1]][1],
-                            bool(idx[2]),
-                            idx[1].startswith('sqlite_autoindex')
-                        ))
+                if is_fk:
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO sys_constraints (
+                            table_id, constraint_name, constraint_type,
+                            column_name, referenced_table, referenced_column
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (
+                        table_id,
+                        f"fk_{table_name}_{column_name}",
+                        "FOREIGN KEY",
+                        column_name,
+                        ref_table,
+                        ref_column
+                    ))
+            
+            # Add index information
+            for idx in index_info:
+                cursor.execute(f"PRAGMA index_info({idx[1]})")
+                idx_columns = cursor.fetchall()
+                for idx_col in idx_columns:
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO sys_indexes (
+                            table_id, index_name, column_name,
+                            is_unique, is_primary
+                        )
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (
+                        table_id,
+                        idx[1],
+                        columns_info[idx_col[1]][1],
+                        bool(idx[2]),
+                        idx[1].startswith('sqlite_autoindex')
+                    ))
 
     def _log_operation(self, operation_type: str, table_name: str, status: str = 'SUCCESS', message: str = None, details: str = None) -> None:
-        """Enregistre une opération dans sys_logs"""
-        query = """
-            INSERT INTO sys_logs (operation_type, table_name, status, message, details) 
-            VALUES (?, ?, ?, ?, ?)
+        """Enregistre une opération dans sys_logs (écriture asynchrone par lots, après validation de la transaction)"""
+        self.connector.get_audit_writer().log_after_transaction(operation_type, table_name, status, message, details)
+
+    def _table_signature(self, cursor, table_name: str) -> tuple:
+        """Retourne le DDL de la table et de ses index, tel qu'enregistré dans sqlite_master"""
+        cursor.execute("""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE tbl_name = ?
+            ORDER BY type, name
+        """, (table_name,))
+        return tuple(cursor.fetchall())
+
+    def _sync_table_metadata(self, cursor, table_name: str) -> None:
+        """
+        Reconstruit les métadonnées de la table uniquement si un DDL l'a modifiée.
+        En régime établi, seul PRAGMA schema_version est lu : une écriture de données
+        ne touche plus sys_columns, sys_indexes ni sys_constraints.
         """
+        cursor.execute("PRAGMA schema_version")
+        schema_version = cursor.fetchone()[0]
+        known = self._metadata_versions.get(table_name)
+        if known and known[0] == schema_version:
+            return
+
+        signature = self._table_signature(cursor, table_name)
+        if known is None or known[1] != signature:
+            self._update_table_metadata(table_name)
+            self.result_cache.invalidate_schema()
+            if known is not None:
+                # DDL fait hors de SchemaManager / QueryExecutor
+                self.catalog.invalidate(table_name)
+        self._metadata_versions[table_name] = (schema_version, signature)
+
+    def refresh_table_metadata(self, table_name: str, force: bool = False) -> None:
+        """Resynchronise les métadonnées d'une table après un changement de schéma"""
+        if force:
+            self._metadata_versions.pop(table_name, None)
         with self.connector.transaction() as cursor:
-            cursor.execute(query, (operation_type, table_name, status, message, details))
+            self._sync_table_metadata(cursor, table_name)
 
     def _update_table_metadata(self, table_name: str) -> None:
         """Met à jour les métadonnées de la table"""
@@ -301,22 +375,35 @@ class CRUDOperator:
                         idx[1].startswith('sqlite_autoindex')
                     ))
 
+    def _partition_targets(self, table_name: str, conditions: str = '', params=()) -> List[str]:
+        """Tables à lire ou modifier : partitions compatibles avec les conditions, ou la table elle-même"""
+        layout = self.catalog.partition_layout(table_name)
+        if layout is None:
+            return [table_name]
+        return [partition.name for partition in layout.prune(conditions, params)]
+
+    def _read_source(self, table_name: str, conditions: str, params) -> str:
+        """Clause FROM d'une lecture : pour une table partitionnée, seulement les partitions non élaguées"""
+        layout = self.catalog.partition_layout(table_name)
+        if layout is None:
+            return table_name
+        return layout.source(layout.prune(conditions, params))
+
     def create(self, table_name: str, data: Dict[str, Any]) -> int:
-        """Insère un nouvel enregistrement dans la table spécifiée."""
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join('?' * len(data))
-        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        """Insère un nouvel enregistrement dans la table spécifiée (dans sa partition si elle est partitionnée)."""
+        layout = self.catalog.partition_layout(table_name)
+        if layout is None:
+            target = table_name
+        elif layout.key not in data:
+            raise ValueError(f"La clé de partitionnement {layout.key} est requise pour insérer dans {table_name}")
+        else:
+            target = layout.partition_for(data[layout.key]).name
+        query = _insert_sql(target, tuple(data))
+        self.index_advisor.observe(table_name, operation='INSERT')
         
         try:
             with self.connector.transaction() as cursor:
-                cursor.execute("SELECT table_type FROM sys_tables WHERE table_name = ?", (table_name,))
-                result = cursor.fetchone()
-                if not result:
-                    cursor.execute("""
-                        INSERT INTO sys_tables (table_name, table_type, description)
-                        VALUES (?, 'USER', ?)
-                    """, (table_name, f"User created table: {table_name}"))
-                
+                self._ensure_registered(cursor, table_name)
                 cursor.execute(query, tuple(data.values()))
                 inserted_id = cursor.lastrowid
                 self._log_operation(
@@ -325,9 +412,13 @@ class CRUDOperator:
                     'SUCCESS',
                     f"Record inserted successfully with ID: {inserted_id}"
                 )
-                self._update_table_metadata(table_name)
-                return inserted_id
+                self._sync_table_metadata(cursor, table_name)
+            self.result_cache.invalidate(target)
+            return inserted_id
         except Exception as e:
+            # La transaction a pu être annulée : l'enregistrement dans sys_tables sera revérifié
+            self.catalog.invalidate(table_name)
+            self._metadata_versions.pop(table_name, None)
             self._log_operation(
                 "INSERT",
                 table_name,
@@ -336,22 +427,141 @@ class CRUDOperator:
             )
             raise
 
+    def _ensure_registered(self, cursor, table_name: str) -> None:
+        """Enregistre la table dans sys_tables si elle n'y figure pas encore (recherche dans le catalogue en cache)"""
+        if self.catalog.table_id(table_name, cursor) is not None:
+            return
+        cursor.execute("""
+            INSERT INTO sys_tables (table_name, table_type, description)
+            VALUES (?, 'USER', ?)
+        """, (table_name, f"User created table: {table_name}"))
+        self.result_cache.invalidate("sys_tables")
+        # Rechargé dans la transaction ; en cas d'annulation, l'appelant invalide l'entrée
+        self.catalog.invalidate(table_name)
+        self.catalog.table(table_name, cursor)
+
+    def create_many(self, table_name: str, rows: Iterable[Union[Dict[str, Any], Sequence]],
+                    columns: Optional[Sequence[str]] = None, batch_size: int = 1000,
+                    on_batch: Optional[Callable[[sqlite3.Cursor, int], Any]] = None) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Insère en masse des enregistrements (dicts ou tuples) avec executemany,
+        une transaction et une entrée sys_logs par lot de `batch_size` lignes.
+        Pour des tuples sans `columns`, toutes les colonnes de la table sont attendues dans l'ordre.
+        on_batch(curseur, nb_lignes) est appelé dans la transaction de chaque lot (ex: point de reprise).
+        Retourne la plage (premier_rowid, dernier_rowid) insérée, en supposant des rowid
+        attribués par SQLite ; le débit est disponible dans self.last_bulk_stats.
+        Pour une table partitionnée, chaque lot est réparti entre les partitions et, les rowid
+        étant propres à chaque partition, la plage retournée est (None, None).
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        iterator = iter(rows)
+        first_row = next(iterator, None)
+        self.last_bulk_stats = {"rows": 0, "batches": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+        if first_row is None:
+            return None, None
+        iterator = chain([first_row], iterator)
+
+        as_dicts = isinstance(first_row, dict)
+        if columns is None:
+            if as_dicts:
+                columns = list(first_row.keys())
+            else:
+                columns = self.catalog.columns(table_name)
+        columns = list(columns)
+        query = _insert_sql(table_name, tuple(columns))
+        layout = self.catalog.partition_layout(table_name)
+        if layout is not None and layout.key not in columns:
+            raise ValueError(f"La clé de partitionnement {layout.key} est requise pour insérer dans {table_name}")
+        self.index_advisor.observe(table_name, operation='INSERT')
+
+        first_rowid = last_rowid = None
+        total_rows = 0
+        batches = 0
+        started = time.perf_counter()
+        try:
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                if as_dicts:
+                    batch = [tuple(row[column] for column in columns) for row in batch]
+                batch_started = time.perf_counter()
+                if layout is None:
+                    targets = {table_name: batch}
+                else:
+                    targets = {}
+                    key_index = columns.index(layout.key)
+                    for row in batch:
+                        targets.setdefault(layout.partition_for(row[key_index]).name, []).append(row)
+                with self.connector.transaction() as cursor:
+                    self._ensure_registered(cursor, table_name)
+                    if layout is None:
+                        cursor.executemany(query, batch)
+                        cursor.execute("SELECT last_insert_rowid()")
+                        batch_last = cursor.fetchone()[0]
+                        batch_first = batch_last - len(batch) + 1
+                        inserted = f"rowid {batch_first}-{batch_last}"
+                    else:
+                        for target, rows in targets.items():
+                            cursor.executemany(_insert_sql(target, tuple(columns)), rows)
+                        batch_first = batch_last = None
+                        inserted = f"{len(targets)} partition(s)"
+                    elapsed = time.perf_counter() - batch_started
+                    self._log_operation(
+                        "BULK_INSERT",
+                        table_name,
+                        'SUCCESS',
+                        f"Inserted {len(batch)} records ({inserted}) "
+                        f"at {len(batch) / elapsed if elapsed else 0:.0f} rows/s"
+                    )
+                    self._sync_table_metadata(cursor, table_name)
+                    if on_batch:
+                        on_batch(cursor, len(batch))
+                for target in targets:
+                    self.result_cache.invalidate(target)
+                if first_rowid is None:
+                    first_rowid = batch_first
+                last_rowid = batch_last
+                total_rows += len(batch)
+                batches += 1
+        except Exception as e:
+            self.catalog.invalidate(table_name)
+            self._metadata_versions.pop(table_name, None)
+            self._log_operation(
+                "BULK_INSERT",
+                table_name,
+                'ERROR',
+                f"{e} (after {total_rows} committed records)"
+            )
+            raise
+
+        seconds = time.perf_counter() - started
+        rows_per_sec = total_rows / seconds if seconds else 0.0
+        self.last_bulk_stats = {"rows": total_rows, "batches": batches, "seconds": seconds, "rows_per_sec": rows_per_sec}
+        logging.info(f"Insertion en masse dans {table_name} : {total_rows} lignes en {batches} lot(s), {rows_per_sec:.0f} lignes/s.")
+        return first_rowid, last_rowid
+
     def read(self, table_name: str, conditions: str = '', params: tuple = ()) -> List[Dict[str, Any]]:
-        """Récupère les enregistrements de la table spécifiée."""
-        query = f"SELECT * FROM {table_name} {conditions}"
+        """Récupère les enregistrements de la table spécifiée (partitions élaguées d'après les conditions)."""
+        query = f"SELECT * FROM {self._read_source(table_name, conditions, params)} {conditions}"
+        self.index_advisor.observe(table_name, conditions)
         
         try:
-            with self.connector.transaction() as cursor:
-                cursor.execute(query, params)
-                columns = [column[0] for column in cursor.description]
-                results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                self._log_operation(
-                    "SELECT",
-                    table_name,
-                    'SUCCESS',
-                    f"Retrieved {len(results)} records"
-                )
-                return results
+            results = self.result_cache.get(query, params)
+            if results is None:
+                pending = self.result_cache.begin(query, params)
+                columns, rows = self.connector.retry("SELECT", self._fetch, query, params)
+                self.result_cache.put(pending, columns, rows)
+                results = [dict(zip(columns, row)) for row in rows]
+            self._log_operation(
+                "SELECT",
+                table_name,
+                'SUCCESS',
+                f"Retrieved {len(results)} records"
+            )
+            return results
         except Exception as e:
             self._log_operation(
                 "SELECT",
@@ -361,15 +571,49 @@ class CRUDOperator:
             )
             raise
 
+    def _fetch(self, query: str, params: tuple):
+        """Exécute une lecture sur une connexion de lecture du pool (connexion d'écriture dans une unit_of_work)"""
+        with self.connector.query_cursor() as cursor:
+            cursor.execute(query, params)
+            return [column[0] for column in cursor.description], cursor.fetchall()
+
+    def stream(self, table_name: str, conditions: str = '', params: tuple = (), batch_size: int = 1000) -> Iterator[List[sqlite3.Row]]:
+        """
+        Récupère les enregistrements par lots de sqlite3.Row depuis une connexion de lecture,
+        sans matérialiser la table : un seul lot est en mémoire à la fois.
+        """
+        query = f"SELECT * FROM {self._read_source(table_name, conditions, params)} {conditions}"
+        self.index_advisor.observe(table_name, conditions)
+        total = 0
+        try:
+            with self.connector.read_cursor() as cursor:
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield rows
+        except Exception as e:
+            self._log_operation("SELECT", table_name, 'ERROR', str(e))
+            raise
+        self._log_operation("SELECT", table_name, 'SUCCESS', f"Streamed {total} records")
+
     def update(self, table_name: str, data: Dict[str, Any], conditions: str, params: tuple) -> None:
-        """Met à jour les enregistrements dans la table spécifiée."""
-        set_clause = ', '.join([f"{key} = ?" for key in data.keys()])
-        query = f"UPDATE {table_name} SET {set_clause} WHERE {conditions}"
+        """
+        Met à jour les enregistrements dans la table spécifiée (dans chaque partition non élaguée).
+        Une ligne ne change pas de partition : modifier sa clé hors de l'intervalle viole le CHECK.
+        """
+        targets = self._partition_targets(table_name, conditions, params)
+        self.index_advisor.observe(table_name, conditions, 'UPDATE')
         
-        try:
+        def run():
             with self.connector.transaction() as cursor:
-                cursor.execute(query, tuple(data.values()) + params)
-                affected_rows = cursor.rowcount
+                affected_rows = 0
+                for target in targets:
+                    cursor.execute(_update_sql(target, tuple(data), conditions), tuple(data.values()) + params)
+                    affected_rows += cursor.rowcount
                 self._log_operation(
                     "UPDATE",
                     table_name,
@@ -377,7 +621,13 @@ class CRUDOperator:
                     f"Updated {affected_rows} records",
                     f"Conditions: {conditions}"
                 )
-                self._update_table_metadata(table_name)
+                self._sync_table_metadata(cursor, table_name)
+
+        try:
+            # Rejouable : la requête est idempotente et la transaction en échec est annulée en entier
+            self.connector.retry("UPDATE", run)
+            for target in targets:
+                self.result_cache.invalidate(target)
         except Exception as e:
             self._log_operation(
                 "UPDATE",
@@ -388,13 +638,16 @@ class CRUDOperator:
             raise
 
     def delete(self, table_name: str, conditions: str, params: tuple) -> None:
-        """Supprime les enregistrements de la table spécifiée."""
-        query = f"DELETE FROM {table_name} WHERE {conditions}"
+        """Supprime les enregistrements de la table spécifiée (dans chaque partition non élaguée)."""
+        targets = self._partition_targets(table_name, conditions, params)
+        self.index_advisor.observe(table_name, conditions, 'DELETE')
         
-        try:
+        def run():
             with self.connector.transaction() as cursor:
-                cursor.execute(query, params)
-                affected_rows = cursor.rowcount
+                affected_rows = 0
+                for target in targets:
+                    cursor.execute(f"DELETE FROM {target} WHERE {conditions}", params)
+                    affected_rows += cursor.rowcount
                 self._log_operation(
                     "DELETE",
                     table_name,
@@ -402,7 +655,13 @@ class CRUDOperator:
                     f"Deleted {affected_rows} records",
                     f"Conditions: {conditions}"
                 )
-                self._update_table_metadata(table_name)
+                self._sync_table_metadata(cursor, table_name)
+
+        try:
+            # Rejouable : la requête est idempotente et la transaction en échec est annulée en entier
+            self.connector.retry("DELETE", run)
+            for target in targets:
+                self.result_cache.invalidate(target)
         except Exception as e:
             self._log_operation(
                 "DELETE",
@@ -412,6 +671,154 @@ class CRUDOperator:
             )
             raise
 
+    def enable_search(self, table_name: str, columns: Optional[Sequence[str]] = None,
+                      tokenize: str = 'unicode61 remove_diacritics 2') -> List[str]:
+        """
+        Crée l'index plein texte FTS5 `<table>_fts` (contenu externe, indexes de préfixes 2 et 3
+        caractères) sur les colonnes textuelles de la table, puis les triggers qui le maintiennent
+        à jour à chaque INSERT, UPDATE et DELETE. Retourne les colonnes indexées.
+        """
+        index = search_index_name(table_name)
+        try:
+            with self.connector.transaction() as cursor:
+                column_types = self.catalog.column_types(table_name, cursor)
+                if not column_types:
+                    raise ValueError(f"Table inconnue : {table_name}")
+                if columns is None:
+                    columns = [name for name, data_type in column_types.items()
+                               if not any(t in (data_type or '').upper() for t in ('INT', 'REAL', 'FLOA', 'DOUB', 'BLOB'))]
+                columns = list(columns)
+                if not columns:
+                    raise ValueError(f"Aucune colonne textuelle à indexer dans {table_name}")
+
+                column_list = ', '.join(columns)
+                new_values = ', '.join(f"new.{col}" for col in columns)
+                old_values = ', '.join(f"old.{col}" for col in columns)
+                cursor.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+                        {column_list}, content='{table_name}', content_rowid='rowid',
+                        tokenize='{tokenize}', prefix='2 3'
+                    )
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {table_name} BEGIN
+                        INSERT INTO {index}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {table_name} BEGIN
+                        INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {index}_au AFTER UPDATE ON {table_name} BEGIN
+                        INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+                        INSERT INTO {index}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+                    END
+                """)
+                # Indexation des lignes existantes
+                cursor.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+                self._log_operation("ENABLE_SEARCH", table_name, 'SUCCESS', f"Indexed columns: {column_list}")
+                self._sync_table_metadata(cursor, table_name)
+        except Exception as e:
+            self._log_operation("ENABLE_SEARCH", table_name, 'ERROR', str(e))
+            raise
+        finally:
+            self.catalog.invalidate(index)
+            self.result_cache.invalidate_schema(table_name)
+        return columns
+
+    def disable_search(self, table_name: str) -> None:
+        """Supprime l'index plein texte de la table et ses triggers."""
+        index = search_index_name(table_name)
+        with self.connector.transaction() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {index}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {index}")
+            self._log_operation("DISABLE_SEARCH", table_name, 'SUCCESS')
+            self._sync_table_metadata(cursor, table_name)
+        self.catalog.invalidate(index)
+        self.result_cache.invalidate_schema(table_name)
+
+    def read_batch(self, table_name: str, position: Optional[tuple] = None,
+                   limit: int = 500) -> Tuple[List[str], List[tuple], Optional[tuple]]:
+        """
+        Lit au plus `limit` lignes à partir de `position` (None : début de la table) sur une connexion
+        de lecture rendue au pool aussitôt : aucun curseur ni instantané ne reste ouvert entre deux lots.
+        Parcours par rowid croissant (même coût pour chaque lot), par décalage pour une vue (table
+        partitionnée) ou une table WITHOUT ROWID.
+        Retourne (colonnes, lignes, position du lot suivant ou None en fin de table).
+        """
+        table = self.catalog.table(table_name)
+        by_rowid = table is not None and table.object_type == 'table' and (position is None or position[0] == 'rowid')
+        offset = position[1] if position and not by_rowid else 0
+        with self.connector.read_cursor() as cursor:
+            if by_rowid:
+                try:
+                    cursor.execute(
+                        f"SELECT rowid, * FROM {table_name} {'WHERE rowid > ?' if position else ''} "
+                        f"ORDER BY rowid LIMIT ?", (position[1], limit) if position else (limit,))
+                except sqlite3.OperationalError:
+                    # Table WITHOUT ROWID
+                    by_rowid = False
+            if not by_rowid:
+                cursor.execute(f"SELECT * FROM {table_name} LIMIT ? OFFSET ?", (limit, offset))
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        if len(rows) < limit:
+            next_position = None
+        elif by_rowid:
+            next_position = ('rowid', rows[-1][0])
+        else:
+            next_position = ('offset', offset + len(rows))
+        if by_rowid:
+            columns, rows = columns[1:], [row[1:] for row in rows]
+        return columns, rows, next_position
+
+    def search_enabled(self, table_name: str) -> bool:
+        """Indique si la table possède un index plein texte."""
+        return self.catalog.table(search_index_name(table_name)) is not None
+
+    def search(self, table_name: str, text: str, limit: int = 100, offset: int = 0,
+               prefix: bool = True) -> List[Dict[str, Any]]:
+        """
+        Recherche plein texte via l'index FTS5 : les lignes sont classées par pertinence (bm25)
+        et seule la page demandée est lue. Chaque résultat contient la colonne `_rank`.
+        """
+        match = build_match_query(text, prefix)
+        if not match:
+            return []
+        index = search_index_name(table_name)
+        query = f"""
+            SELECT t.*, bm25({index}) AS _rank
+            FROM {index}
+            JOIN {table_name} AS t ON t.rowid = {index}.rowid
+            WHERE {index} MATCH ?
+            ORDER BY _rank
+            LIMIT ? OFFSET ?
+        """
+        try:
+            with self.connector.read_cursor() as cursor:
+                cursor.execute(query, (match, limit, offset))
+                columns = [column[0] for column in cursor.description]
+                results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception as e:
+            self._log_operation("SEARCH", table_name, 'ERROR', str(e), f"Match: {match}")
+            raise
+        self._log_operation("SEARCH", table_name, 'SUCCESS', f"Found {len(results)} records", f"Match: {match}")
+        return results
+
+    def unit_of_work(self):
+        """
+        Regroupe plusieurs appels CRUD en une seule transaction (un commit), annulée en entier
+        si une exception s'échappe du bloc : `with crud.unit_of_work(): crud.create(...); crud.update(...)`
+        """
+        return self.connector.unit_of_work()
+
+    def flush_logs(self) -> None:
+        """Écrit immédiatement les entrées sys_logs en attente."""
+        self.connector.get_audit_writer().flush()
+
     def close(self) -> None:
         """Ferme la connexion à la base de données."""
         self.connector.close_connection()
@@ -0,0 +1,318 @@
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .crud_operator import CRUDOperator
+from .schema_manager import SchemaManager
+
+IMPORT_FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.tab': 'tsv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+_DELIMITERS = {'csv': ',', 'tsv': '\t'}
+_INVALID_NAME = re.compile(r"\W+")
+
+CREATE_CHECKPOINT_TABLE = """
+    CREATE TABLE IF NOT EXISTS sys_import_checkpoints (
+        file_path TEXT PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        file_mtime INTEGER NOT NULL,
+        byte_offset INTEGER NOT NULL,
+        rows_imported INTEGER NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def detect_format(file_path: str) -> str:
+    """Déduit le format (csv, tsv, jsonl) depuis l'extension du fichier"""
+    fmt = IMPORT_FORMATS.get(os.path.splitext(file_path.lower())[1])
+    if fmt is None:
+        raise ValueError(f"Format de fichier non supporté : {file_path}")
+    return fmt
+
+
+def clean_column_name(name: Any, position: int) -> str:
+    """Transforme un en-tête en identifiant SQL valide"""
+    name = _INVALID_NAME.sub('_', str(name).strip()).strip('_')
+    if not name:
+        return f"col_{position + 1}"
+    return f"c_{name}" if name[0].isdigit() else name
+
+
+def _unique_names(names: List[Any]) -> List[str]:
+    columns, seen = [], {}
+    for position, name in enumerate(names):
+        column = clean_column_name(name, position)
+        count = seen.get(column.lower(), 0)
+        seen[column.lower()] = count + 1
+        columns.append(f"{column}_{count + 1}" if count else column)
+    return columns
+
+
+def _value_type(value: Any) -> Optional[str]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return 'INTEGER'
+    if isinstance(value, int):
+        return 'INTEGER'
+    if isinstance(value, float):
+        return 'REAL'
+    if not isinstance(value, str):
+        return 'TEXT'
+    try:
+        int(value)
+        return 'INTEGER'
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return 'REAL'
+    except ValueError:
+        return 'TEXT'
+
+
+def infer_column_types(rows: List[tuple], column_count: int) -> List[str]:
+    """Déduit le type SQLite (INTEGER, REAL, TEXT) de chaque colonne à partir d'un échantillon"""
+    types: List[Optional[str]] = [None] * column_count
+    for row in rows:
+        for index in range(min(column_count, len(row))):
+            current = types[index]
+            if current == 'TEXT':
+                continue
+            value_type = _value_type(row[index])
+            if value_type is None or value_type == current:
+                continue
+            if current is None:
+                types[index] = value_type
+            elif {current, value_type} == {'INTEGER', 'REAL'}:
+                types[index] = 'REAL'
+            else:
+                types[index] = 'TEXT'
+    return [value_type or 'TEXT' for value_type in types]
+
+
+def record_boundary(data: bytes, fmt: str) -> int:
+    """
+    Position juste après le dernier enregistrement complet de `data` (0 si aucun).
+    En CSV/TSV un saut de ligne ne termine un enregistrement que si le nombre de
+    guillemets qui le précèdent est pair (parité des guillemets).
+    """
+    end = data.rfind(b'\n')
+    if fmt == 'jsonl' or end < 0:
+        return end + 1
+    quotes_before = data.count(b'"', 0, end)
+    while end >= 0 and quotes_before % 2:
+        previous = data.rfind(b'\n', 0, end)
+        quotes_before -= data.count(b'"', previous + 1, end)
+        end = previous
+    return end + 1
+
+
+def _convert(value: Any, column_type: str) -> Any:
+    if value is None or value == '':
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, str) and column_type != 'TEXT':
+        try:
+            return int(value) if column_type == 'INTEGER' else float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def parse_chunk(data: bytes, fmt: str, columns: List[str], types: List[str]) -> List[tuple]:
+    """Analyse un bloc d'enregistrements complets et convertit les valeurs (exécuté dans un processus de travail)"""
+    text = data.decode('utf-8')
+    rows = []
+    width = len(columns)
+    if fmt == 'jsonl':
+        for line in text.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                rows.append(tuple(_convert(record.get(column), column_type)
+                                  for column, column_type in zip(columns, types)))
+        return rows
+    for record in csv.reader(io.StringIO(text, newline=''), delimiter=_DELIMITERS[fmt]):
+        if not record:
+            continue
+        record = (record + [None] * width)[:width]
+        rows.append(tuple(_convert(value, column_type) for value, column_type in zip(record, types)))
+    return rows
+
+
+class DataImporter:
+    """
+    Import en masse de fichiers CSV/TSV/JSONL : les blocs du fichier sont analysés dans un
+    processus de travail pendant que le thread appelant insère le bloc précédent via
+    CRUDOperator.create_many (executemany, une transaction par bloc). Le point de reprise
+    est écrit dans sys_import_checkpoints dans la même transaction que le bloc.
+    """
+
+    def __init__(self, db_path: str, chunk_size: int = 4 << 20, sample_rows: int = 1000, workers: int = 1):
+        self.crud_operator = CRUDOperator(db_path)
+        self.schema_manager = SchemaManager(db_path)
+        self.connector = self.crud_operator.connector
+        self.chunk_size = max(1024, int(chunk_size))
+        self.sample_rows = max(1, int(sample_rows))
+        self.workers = max(0, int(workers))
+        self.connector.ensure_schema('data_importer', 1, lambda cursor: cursor.execute(CREATE_CHECKPOINT_TABLE))
+
+    def import_file(self, file_path: str, table_name: Optional[str] = None, fmt: Optional[str] = None,
+                    resume: bool = True, progress: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
+        """
+        Importe le fichier dans `table_name` (par défaut le nom du fichier), créée si besoin.
+        Reprend après le dernier bloc validé si un import précédent a été interrompu.
+        progress(stats) reçoit après chaque bloc : rows, bytes, total_bytes, rows_per_sec.
+        Retourne les statistiques finales.
+        """
+        fmt = fmt or detect_format(file_path)
+        file_path = os.path.abspath(file_path)
+        table_name = table_name or clean_column_name(os.path.splitext(os.path.basename(file_path))[0], 0)
+        file_stat = os.stat(file_path)
+        total_bytes = file_stat.st_size
+
+        header, data_start, sample = self._read_sample(file_path, fmt)
+        columns = _unique_names(header)
+        types = infer_column_types(sample, len(columns))
+
+        checkpoint = self._load_checkpoint(file_path) if resume else None
+        if checkpoint:
+            if checkpoint['table_name'] != table_name or checkpoint['file_size'] != total_bytes \
+                    or checkpoint['file_mtime'] != file_stat.st_mtime_ns:
+                raise ValueError(f"{file_path} a changé depuis l'import interrompu ; relancez avec resume=False")
+            offset, imported = checkpoint['byte_offset'], checkpoint['rows_imported']
+            logging.info(f"Reprise de l'import de {file_path} à l'octet {offset} ({imported} lignes déjà importées).")
+        else:
+            offset, imported = data_start, 0
+            self._clear_checkpoint(file_path)
+            self._ensure_table(table_name, columns, types)
+
+        stats = {"table": table_name, "rows": imported, "bytes": offset, "total_bytes": total_bytes,
+                 "resumed_from": imported, "seconds": 0.0, "rows_per_sec": 0.0}
+        started = time.perf_counter()
+        for end, rows in self._parsed_chunks(file_path, fmt, offset, columns, types):
+            def save_checkpoint(cursor, _count, end=end, total=stats["rows"] + len(rows)):
+                cursor.execute("""
+                    INSERT OR REPLACE INTO sys_import_checkpoints
+                        (file_path, table_name, file_size, file_mtime, byte_offset, rows_imported, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (file_path, table_name, total_bytes, file_stat.st_mtime_ns, end, total))
+
+            if rows:
+                self.crud_operator.create_many(table_name, rows, columns, batch_size=len(rows), on_batch=save_checkpoint)
+                self.connector.get_result_cache().invalidate("sys_import_checkpoints")
+            stats["rows"] += len(rows)
+            stats["bytes"] = end
+            stats["seconds"] = time.perf_counter() - started
+            stats["rows_per_sec"] = (stats["rows"] - imported) / stats["seconds"] if stats["seconds"] else 0.0
+            if progress:
+                progress(dict(stats))
+
+        self._clear_checkpoint(file_path)
+        stats["seconds"] = time.perf_counter() - started
+        logging.info(f"Import de {file_path} dans {table_name} : {stats['rows'] - imported} lignes "
+                     f"en {stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} lignes/s).")
+        return stats
+
+    def _read_sample(self, file_path: str, fmt: str) -> Tuple[List[Any], int, List[tuple]]:
+        """Lit l'en-tête, sa taille en octets et un échantillon d'enregistrements pour l'inférence de types"""
+        with open(file_path, 'rb') as file:
+            data = file.read(self.chunk_size)
+        bom = 3 if data.startswith(b'\xef\xbb\xbf') else 0
+        end = record_boundary(data, fmt) or len(data)
+        lines = data[bom:end].decode('utf-8', errors='replace')
+        if fmt == 'jsonl':
+            records = [json.loads(line) for line in lines.splitlines()[:self.sample_rows] if line.strip()]
+            header = list(dict.fromkeys(key for record in records for key in record))
+            return header, bom, [tuple(record.get(key) for key in header) for record in records]
+
+        reader = csv.reader(io.StringIO(lines, newline=''), delimiter=_DELIMITERS[fmt])
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"{file_path} ne contient pas d'en-tête")
+        sample = [tuple(record) for _, record in zip(range(self.sample_rows), reader)]
+        # Fin de l'en-tête : premier saut de ligne précédé d'un nombre pair de guillemets
+        header_end = data.find(b'\n', bom)
+        while header_end >= 0 and data.count(b'"', bom, header_end) % 2:
+            header_end = data.find(b'\n', header_end + 1)
+        return header, header_end + 1 if header_end >= 0 else len(data), sample
+
+    def _chunks(self, file_path: str, fmt: str, offset: int) -> Iterator[Tuple[int, bytes]]:
+        """Découpe le fichier à partir de `offset` en blocs terminés sur une frontière d'enregistrement"""
+        with open(file_path, 'rb') as file:
+            file.seek(offset)
+            pending = b''
+            while True:
+                data = file.read(self.chunk_size)
+                if not data:
+                    if pending.strip():
+                        yield offset + len(pending), pending
+                    return
+                pending += data
+                boundary = record_boundary(pending, fmt)
+                if boundary:
+                    offset += boundary
+                    yield offset, pending[:boundary]
+                    pending = pending[boundary:]
+
+    def _parsed_chunks(self, file_path: str, fmt: str, offset: int, columns: List[str],
+                       types: List[str]) -> Iterator[Tuple[int, List[tuple]]]:
+        """Produit (position de fin, lignes) ; l'analyse du bloc suivant se fait pendant l'insertion du courant"""
+        chunks = self._chunks(file_path, fmt, offset)
+        if not self.workers:
+            for end, data in chunks:
+                yield end, parse_chunk(data, fmt, columns, types)
+            return
+        # « spawn » : un fork depuis un processus multithread (Qt, journal d'audit) peut hériter
+        # de verrous tenus par d'autres threads et des connexions sqlite ouvertes
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            pending = deque()
+            for end, data in chunks:
+                pending.append((end, executor.submit(parse_chunk, data, fmt, columns, types)))
+                if len(pending) > self.workers:
+                    end, future = pending.popleft()
+                    yield end, future.result()
+            while pending:
+                end, future = pending.popleft()
+                yield end, future.result()
+
+    def _ensure_table(self, table_name: str, columns: List[str], types: List[str]) -> None:
+        """Crée la table cible via SchemaManager si elle n'existe pas encore"""
+        if self._table_exists(table_name):
+            return
+        self.schema_manager.create_table(table_name, dict(zip(columns, types)))
+        if not self._table_exists(table_name):
+            raise RuntimeError(f"Impossible de créer la table {table_name}")
+
+    def _table_exists(self, table_name: str) -> bool:
+        with self.connector.query_cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+            return cursor.fetchone() is not None
+
+    def _load_checkpoint(self, file_path: str) -> Optional[Dict[str, Any]]:
+        with self.connector.query_cursor() as cursor:
+            cursor.execute("""
+                SELECT table_name, file_size, file_mtime, byte_offset, rows_imported
+                FROM sys_import_checkpoints WHERE file_path = ?
+            """, (file_path,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip(("table_name", "file_size", "file_mtime", "byte_offset", "rows_imported"), row))
+
+    def _clear_checkpoint(self, file_path: str) -> None:
+        with self.connector.transaction() as cursor:
+            cursor.execute("DELETE FROM sys_import_checkpoints WHERE file_path = ?", (file_path,))
+        self.connector.get_result_cache().invalidate("sys_import_checkpoints")
+
+    def close(self) -> None:
+        """Ferme la connexion à la base de données."""
+        self.crud_operator.close()
@@ -1,7 +1,161 @@
-import logging
+import base64
+import bz2
 import csv
+import gzip
+import io
+import json
+import logging
+import lzma
+import os
+import struct
+import sys
+from array import array
 from .crud_operator import CRUDOperator
-from typing import List, Dict, Any
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# Format colonnaire binaire, entiers en petit-boutiste (indépendant de la version de Python) :
+#   en-tête : COLUMNAR_MAGIC, un octet de version, puis uint32 longueur + JSON UTF-8 {"columns": [...]}
+#   par lot : uint32 nombre de lignes puis, pour chaque colonne, un octet de type, uint32 longueur et données :
+#     'q' : entiers int64 sans NULL, 'd' : réels float64 sans NULL (tableaux contigus) ;
+#     'v' : valeurs typées une à une, 0 NULL, 1 int64, 2 float64, 3 texte UTF-8, 4 BLOB
+#           (texte et BLOB : uint32 longueur + octets).
+COLUMNAR_MAGIC = b"SGBDCOL"
+COLUMNAR_VERSION = 2
+
+_LENGTH = struct.Struct('<I')
+_TAGGED_INT = struct.Struct('<Bq')
+_TAGGED_FLOAT = struct.Struct('<Bd')
+_TAGGED_SIZE = struct.Struct('<BI')
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'columnar')
+COMPRESSIONS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.sgbdcol': 'columnar', '.col': 'columnar'}
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+def _json_default(value):
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return str(value)
+
+
+def _detect_format(file_path: str) -> Tuple[str, Optional[str]]:
+    """Déduit le format et la compression depuis l'extension du fichier"""
+    root, ext = os.path.splitext(file_path.lower())
+    compression = _COMPRESSION_EXTENSIONS.get(ext)
+    if compression:
+        ext = os.path.splitext(root)[1]
+    return _EXTENSIONS.get(ext, 'csv'), compression
+
+
+def _pack_array(typecode: str, values) -> bytes:
+    block = array(typecode, values)
+    if sys.byteorder == 'big':
+        block.byteswap()
+    return block.tobytes()
+
+
+def _unpack_array(typecode: str, payload: bytes) -> list:
+    block = array(typecode)
+    block.frombytes(payload)
+    if sys.byteorder == 'big':
+        block.byteswap()
+    return block.tolist()
+
+
+def _encode_column(values) -> Tuple[bytes, bytes]:
+    """Encode les valeurs d'une colonne d'un lot : (octet de type, données)"""
+    kinds = set(map(type, values))
+    if kinds == {int} and all(-(1 << 63) <= value < (1 << 63) for value in values):
+        return b'q', _pack_array('q', values)
+    if kinds == {float}:
+        return b'd', _pack_array('d', values)
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(b'\x00')
+        elif isinstance(value, int):
+            parts.append(_TAGGED_INT.pack(1, value))
+        elif isinstance(value, float):
+            parts.append(_TAGGED_FLOAT.pack(2, value))
+        elif isinstance(value, str):
+            data = value.encode('utf-8')
+            parts += [_TAGGED_SIZE.pack(3, len(data)), data]
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+            parts += [_TAGGED_SIZE.pack(4, len(data)), data]
+        else:
+            raise TypeError(f"Valeur non exportable au format colonnaire : {type(value).__name__}")
+    return b'v', b''.join(parts)
+
+
+def _decode_column(kind: bytes, payload: bytes) -> list:
+    """Décode les données d'une colonne d'un lot"""
+    if kind == b'q':
+        return _unpack_array('q', payload)
+    if kind == b'd':
+        return _unpack_array('d', payload)
+    if kind != b'v':
+        raise ValueError(f"Type de colonne inconnu : {kind!r}")
+    values, offset = [], 0
+    while offset < len(payload):
+        tag = payload[offset]
+        if tag == 0:
+            values.append(None)
+            offset += 1
+        elif tag == 1:
+            values.append(_TAGGED_INT.unpack_from(payload, offset)[1])
+            offset += _TAGGED_INT.size
+        elif tag == 2:
+            values.append(_TAGGED_FLOAT.unpack_from(payload, offset)[1])
+            offset += _TAGGED_FLOAT.size
+        elif tag in (3, 4):
+            size = _TAGGED_SIZE.unpack_from(payload, offset)[1]
+            offset += _TAGGED_SIZE.size
+            data = payload[offset:offset + size]
+            values.append(data.decode('utf-8') if tag == 3 else data)
+            offset += size
+        else:
+            raise ValueError(f"Type de valeur inconnu : {tag}")
+    return values
+
+
+def _read_exact(file, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Fichier colonnaire tronqué")
+    return data
+
+
+def read_columnar(file_path: str, compression: Optional[str] = None) -> Iterator[Tuple[List[str], List[list]]]:
+    """Relit un fichier colonnaire : produit (colonnes, valeurs par colonne) pour chaque lot"""
+    if compression is None:
+        compression = _detect_format(file_path)[1]
+    opener = COMPRESSIONS[compression] if compression else open
+    with opener(file_path, 'rb') as file:
+        if file.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"{file_path} n'est pas un fichier colonnaire SGBD")
+        version = file.read(1)
+        if version != bytes([COLUMNAR_VERSION]):
+            raise ValueError(f"Version du format colonnaire non prise en charge : {version!r}")
+        header = json.loads(_read_exact(file, _LENGTH.unpack(_read_exact(file, _LENGTH.size))[0]))
+        columns = header["columns"]
+        while True:
+            prefix = file.read(_LENGTH.size)
+            if not prefix:
+                break
+            if len(prefix) != _LENGTH.size:
+                raise ValueError("Fichier colonnaire tronqué")
+            rows = _LENGTH.unpack(prefix)[0]
+            values = []
+            for _ in columns:
+                kind = _read_exact(file, 1)
+                size = _LENGTH.unpack(_read_exact(file, _LENGTH.size))[0]
+                values.append(_decode_column(kind, _read_exact(file, size)))
+            if any(len(column) != rows for column in values):
+                raise ValueError("Lot colonnaire incohérent")
+            yield columns, values
+
 
 class DataViewer:
     def __init__(self, db_path: str):
@@ -17,17 +171,97 @@ class DataViewer:
         else:
             print(f"Aucun enregistrement trouvé dans la table {table_name}.")
 
-    def export_data(self, table_name: str, file_path: str, conditions: str = '', params: tuple = ()) -> None:
-        """Exporte les données de la table spécifiée vers un fichier CSV."""
-        data = self.crud_operator.read(table_name, conditions, params)
-        if data:
-            with open(file_path, mode='w', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
-            logging.info(f"Données exportées avec succès vers {file_path}.")
-        else:
+    def export_data(self, table_name: str, file_path: str, conditions: str = '', params: tuple = (),
+                    export_format: Optional[str] = None, compression: Optional[str] = None,
+                    batch_size: int = 5000, progress: Optional[Callable[[int], Any]] = None) -> int:
+        """
+        Exporte les données de la table spécifiée en flux, lot par lot, sans charger la table en mémoire.
+        export_format : 'csv', 'jsonl' ou 'columnar' ; compression : 'gzip', 'bz2' ou 'xz'.
+        Tous deux sont déduits de l'extension (ex: .jsonl.gz) s'ils ne sont pas fournis.
+        progress(lignes_écrites) est appelé après chaque lot. Retourne le nombre de lignes exportées.
+        """
+        detected_format, detected_compression = _detect_format(file_path)
+        export_format = export_format or detected_format
+        compression = compression if compression is not None else detected_compression
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Format d'export inconnu : {export_format}")
+        if compression and compression not in COMPRESSIONS:
+            raise ValueError(f"Compression inconnue : {compression}")
+
+        batches = self.crud_operator.stream(table_name, conditions, params, batch_size)
+        first_batch = next(batches, None)
+        if not first_batch:
             print(f"Aucun enregistrement à exporter depuis la table {table_name}.")
+            return 0
+
+        columns = list(first_batch[0].keys())
+        # Écriture dans un fichier temporaire renommé à la fin : pas de fichier tronqué en cas d'erreur
+        part_path = f"{file_path}.part"
+        written = 0
+        try:
+            with self._open_output(part_path, compression) as binary:
+                text = None if export_format == 'columnar' else io.TextIOWrapper(
+                    binary, encoding='utf-8', newline='', write_through=True)
+                writer = self._writer(export_format, text or binary, columns)
+                for batch in self._with_first(first_batch, batches):
+                    writer(batch)
+                    written += len(batch)
+                    if progress:
+                        progress(written)
+                if text is not None:
+                    text.detach()
+            os.replace(part_path, file_path)
+        except BaseException:
+            batches.close()
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+
+        logging.info(f"{written} enregistrement(s) exporté(s) avec succès vers {file_path}.")
+        return written
+
+    @staticmethod
+    def _open_output(path: str, compression: Optional[str]):
+        """Ouvre le fichier de sortie en binaire, avec un tampon d'écriture de 1 Mo"""
+        if compression:
+            return COMPRESSIONS[compression](path, 'wb')
+        return open(path, 'wb', buffering=1 << 20)
+
+    @staticmethod
+    def _with_first(first_batch, batches):
+        yield first_batch
+        yield from batches
+
+    @staticmethod
+    def _writer(export_format: str, output, columns: List[str]) -> Callable[[list], None]:
+        """Retourne la fonction d'écriture d'un lot pour le format demandé"""
+        if export_format == 'columnar':
+            header = json.dumps({"columns": columns}, ensure_ascii=False).encode('utf-8')
+            output.write(COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION]) + _LENGTH.pack(len(header)) + header)
+
+            def write_columnar(batch):
+                parts = [_LENGTH.pack(len(batch))]
+                for values in zip(*batch):
+                    kind, payload = _encode_column(values)
+                    parts += [kind, _LENGTH.pack(len(payload)), payload]
+                output.write(b''.join(parts))
+            return write_columnar
+
+        text = output
+        if export_format == 'csv':
+            csv_writer = csv.writer(text)
+            csv_writer.writerow(columns)
+
+            def write_csv(batch):
+                csv_writer.writerows(batch)
+            return write_csv
+
+        def write_jsonl(batch):
+            text.write(''.join(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default) + '\n'
+                for row in batch
+            ))
+        return write_jsonl
 
     def close(self) -> None:
         """Ferme la connexion à la base de données."""
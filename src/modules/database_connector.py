@@ -1,49 +1,901 @@
 import logging
+import os
+import queue
+import random
+import re
 import sqlite3
+import threading
+import time
+from bisect import bisect_left
 from contextlib import contextmanager
+from pathlib import Path
+from .audit_logger import AuditLogWriter
+from .catalog_cache import CatalogCache
+from .index_advisor import IndexAdvisor
+from .result_cache import ResultCache
+
+
+# Profils de PRAGMA appliqués à l'ouverture de chaque connexion.
+# journal_mode n'est appliqué qu'à la connexion d'écriture (le mode WAL est persistant dans le fichier).
+PRAGMA_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32000,
+        "mmap_size": 134217728,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+DEFAULT_PROFILE = "balanced"
+# Version du schéma système appliquée par chaque composant (tables sys_*), voir ensure_schema
+CREATE_SCHEMA_VERSIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS sys_schema_versions (
+        component TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+WRITER_ONLY_PRAGMAS = ("journal_mode", "synchronous")
+# Modes d'ouverture des transactions : AUTO laisse sqlite3 ouvrir la transaction au premier
+# INSERT/UPDATE/DELETE (nécessaire pour PRAGMA foreign_keys, VACUUM ou ATTACH)
+BEGIN_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE", "AUTO")
+# Base ouverte par DatabaseConnector() sans chemin, si aucun connecteur n'existe encore
+DEFAULT_DB_PATH = "sgbd_simulator.db"
+# Alias d'une base attachée : identifiant simple, main et temp sont réservés par SQLite
+ATTACH_ALIAS = re.compile(r"^[A-Za-z_]\w*$")
+# Bornes (ms) des histogrammes d'attente du verrou d'écriture
+LOCK_WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def resolve_profile(profile=None):
+    """
+    Retourne le dictionnaire de PRAGMA d'un profil.
+    profile : nom d'un profil, ou dict {"base": nom, <pragma>: valeur, ...} pour surcharger un profil.
+    """
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, str):
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Profil de connexion inconnu : {profile}")
+        return dict(PRAGMA_PROFILES[profile])
+    overrides = dict(profile)
+    pragmas = resolve_profile(overrides.pop("base", DEFAULT_PROFILE))
+    unknown = set(overrides) - set(pragmas)
+    if unknown:
+        raise ValueError(f"PRAGMA non supportés dans le profil : {', '.join(sorted(unknown))}")
+    pragmas.update(overrides)
+    return pragmas
+
+
+def apply_pragmas(connection, pragmas, read_only=False):
+    """Applique les PRAGMA d'un profil à une connexion."""
+    for name, value in pragmas.items():
+        if read_only and name in WRITER_ONLY_PRAGMAS:
+            continue
+        connection.execute(f"PRAGMA {name} = {value}")
+
+
+def is_memory_path(db_path):
+    """Vrai pour une base en mémoire (":memory:" ou URI file::memory:)"""
+    db_path = str(db_path)
+    return db_path == ":memory:" or db_path.startswith("file::memory:")
+
+
+def registry_key(db_path):
+    """Clé du registre des connecteurs : chemin absolu, sans lien symbolique (tel quel pour une base en mémoire)"""
+    db_path = str(db_path)
+    if is_memory_path(db_path) or db_path.startswith("file:"):
+        return db_path
+    return os.path.realpath(os.path.expanduser(db_path))
+
+
+class PoolTimeoutError(TimeoutError):
+    """Levée quand aucune connexion du pool n'est disponible dans le délai imparti."""
+
+
+def is_readonly_error(error):
+    """Vrai pour SQLITE_READONLY : écriture tentée sur une connexion de lecture du pool."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF == sqlite3.SQLITE_READONLY
+    return "readonly" in str(error).lower()
+
+
+def is_busy_error(error):
+    """Vrai pour SQLITE_BUSY / SQLITE_LOCKED (« database is locked ») et l'attente du verrou d'écriture du pool."""
+    if isinstance(error, PoolTimeoutError):
+        return True
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class LockMetrics:
+    """
+    Histogrammes par type d'opération : attente du verrou d'écriture avant chaque transaction
+    (verrou du pool puis BEGIN, pendant lequel SQLite applique busy_timeout) et nombre de
+    nouvelles tentatives des opérations exécutées par DatabaseConnector.retry.
+    """
+
+    def __init__(self, buckets_ms=LOCK_WAIT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def _entry(self, operation):
+        entry = self._operations.get(operation)
+        if entry is None:
+            entry = self._operations[operation] = {
+                "transactions": 0,
+                "wait_total_ms": 0.0,
+                "wait_max_ms": 0.0,
+                "wait_histogram": [0] * (len(self.buckets_ms) + 1),
+                "calls": 0,
+                "retries": 0,
+                "busy_errors": 0,
+                "gave_up": 0,
+                "retry_histogram": {},
+            }
+        return entry
+
+    def record_wait(self, operation, seconds):
+        waited_ms = seconds * 1000
+        with self._lock:
+            entry = self._entry(operation)
+            entry["transactions"] += 1
+            entry["wait_total_ms"] += waited_ms
+            entry["wait_max_ms"] = max(entry["wait_max_ms"], waited_ms)
+            entry["wait_histogram"][bisect_left(self.buckets_ms, waited_ms)] += 1
+
+    def record_call(self, operation, retries, busy_errors, gave_up=False):
+        with self._lock:
+            entry = self._entry(operation)
+            entry["calls"] += 1
+            entry["retries"] += retries
+            entry["busy_errors"] += busy_errors
+            entry["gave_up"] += int(gave_up)
+            entry["retry_histogram"][retries] = entry["retry_histogram"].get(retries, 0) + 1
+
+    def stats(self):
+        """Métriques par opération ; les histogrammes sont indexés par borne supérieure ("<=5ms", ...)."""
+        labels = [f"<={bound}ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        with self._lock:
+            return {
+                operation: dict(
+                    entry,
+                    wait_total_ms=round(entry["wait_total_ms"], 3),
+                    wait_max_ms=round(entry["wait_max_ms"], 3),
+                    wait_histogram=dict(zip(labels, entry["wait_histogram"])),
+                    retry_histogram=dict(sorted(entry["retry_histogram"].items())),
+                )
+                for operation, entry in self._operations.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+
+class ConnectionPool:
+    """
+    Pool de connexions SQLite : une connexion d'écriture sérialisée par un verrou
+    et jusqu'à `size` connexions en lecture seule, une par thread de travail actif.
+    """
+
+    def __init__(self, db_path, size=4, timeout=5.0, profile=None, cached_statements=256):
+        self.db_path = str(db_path)
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        # Taille du cache d'instructions préparées de sqlite3, par connexion
+        self.cached_statements = cached_statements
+        self.pragmas = resolve_profile(profile)
+        self.writer = self._open_writer()
+        self.writer_lock = threading.RLock()
+        # Une base en mémoire n'existe que dans sa propre connexion : les lecteurs
+        # réutilisent alors la connexion d'écriture.
+        self.shared_reader = is_memory_path(self.db_path)
+        # Bases attachées (alias -> chemin) : la connexion d'écriture est attachée immédiatement,
+        # chaque lecteur l'est à sa prochaine réservation s'il a manqué un changement
+        self.attachments = {}
+        self._attach_version = 0
+        # Fonctions d'agrégation Python (nom -> (nombre d'arguments, classe)), déclarées sur chaque connexion
+        self.aggregates = {}
+        self._reader_versions = {}
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        # Connexions actuellement réservées, par identifiant de thread (pour interrupt())
+        self._active = {}
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "writer_checkouts": 0,
+        }
+
+    def _open_writer(self):
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.cached_statements)
+        apply_pragmas(connection, self.pragmas)
+        return connection
+
+    def _open_reader(self):
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=self.cached_statements)
+        apply_pragmas(connection, self.pragmas, read_only=True)
+        with self._readers_lock:
+            for name, (num_args, aggregate_class) in self.aggregates.items():
+                connection.create_aggregate(name, num_args, aggregate_class)
+            self._readers.append(connection)
+        return connection
+
+    def _record_wait(self, waited):
+        with self._stats_lock:
+            self._stats["checkouts"] += 1
+            self._stats["wait_time_total"] += waited
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
+            self._stats["in_use"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._stats["in_use"])
+
+    @contextmanager
+    def writer_connection(self, timeout=None):
+        """Réserve la connexion d'écriture pour le thread courant."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        if not self.writer_lock.acquire(timeout=timeout):
+            with self._stats_lock:
+                self._stats["timeouts"] += 1
+            raise PoolTimeoutError(f"Connexion d'écriture indisponible après {timeout}s")
+        with self._stats_lock:
+            self._stats["writer_checkouts"] += 1
+            self._stats["wait_time_total"] += time.perf_counter() - start
+        thread_id = threading.get_ident()
+        outermost = self._active.get(thread_id) is not self.writer
+        if outermost:
+            previous = self._active.get(thread_id)
+            self._active[thread_id] = self.writer
+        try:
+            yield self.writer
+        finally:
+            if outermost:
+                if previous is None:
+                    self._active.pop(thread_id, None)
+                else:
+                    self._active[thread_id] = previous
+            self.writer_lock.release()
+
+    @contextmanager
+    def reader_connection(self, timeout=None):
+        """Réserve une connexion en lecture seule ; les appels imbriqués d'un même thread la partagent."""
+        if self.shared_reader:
+            with self.writer_connection(timeout) as connection:
+                yield connection
+            return
+
+        held = getattr(self._local, "connection", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._release_reader(held)
+            return
+
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._stats["waits"] += 1
+            if not self._slots.acquire(timeout=timeout):
+                with self._stats_lock:
+                    self._stats["timeouts"] += 1
+                raise PoolTimeoutError(f"Aucune connexion de lecture disponible après {timeout}s")
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                connection = self._open_reader()
+            except Exception:
+                self._slots.release()
+                raise
+        self._record_wait(time.perf_counter() - start)
+        if self._reader_versions.get(id(connection), 0) != self._attach_version:
+            try:
+                self._sync_attachments(connection)
+            except Exception:
+                self._idle.put(connection)
+                with self._stats_lock:
+                    self._stats["in_use"] -= 1
+                self._slots.release()
+                raise
+
+        self._local.connection = connection
+        self._local.depth = 1
+        self._active[threading.get_ident()] = connection
+        try:
+            yield connection
+        finally:
+            self._release_reader(connection)
+
+    def _release_reader(self, connection):
+        # Des générateurs (stream_query...) d'un même thread peuvent se terminer dans n'importe quel
+        # ordre : la connexion ne revient au pool qu'à la sortie du dernier détenteur, quel qu'il soit.
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._active.pop(threading.get_ident(), None)
+        self._local.connection = None
+        if connection.in_transaction:
+            connection.rollback()
+        self._idle.put(connection)
+        with self._stats_lock:
+            self._stats["in_use"] -= 1
+        self._slots.release()
+
+    def attach(self, alias, db_path):
+        """Attache une base à la connexion d'écriture ; les lecteurs la verront à leur prochaine réservation."""
+        with self.writer_lock:
+            # SQLite refuse ATTACH dans une transaction : pas de BEGIN implicite pour cette instruction
+            self.writer.execute(f'ATTACH DATABASE ? AS "{alias}"', (str(db_path),))
+            try:
+                for name in WRITER_ONLY_PRAGMAS:
+                    self.writer.execute(f'PRAGMA "{alias}".{name} = {self.pragmas[name]}')
+            except Exception:
+                self.writer.execute(f'DETACH DATABASE "{alias}"')
+                raise
+            self.attachments[alias] = str(db_path)
+            self._attach_version += 1
+
+    def create_aggregate(self, name, num_args, aggregate_class):
+        """Déclare une fonction d'agrégation sur la connexion d'écriture, les lecteurs ouverts et les suivants."""
+        with self.writer_lock:
+            self.writer.create_aggregate(name, num_args, aggregate_class)
+        with self._readers_lock:
+            self.aggregates[name] = (num_args, aggregate_class)
+            for connection in self._readers:
+                connection.create_aggregate(name, num_args, aggregate_class)
+
+    def detach(self, alias):
+        """Détache une base de la connexion d'écriture ; les lecteurs la détachent à leur prochaine réservation."""
+        with self.writer_lock:
+            self.writer.execute(f'DETACH DATABASE "{alias}"')
+            self.attachments.pop(alias, None)
+            self._attach_version += 1
+
+    def _sync_attachments(self, connection):
+        """Aligne les bases attachées d'un lecteur sur celles de la connexion d'écriture (en lecture seule)."""
+        version = self._attach_version
+        attachments = dict(self.attachments)
+        current = {row[1] for row in connection.execute("PRAGMA database_list") if row[1] not in ("main", "temp")}
+        for alias in current - set(attachments):
+            connection.execute(f'DETACH DATABASE "{alias}"')
+        for alias in set(attachments) - current:
+            uri = Path(attachments[alias]).resolve().as_uri() + "?mode=ro"
+            connection.execute(f'ATTACH DATABASE ? AS "{alias}"', (uri,))
+        self._reader_versions[id(connection)] = version
+
+    def interrupt(self, thread_id=None):
+        """
+        Interrompt la requête en cours sur la connexion réservée par `thread_id`
+        (toutes les connexions réservées si None). La requête lève sqlite3.OperationalError("interrupted").
+        """
+        active = dict(self._active)
+        if thread_id is not None:
+            active = {thread_id: active[thread_id]} if thread_id in active else {}
+        for connection in set(active.values()):
+            connection.interrupt()
+        return len(active)
+
+    def set_profile(self, profile):
+        """Change le profil de PRAGMA de la connexion d'écriture et des lecteurs inactifs."""
+        pragmas = resolve_profile(profile)
+        with self.writer_lock:
+            apply_pragmas(self.writer, pragmas)
+            for alias in self.attachments:
+                for name in WRITER_ONLY_PRAGMAS:
+                    self.writer.execute(f'PRAGMA "{alias}".{name} = {pragmas[name]}')
+            self.pragmas = pragmas
+        with self._readers_lock:
+            readers = list(self._readers)
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for connection in idle:
+            apply_pragmas(connection, pragmas, read_only=True)
+            self._idle.put(connection)
+        logging.info(f"Profil de connexion appliqué à {1 + len(idle)}/{1 + len(readers)} connexion(s).")
+
+    def stats(self):
+        """Retourne les métriques d'utilisation du pool."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._readers_lock:
+            stats["readers_open"] = len(self._readers)
+        stats["size"] = self.size
+        stats["idle"] = self._idle.qsize()
+        return stats
+
+    def close(self):
+        """Ferme toutes les connexions du pool."""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for connection in readers:
+            connection.close()
+        self._reader_versions.clear()
+        with self.writer_lock:
+            self.writer.close()
+
 
 class DatabaseConnector:
+    """
+    Un connecteur par fichier de base : DatabaseConnector(chemin) retourne toujours la même
+    instance pour un même fichier (registre indexé par chemin absolu), si bien que les modules
+    construits sur ce chemin partagent pool, caches et journal d'audit.
+    DatabaseConnector() sans chemin retourne le connecteur par défaut (le premier créé).
+    Les options (pool_size, profile...) ne sont prises en compte qu'à la création.
+    """
+    # Connecteur par défaut ; le remettre à None réinitialise aussi le registre
     _instance = None
-    
-    def __new__(cls, db_path="sgbd_simulator.db"):
-        if cls._instance is None:
-            cls._instance = super(DatabaseConnector, cls).__new__(cls)
-            cls._instance.db_path = str(db_path)
-            cls._instance.connection = None
-        return cls._instance
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __new__(cls, db_path=None, pool_size=4, pool_timeout=5.0, profile=None, cached_statements=256):
+        with cls._registry_lock:
+            if cls._instance is None:
+                cls._registry = {}
+            if db_path is None:
+                if cls._instance is not None:
+                    return cls._instance
+                db_path = DEFAULT_DB_PATH
+            key = registry_key(db_path)
+            instance = cls._registry.get(key)
+            if instance is None:
+                instance = cls._registry[key] = cls._create(db_path, pool_size, pool_timeout, profile, cached_statements)
+                if cls._instance is None:
+                    cls._instance = instance
+            return instance
+
+    @classmethod
+    def _create(cls, db_path, pool_size, pool_timeout, profile, cached_statements):
+        instance = super(DatabaseConnector, cls).__new__(cls)
+        instance.db_path = str(db_path)
+        instance.pool_size = pool_size
+        instance.pool_timeout = pool_timeout
+        instance.profile = profile
+        instance.cached_statements = cached_statements
+        instance.pool = None
+        instance.connection = None
+        instance.audit_writer = None
+        instance.audit_options = {}
+        instance.index_advisor = None
+        instance.catalog_cache = None
+        instance.result_cache = None
+        instance.schema_versions = None
+        # Bases attachées (alias -> chemin), rattachées à chaque connect()
+        instance.attachments = {}
+        # Fonctions d'agrégation (nom -> (nombre d'arguments, classe)), redéclarées à chaque connect()
+        instance.aggregates = {}
+        # Profondeur de transaction() et rappels de fin de transaction, par thread
+        instance._local = threading.local()
+        # Gestion des verrous : mode d'ouverture des transactions d'écriture et nouvelles tentatives
+        instance.begin_mode = "IMMEDIATE"
+        instance.busy_retries = 5
+        instance.busy_base_delay = 0.05
+        instance.busy_max_delay = 2.0
+        instance.lock_metrics = LockMetrics()
+        return instance
 
     def connect(self) -> None:
+        if self.pool is not None:
+            return
         try:
-            self.connection = sqlite3.connect(str(self.db_path))  # Utiliser le bon chemin de la BD
+            self.pool = ConnectionPool(self.db_path, self.pool_size, self.pool_timeout, self.profile, self.cached_statements)
+            self.connection = self.pool.writer
+            for alias, db_path in self.attachments.items():
+                self.pool.attach(alias, db_path)
+            for name, (num_args, aggregate_class) in self.aggregates.items():
+                self.pool.create_aggregate(name, num_args, aggregate_class)
             logging.info("Connexion réussie à la base de données.")
         except Exception as e:
             logging.error(f"Erreur de connexion : {e}")
             raise e
 
     def get_connection(self):
-        """Retourne la connexion SQLite. Si la connexion n'est pas établie, elle sera créée."""
-        if self.connection is None: 
+        """Retourne la connexion SQLite d'écriture. Si la connexion n'est pas établie, elle sera créée."""
+        if self.connection is None:
             logging.info("Tentative de connexion à la base de données.")
-            self.connect() 
+            self.connect()
         return self.connection
 
     @contextmanager
-    def transaction(self):
-        """Gère une transaction avec commit et rollback."""
-        connection = self.get_connection()
-        cursor = connection.cursor()
+    def transaction(self, mode=None, operation=None):
+        """
+        Gère une transaction avec commit et rollback sur la connexion d'écriture.
+        Réentrante : un appel imbriqué dans le même thread ouvre un SAVEPOINT (RELEASE si le bloc
+        réussit, ROLLBACK TO s'il échoue) et seul le bloc le plus externe valide, en un seul commit.
+        mode : BEGIN DEFERRED / IMMEDIATE / EXCLUSIVE, ou AUTO (voir BEGIN_MODES) ; par défaut
+        self.begin_mode (IMMEDIATE : le verrou d'écriture est pris d'emblée, en attendant au plus
+        busy_timeout, au lieu d'échouer sans attente lors de la promotion d'une lecture en écriture).
+        operation : libellé de l'opération pour les métriques d'attente de verrou.
+        """
+        mode = (mode or self.begin_mode).upper()
+        if mode not in BEGIN_MODES:
+            raise ValueError(f"Mode de transaction inconnu : {mode}")
+        self.get_connection()
+        started = time.perf_counter()
+        callbacks, committed = [], False
+        try:
+            with self.pool.writer_connection() as connection:
+                depth = getattr(self._local, "depth", 0)
+                cursor = connection.cursor()
+                self._local.depth = depth + 1
+                if depth == 0:
+                    self._local.after = []
+                try:
+                    if depth == 0:
+                        try:
+                            if mode != "AUTO" and not connection.in_transaction:
+                                cursor.execute(f"BEGIN {mode}")
+                            self.lock_metrics.record_wait(
+                                operation or getattr(self._local, "operation", None) or "transaction",
+                                time.perf_counter() - started)
+                            yield cursor
+                            connection.commit()
+                            committed = True
+                        except Exception as e:
+                            connection.rollback()
+                            # Les blocs imbriqués annulés ont pu recharger le catalogue depuis l'état non validé
+                            if self.catalog_cache is not None:
+                                self.catalog_cache.invalidate()
+                            logging.error(f"Erreur dans la transaction : {e}")
+                            raise e
+                    else:
+                        mark = len(self._local.after)
+                        try:
+                            yield from self._savepoint(connection, cursor, f"sp_{depth}")
+                        except Exception:
+                            # Travail annulé par ROLLBACK TO : ses rappels « après validation » sont abandonnés
+                            self._local.after[mark:] = [entry for entry in self._local.after[mark:] if not entry[1]]
+                            raise
+                finally:
+                    self._local.depth = depth
+                    cursor.close()
+                    if depth == 0:
+                        callbacks, self._local.after = self._local.after, None
+        finally:
+            # Hors du verrou d'écriture : un rappel qui attend (file d'audit pleine) ne bloque pas les écrivains
+            for callback, on_commit in callbacks:
+                if committed or not on_commit:
+                    callback()
+
+    @staticmethod
+    def _savepoint(connection, cursor, name):
+        # Le SAVEPOINT ne doit pas ouvrir la transaction lui-même : son RELEASE la validerait
+        if not connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute(f"SAVEPOINT {name}")
         try:
             yield cursor
-            connection.commit()
-        except Exception as e:
-            connection.rollback()
-            logging.error(f"Erreur dans la transaction : {e}")
-            raise e
+            cursor.execute(f"RELEASE {name}")
+        except Exception:
+            # Une erreur grave (ex: disque plein) a pu annuler toute la transaction
+            if connection.in_transaction:
+                cursor.execute(f"ROLLBACK TO {name}")
+                cursor.execute(f"RELEASE {name}")
+            raise
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Regroupe plusieurs opérations (CRUD, DDL...) dans une seule transaction : leurs propres
+        transactions deviennent des SAVEPOINT, tout est validé en un commit à la sortie
+        et tout est annulé si une exception s'échappe du bloc.
+        """
+        with self.transaction() as cursor:
+            yield cursor
+
+    def retry(self, operation, func, *args, **kwargs):
+        """
+        Exécute func(*args, **kwargs) et la relance, après une attente exponentielle avec gigue
+        (« full jitter » : aléatoire entre 0 et min(busy_max_delay, busy_base_delay * 2^n)),
+        tant qu'elle échoue sur un verrou (voir is_busy_error), au plus busy_retries fois.
+        À réserver aux opérations idempotentes : une transaction en échec est annulée en entier,
+        mais les effets hors base de func seraient répétés. Dans une transaction déjà ouverte,
+        aucune nouvelle tentative n'est faite : c'est au bloc englobant de réessayer.
+        """
+        if self.in_transaction():
+            return func(*args, **kwargs)
+        previous = getattr(self._local, "operation", None)
+        self._local.operation = operation
+        retries = busy_errors = 0
+        try:
+            while True:
+                try:
+                    result = func(*args, **kwargs)
+                    break
+                except Exception as e:
+                    if not is_busy_error(e):
+                        raise
+                    busy_errors += 1
+                    if retries >= self.busy_retries:
+                        self.lock_metrics.record_call(operation, retries, busy_errors, gave_up=True)
+                        raise
+                    delay = random.uniform(0, min(self.busy_max_delay, self.busy_base_delay * 2 ** retries))
+                    retries += 1
+                    logging.warning(f"Base verrouillée ({operation}), tentative {retries}/{self.busy_retries} "
+                                    f"dans {delay * 1000:.0f} ms.")
+                    time.sleep(delay)
+        finally:
+            self._local.operation = previous
+        self.lock_metrics.record_call(operation, retries, busy_errors)
+        return result
+
+    def configure_busy_handling(self, busy_timeout_ms=None, retries=None, base_delay=None, max_delay=None,
+                                begin_mode=None):
+        """
+        Règle la gestion des verrous : busy_timeout (ms, appliqué à toutes les connexions),
+        nombre et délais (s) des nouvelles tentatives de retry(), mode d'ouverture par défaut des transactions.
+        """
+        if begin_mode is not None:
+            if begin_mode.upper() not in BEGIN_MODES:
+                raise ValueError(f"Mode de transaction inconnu : {begin_mode}")
+            self.begin_mode = begin_mode.upper()
+        if retries is not None:
+            self.busy_retries = max(0, int(retries))
+        if base_delay is not None:
+            self.busy_base_delay = base_delay
+        if max_delay is not None:
+            self.busy_max_delay = max_delay
+        if busy_timeout_ms is not None:
+            pragmas = dict(self.pool.pragmas) if self.pool else resolve_profile(self.profile)
+            self.set_profile(dict(pragmas, busy_timeout=int(busy_timeout_ms)))
+
+    def lock_stats(self):
+        """Histogrammes d'attente de verrou et de nouvelles tentatives, par type d'opération."""
+        return self.lock_metrics.stats()
+
+    def in_transaction(self):
+        """Indique si le thread courant est dans un bloc transaction() ou unit_of_work()."""
+        return getattr(self._local, "depth", 0) > 0
+
+    def after_transaction(self, callback, on_commit=False):
+        """
+        Exécute callback() à la fin de la transaction la plus externe du thread courant
+        (validée ou annulée), une fois la connexion d'écriture libérée, ou immédiatement hors transaction.
+        on_commit : seulement si cette transaction est validée et que le SAVEPOINT où le rappel
+        a été enregistré n'a pas été annulé.
+        """
+        if not self.in_transaction():
+            callback()
+            return
+        self._local.after.append((callback, on_commit))
+
+    @contextmanager
+    def read_cursor(self):
+        """Fournit un curseur sur une connexion en lecture seule du pool."""
+        self.get_connection()
+        with self.pool.reader_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def query_cursor(self):
+        """
+        Fournit un curseur pour une lecture : hors transaction, sur une connexion en lecture seule
+        du pool (la lecture n'attend ni les écritures ni les autres lectures) ; dans un bloc
+        transaction() ou unit_of_work() du thread, sur la connexion d'écriture, pour voir
+        les écritures non encore validées du bloc.
+        """
+        if not self.in_transaction():
+            with self.read_cursor() as cursor:
+                yield cursor
+            return
+        with self.pool.writer_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def create_aggregate(self, name, num_args, aggregate_class):
+        """Déclare une fonction d'agrégation SQL sur toutes les connexions du pool (voir sqlite3.create_aggregate)."""
+        self.aggregates[name] = (num_args, aggregate_class)
+        if self.pool is not None:
+            self.pool.create_aggregate(name, num_args, aggregate_class)
+
+    def set_profile(self, profile):
+        """Change le profil de PRAGMA (ex: "bulk-load" le temps d'un import)."""
+        self.profile = profile
+        if self.pool:
+            self.pool.set_profile(profile)
+
+    def interrupt(self, thread_id=None):
+        """Annule la requête en cours d'un thread (ou de tous les threads si None)."""
+        return self.pool.interrupt(thread_id) if self.pool else 0
+
+    def get_audit_writer(self):
+        """Retourne le journal d'audit asynchrone partagé (créé au premier appel)."""
+        if self.audit_writer is None:
+            self.get_connection()
+            self.audit_writer = AuditLogWriter(self, **self.audit_options)
+        return self.audit_writer
+
+    def get_index_advisor(self):
+        """Retourne le conseiller d'index partagé, qui observe la charge de tous les modules."""
+        if self.index_advisor is None:
+            self.index_advisor = IndexAdvisor(self)
+        return self.index_advisor
+
+    def get_catalog_cache(self):
+        """Retourne le cache du catalogue (tables, colonnes, index) partagé par tous les modules."""
+        if self.catalog_cache is None:
+            self.catalog_cache = CatalogCache(self)
+        return self.catalog_cache
+
+    def get_result_cache(self):
+        """Retourne le cache des résultats de lecture partagé par CRUDOperator et QueryExecutor."""
+        if self.result_cache is None:
+            self.result_cache = ResultCache(self)
+        return self.result_cache
+
+    def data_version(self, wait=True):
+        """
+        PRAGMA data_version de la connexion d'écriture : change quand une autre connexion valide une écriture.
+        Avec wait=False, retourne None au lieu d'attendre si un autre thread utilise la connexion d'écriture.
+        """
+        self.get_connection()
+        if wait:
+            with self.pool.writer_connection() as connection:
+                return connection.execute("PRAGMA data_version").fetchone()[0]
+        if not self.pool.writer_lock.acquire(blocking=False):
+            return None
+        try:
+            return self.pool.writer.execute("PRAGMA data_version").fetchone()[0]
         finally:
-            cursor.close()
+            self.pool.writer_lock.release()
+
+    def ensure_schema(self, component, version, create):
+        """
+        Exécute create(curseur) une seule fois par base et par version du schéma système d'un
+        composant : la version appliquée est enregistrée dans sys_schema_versions, dans la même
+        transaction que le DDL. Les appels suivants ne coûtent qu'une recherche en mémoire
+        (une lecture de sys_schema_versions au premier appel du processus).
+        Retourne True si create a été exécuté.
+        """
+        if self.schema_versions is None:
+            try:
+                with self.read_cursor() as cursor:
+                    cursor.execute("SELECT component, version FROM sys_schema_versions")
+                    self.schema_versions = dict(cursor.fetchall())
+            except sqlite3.OperationalError:
+                # Base créée avant le suivi des versions, ou neuve
+                self.schema_versions = {}
+        if self.schema_versions.get(component, 0) >= version:
+            return False
+        with self.transaction() as cursor:
+            cursor.execute(CREATE_SCHEMA_VERSIONS_TABLE)
+            # Relu sous le verrou d'écriture : un autre processus a pu appliquer la version entre-temps
+            cursor.execute("SELECT version FROM sys_schema_versions WHERE component = ?", (component,))
+            row = cursor.fetchone()
+            applied = row[0] if row else 0
+            if applied < version:
+                create(cursor)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO sys_schema_versions (component, version) VALUES (?, ?)
+                """, (component, version))
+        self.schema_versions[component] = max(applied, version)
+        if applied < version:
+            logging.info(f"Schéma système de {component} initialisé (version {version}).")
+        return applied < version
+
+    def attach(self, alias, db_path):
+        """
+        Attache une autre base sous `alias` à toutes les connexions du pool (lecteurs en lecture seule) :
+        ses tables sont accessibles en « alias.table », y compris dans des jointures avec la base principale.
+        Permet de répartir données chaudes et froides sur des fichiers (et disques) distincts.
+        Interdit dans une transaction ouverte.
+        """
+        if not ATTACH_ALIAS.match(alias) or alias.lower() in ("main", "temp"):
+            raise ValueError(f"Alias de base invalide : {alias}")
+        if alias in self.attachments:
+            raise ValueError(f"Alias déjà utilisé : {alias}")
+        if is_memory_path(db_path) and not is_memory_path(self.db_path):
+            # Chaque lecteur ouvrirait sa propre base en mémoire, vide
+            raise ValueError("Une base en mémoire ne peut être attachée qu'à une base en mémoire")
+        if self.in_transaction():
+            raise sqlite3.OperationalError("Impossible d'attacher une base dans une transaction")
+        db_path = str(db_path) if is_memory_path(db_path) else os.path.abspath(db_path)
+        if self.pool is not None:
+            self.pool.attach(alias, db_path)
+        self.attachments[alias] = db_path
+        if self.catalog_cache is not None:
+            self.catalog_cache.invalidate()
+        logging.info(f"Base {db_path} attachée sous l'alias {alias}.")
+
+    def detach(self, alias):
+        """Détache la base attachée sous `alias`."""
+        if alias not in self.attachments:
+            raise ValueError(f"Aucune base attachée sous l'alias : {alias}")
+        if self.in_transaction():
+            raise sqlite3.OperationalError("Impossible de détacher une base dans une transaction")
+        if self.pool is not None:
+            self.pool.detach(alias)
+        del self.attachments[alias]
+        if self.catalog_cache is not None:
+            self.catalog_cache.invalidate()
+        logging.info(f"Base attachée sous l'alias {alias} détachée.")
+
+    def attached(self):
+        """Bases attachées : {alias: chemin}."""
+        return dict(self.attachments)
+
+    @classmethod
+    def instances(cls):
+        """Connecteurs du registre : {chemin: connecteur}."""
+        with cls._registry_lock:
+            return dict(cls._registry)
+
+    @classmethod
+    def close_all(cls):
+        """Ferme les connexions de tous les connecteurs du registre."""
+        for connector in cls.instances().values():
+            connector.close_connection()
+
+    def configure_audit_log(self, **options):
+        """Configure le journal d'audit (max_queue, batch_size, max_latency, policy, sample_every)."""
+        if self.audit_writer is not None:
+            self.audit_writer.close()
+            self.audit_writer = None
+        self.audit_options = options
+
+    def pool_stats(self):
+        """Retourne les métriques d'utilisation du pool de connexions."""
+        return self.pool.stats() if self.pool else {}
 
     def close_connection(self):
         """Ferme la connexion à la base de données."""
-        if self.connection:
-            self.connection.close()
-            logging.info("Connexion fermée.")
\ No newline at end of file
+        if self.audit_writer is not None:
+            self.audit_writer.close()
+            self.audit_writer = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            self.connection = None
+            self.schema_versions = None
+            logging.info("Connexion fermée.")
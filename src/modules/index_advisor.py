@@ -0,0 +1,359 @@
+import logging
+import re
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_SQL_KEYWORDS = {
+    'WHERE', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'CROSS', 'OUTER', 'NATURAL', 'ON', 'USING',
+    'GROUP', 'ORDER', 'LIMIT', 'HAVING', 'UNION', 'EXCEPT', 'INTERSECT', 'WINDOW', 'AS', 'SET',
+}
+_EQUALITY_OPERATORS = {'=', '==', 'IN', 'IS'}
+_PREDICATE = re.compile(
+    r"(?:\b(\w+)\.)?\b(\w+)\s*(==|=|<=|>=|<>|!=|<|>|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b)", re.IGNORECASE)
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_CLAUSE_END = r"(?=\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|\bHAVING\b|\bWINDOW\b|\bUNION\b|\bRETURNING\b|$)"
+_WHERE = re.compile(rf"\bWHERE\b(.*?){_CLAUSE_END}", re.IGNORECASE | re.DOTALL)
+_JOIN_ON = re.compile(r"\bON\b(.*?)(?=\b(?:LEFT|RIGHT|INNER|CROSS|FULL|NATURAL)?\s*JOIN\b|\bWHERE\b|\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|$)",
+                      re.IGNORECASE | re.DOTALL)
+_ORDER_BY = re.compile(r"\bORDER\s+BY\b(.*?)(?=\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_SELECT_LIST = re.compile(r"^\s*SELECT\s+(?:DISTINCT\s+)?(.*?)\bFROM\b", re.IGNORECASE | re.DOTALL)
+_JOIN_RIGHT_SIDE = re.compile(r"(?:==|=)\s*(\w+)\.(\w+)")
+_USED_INDEX = re.compile(r"\bUSING (?:COVERING )?INDEX (\w+)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+class AccessPattern(tuple):
+    """(table, colonnes en égalité, colonne en intervalle, colonnes de tri) observés ensemble"""
+    __slots__ = ()
+
+    def __new__(cls, table: str, equality: Sequence[str], range_column: Optional[str], order_by: Sequence[str]):
+        return super().__new__(cls, (table, tuple(sorted(set(equality))), range_column, tuple(order_by)))
+
+    table = property(lambda self: self[0])
+    equality = property(lambda self: self[1])
+    range_column = property(lambda self: self[2])
+    order_by = property(lambda self: self[3])
+
+
+@lru_cache(maxsize=1024)
+def parse_access_patterns(sql: str) -> Tuple[Tuple[Optional[str], str, str], ...]:
+    """
+    Extrait d'une requête (ou d'une clause WHERE/ORDER BY seule) les colonnes filtrées et triées :
+    tuple de (qualificatif de table ou None, colonne, 'eq' | 'range' | 'order' | 'join').
+    """
+    text = _STRING_LITERAL.sub("?", sql)
+    refs = []
+    clauses = [(match.group(1), False) for match in _WHERE.finditer(text)]
+    clauses += [(match.group(1), True) for match in _JOIN_ON.finditer(text)]
+    if not clauses and not re.search(r"\b(?:SELECT|UPDATE|DELETE|ORDER\s+BY)\b", text, re.IGNORECASE):
+        clauses = [(text, False)]
+    for clause, is_join in clauses:
+        for qualifier, column, operator in _PREDICATE.findall(clause):
+            if column.upper() in _SQL_KEYWORDS or column.upper() in ('AND', 'OR', 'NOT'):
+                continue
+            if operator.upper() in ('<>', '!=', 'LIKE'):
+                continue
+            kind = 'eq' if operator.upper() in _EQUALITY_OPERATORS else 'range'
+            refs.append((qualifier or None, column, 'join' if is_join and kind == 'eq' else kind))
+        # Partie droite d'une égalité qualifiée (a.x = b.y) : b.y est aussi une colonne de recherche
+        refs.extend((qualifier, column, 'join' if is_join else 'eq')
+                    for qualifier, column in _JOIN_RIGHT_SIDE.findall(clause))
+    order = _ORDER_BY.search(text)
+    if order:
+        for term in order.group(1).split(','):
+            match = re.match(r"\s*(?:(\w+)\.)?(\w+)", term)
+            if match:
+                refs.append((match.group(1), match.group(2), 'order'))
+    return tuple(refs)
+
+
+class IndexAdvisor:
+    """
+    Conseiller d'index : observe les conditions des lectures/écritures (CRUDOperator) et les
+    requêtes et plans de QueryExecutor, puis recommande des index composites (égalités, puis
+    intervalle ou tri), éventuellement couvrants. Le gain est estimé à partir de sqlite_stat1
+    (après ANALYZE) ; les index créés par l'utilisateur jamais utilisés sont signalés.
+    """
+
+    def __init__(self, connector, max_covering_columns: int = 4, sample_rows: int = 10000):
+        self.connector = connector
+        self.max_covering_columns = max_covering_columns
+        self.sample_rows = sample_rows
+        self.patterns = Counter()
+        self.selected_columns: Dict[AccessPattern, set] = defaultdict(set)
+        self.writes = Counter()
+        self.used_indexes = Counter()
+        self.catalog = connector.get_catalog_cache()
+        self._lock = threading.Lock()
+
+    # Observation de la charge
+
+    def observe(self, table_name: str, conditions: str = '', operation: str = 'SELECT',
+                select_columns: Optional[Sequence[str]] = None) -> None:
+        """Enregistre une opération CRUD et les colonnes de sa clause WHERE/ORDER BY"""
+        if operation != 'SELECT':
+            with self._lock:
+                self.writes[table_name] += 1
+        if not conditions:
+            return
+        refs = [(column, kind) for qualifier, column, kind in parse_access_patterns(conditions)
+                if qualifier in (None, table_name)]
+        self._record(table_name, refs, select_columns)
+
+    def observe_query(self, sql: str, plan: Optional[List[Tuple]] = None, kind: str = 'SELECT') -> None:
+        """Enregistre une requête SQL libre : colonnes par table (alias résolus) et index utilisés par son plan"""
+        for row in plan or []:
+            for index_name in _USED_INDEX.findall(row[-1]):
+                with self._lock:
+                    self.used_indexes[index_name] += 1
+        text = _STRING_LITERAL.sub("?", sql)
+        aliases = {}
+        for table, alias in _TABLE_REF.findall(text):
+            if table.upper() in _SQL_KEYWORDS or table.lower().startswith('sqlite_'):
+                continue
+            aliases[table] = table
+            if alias and alias.upper() not in _SQL_KEYWORDS:
+                aliases[alias] = table
+        tables = sorted(set(aliases.values()))
+        if not tables:
+            return
+        if kind == 'DML':
+            with self._lock:
+                for table in tables:
+                    self.writes[table] += 1
+
+        per_table = defaultdict(list)
+        for qualifier, column, ref_kind in parse_access_patterns(sql):
+            if qualifier:
+                table = aliases.get(qualifier)
+            else:
+                owners = [t for t in tables if column in self._table_columns(t)]
+                table = owners[0] if len(owners) == 1 else None
+            if table:
+                per_table[table].append((column, ref_kind))
+
+        selected = defaultdict(set)
+        select_list = _SELECT_LIST.match(text)
+        star = select_list is None or '*' in select_list.group(1)
+        if not star:
+            for item in select_list.group(1).split(','):
+                match = re.match(r"\s*(?:(\w+)\.)?(\w+)\s*(?:AS\s+\w+)?\s*$", item, re.IGNORECASE)
+                if not match:
+                    # Expression calculée : pas d'index couvrant proposé
+                    star = True
+                    break
+                if match.group(1):
+                    owner = aliases.get(match.group(1))
+                else:
+                    owners = [t for t in tables if match.group(2) in self._table_columns(t)]
+                    owner = owners[0] if len(owners) == 1 else None
+                if owner:
+                    selected[owner].add(match.group(2))
+        for table, refs in per_table.items():
+            self._record(table, refs, None if star else selected[table])
+
+    def _record(self, table_name: str, refs: List[Tuple[str, str]], select_columns=None) -> None:
+        """Comptabilise les motifs d'accès ; les noms sont validés contre le schéma dans recommend()"""
+        equality = [column for column, kind in refs if kind == 'eq']
+        ranges = [column for column, kind in refs if kind == 'range' and column not in equality]
+        order_by = [column for column, kind in refs if kind == 'order']
+        patterns = []
+        if equality or ranges or order_by:
+            patterns.append(AccessPattern(table_name, equality, ranges[0] if ranges else None, order_by))
+        # Les colonnes de jointure forment un motif à part : la table est lue en boucle interne par ces clés
+        join_columns = [column for column, kind in refs if kind == 'join']
+        if join_columns:
+            patterns.append(AccessPattern(table_name, join_columns, None, ()))
+        with self._lock:
+            for pattern in patterns:
+                self.patterns[pattern] += 1
+                if select_columns is not None:
+                    self.selected_columns[pattern].update(select_columns)
+                else:
+                    self.selected_columns[pattern].add('*')
+
+    def _table_columns(self, table_name: str) -> List[str]:
+        return self.catalog.columns(table_name)
+
+    def _rowid_column(self, table_name: str) -> Optional[str]:
+        """Colonne INTEGER PRIMARY KEY (alias du rowid, déjà indexée par construction)"""
+        table = self.catalog.table(table_name)
+        return table.rowid_column if table else None
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """Oublie les colonnes en cache (après un DDL)"""
+        self.catalog.invalidate(table_name)
+
+    # Statistiques
+
+    def analyze(self, table_name: Optional[str] = None) -> None:
+        """Exécute ANALYZE pour (re)calculer sqlite_stat1"""
+        with self.connector.transaction() as cursor:
+            cursor.execute(f"ANALYZE {table_name}" if table_name else "ANALYZE")
+        logging.info(f"ANALYZE exécuté sur {table_name or 'la base'}.")
+
+    def existing_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        """Index existants d'une table : nom, colonnes, unicité, origine ('c' = créé par CREATE INDEX)"""
+        indexes = [{"name": index.name, "columns": list(index.columns), "unique": index.unique,
+                    "origin": index.origin, "partial": index.partial}
+                   for index in self.catalog.indexes(table_name)]
+        rowid = self._rowid_column(table_name)
+        if rowid:
+            indexes.append({"name": "rowid", "columns": [rowid], "unique": True, "origin": 'pk', "partial": False})
+        return indexes
+
+    def _table_rows(self, cursor, table_name: str) -> int:
+        """Nombre de lignes d'après sqlite_stat1 (COUNT(*) si ANALYZE n'a pas été exécuté)"""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+        if cursor.fetchone():
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ?", (table_name,))
+            stats = [int(str(row[0]).split()[0]) for row in cursor.fetchall() if row[0]]
+            if stats:
+                return max(stats)
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return cursor.fetchone()[0]
+
+    def _rows_per_key(self, cursor, table_name: str, columns: Sequence[str], total_rows: int) -> float:
+        """
+        Lignes attendues par valeur de clé : lu dans sqlite_stat1 si un index existant a ces
+        colonnes en préfixe, sinon estimé sur un échantillon de `sample_rows` lignes.
+        """
+        if not columns or not total_rows:
+            return float(total_rows)
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+        if cursor.fetchone():
+            for index in self.existing_indexes(table_name):
+                if sorted(index["columns"][:len(columns)]) == sorted(columns):
+                    cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND idx = ?", (table_name, index["name"]))
+                    row = cursor.fetchone()
+                    if row:
+                        values = str(row[0]).split()
+                        if len(values) > len(columns):
+                            return float(values[len(columns)])
+        column_list = ', '.join(columns)
+        cursor.execute(f"""
+            SELECT COUNT(*) FROM (SELECT DISTINCT {column_list} FROM (SELECT {column_list} FROM {table_name} LIMIT ?))
+        """, (self.sample_rows,))
+        distinct = cursor.fetchone()[0]
+        sampled = min(total_rows, self.sample_rows)
+        return max(1.0, sampled / distinct) if distinct else float(total_rows)
+
+    # Recommandations
+
+    def recommend(self, min_count: int = 1) -> List[Dict[str, Any]]:
+        """
+        Recommandations d'index triées par gain estimé (lignes évitées × nombre d'exécutions).
+        Les motifs déjà servis par le préfixe d'un index existant sont ignorés.
+        """
+        with self._lock:
+            patterns = [(pattern, count, set(self.selected_columns[pattern]))
+                        for pattern, count in self.patterns.items() if count >= min_count]
+
+        candidates = {}
+        for pattern, count, selected in patterns:
+            columns = self._table_columns(pattern.table)
+            if not columns:
+                continue
+            equality = [c for c in pattern.equality if c in columns]
+            range_column = pattern.range_column if pattern.range_column in columns else None
+            order_by = [c for c in pattern.order_by if c in columns]
+            pattern = AccessPattern(pattern.table, equality, range_column, order_by)
+            key_columns = list(pattern.equality)
+            if pattern.range_column:
+                key_columns.append(pattern.range_column)
+            elif pattern.order_by:
+                key_columns.extend(c for c in pattern.order_by if c not in key_columns)
+            if not key_columns:
+                continue
+            covering = []
+            if selected and '*' not in selected:
+                rowid = self._rowid_column(pattern.table)
+                covering = [c for c in sorted(selected) if c in columns and c != rowid and c not in key_columns]
+                if len(key_columns) + len(covering) > self.max_covering_columns:
+                    covering = []
+            key = (pattern.table, tuple(key_columns + covering))
+            entry = candidates.setdefault(key, {"pattern": pattern, "count": 0, "covering": bool(covering)})
+            entry["count"] += count
+
+        recommendations = []
+        with self.connector.read_cursor() as cursor:
+            for (table_name, columns), entry in candidates.items():
+                existing = self.existing_indexes(table_name)
+                pattern = entry["pattern"]
+                lookup_columns = list(pattern.equality)
+                if any(self._serves(index["columns"], columns, len(lookup_columns)) for index in existing):
+                    continue
+                total_rows = self._table_rows(cursor, table_name)
+                rows_per_key = self._rows_per_key(cursor, table_name, lookup_columns, total_rows)
+                if pattern.range_column:
+                    # Sans histogramme, on suppose qu'un tiers de la plage est lu (hypothèse de SQLite)
+                    rows_per_key /= 3
+                elif not lookup_columns:
+                    # Tri seul : l'index évite le tri, pas la lecture
+                    rows_per_key = total_rows
+                rows_saved = max(0.0, total_rows - rows_per_key)
+                recommendations.append({
+                    "table": table_name,
+                    "columns": list(columns),
+                    "index_name": f"idx_{table_name}_{'_'.join(columns)}",
+                    "covering": entry["covering"],
+                    "executions": entry["count"],
+                    "table_rows": total_rows,
+                    "estimated_rows_per_lookup": round(rows_per_key, 1),
+                    "estimated_rows_saved": round(rows_saved * entry["count"]),
+                    "avoids_sort": bool(pattern.order_by) and not pattern.range_column,
+                    "sql": f"CREATE INDEX idx_{table_name}_{'_'.join(columns)} ON {table_name} ({', '.join(columns)})",
+                })
+        recommendations.sort(key=lambda r: (r["estimated_rows_saved"], r["executions"]), reverse=True)
+        return recommendations
+
+    @staticmethod
+    def _serves(index_columns: List[str], wanted: Tuple[str, ...], equality_count: int) -> bool:
+        """Un index existant sert le motif si ses premières colonnes sont celles recherchées"""
+        if len(index_columns) < len(wanted):
+            return False
+        head = index_columns[:len(wanted)]
+        return sorted(head[:equality_count]) == sorted(wanted[:equality_count]) \
+            and head[equality_count:] == list(wanted[equality_count:])
+
+    def unused_indexes(self) -> List[Dict[str, Any]]:
+        """
+        Index créés par l'utilisateur sur les tables observées, jamais utilisés par un plan ni
+        servant un motif observé, mais maintenus à chaque écriture.
+        """
+        with self._lock:
+            tables = {pattern.table for pattern in self.patterns} | set(self.writes)
+            patterns = list(self.patterns)
+            used = set(self.used_indexes)
+            writes = dict(self.writes)
+        unused = []
+        for table_name in sorted(tables):
+            for index in self.existing_indexes(table_name):
+                if index["origin"] != 'c' or index["name"] in used:
+                    continue
+                leading = index["columns"][0] if index["columns"] else None
+                if any(p.table == table_name and leading in p.equality + (p.range_column,) + p.order_by
+                       for p in patterns):
+                    continue
+                unused.append({"table": table_name, "index_name": index["name"], "columns": index["columns"],
+                               "writes": writes.get(table_name, 0),
+                               "sql": f"DROP INDEX {index['name']}"})
+        unused.sort(key=lambda r: r["writes"], reverse=True)
+        return unused
+
+    def apply(self, recommendation: Dict[str, Any], schema_manager) -> str:
+        """Crée l'index recommandé via SchemaManager.create_index et retourne son nom"""
+        name = schema_manager.create_index(recommendation["table"], recommendation["columns"],
+                                           recommendation["index_name"])
+        self.invalidate(recommendation["table"])
+        return name
+
+    def reset(self) -> None:
+        """Oublie la charge observée"""
+        with self._lock:
+            self.patterns.clear()
+            self.selected_columns.clear()
+            self.writes.clear()
+            self.used_indexes.clear()
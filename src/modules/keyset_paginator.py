@@ -0,0 +1,197 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class KeysetPaginator:
+    """
+    Pagination par clé (seek) : chaque page est lue avec `WHERE key > ? ORDER BY key LIMIT ?`
+    au lieu de LIMIT/OFFSET, donc la page N coûte autant que la page 1.
+    Les sauts de page s'appuient sur des clés d'ancrage échantillonnées toutes les `anchor_stride` pages ;
+    ancres et total sont oubliés dès qu'une écriture sur la table invalide le cache de résultats.
+    Utilisable depuis plusieurs threads : les déplacements sont sérialisés.
+    La table est aliasée `t` dans la requête : `key` et `select` peuvent y faire référence.
+    """
+
+    def __init__(self, connector, table_name: str, key: str = 'rowid', page_size: int = 10,
+                 select: str = 't.*', anchor_stride: int = 10, count_ttl: float = 30.0):
+        self.connector = connector
+        self.table_name = table_name
+        self.key = key if '.' in key else f"t.{key}"
+        self.page_size = max(1, int(page_size))
+        self.select = select
+        self.anchor_stride = max(1, int(anchor_stride))
+        self.count_ttl = count_ttl
+        self.page = 0
+        self.first_key = None
+        self.last_key = None
+        self._anchors = None
+        self._total = None
+        self._total_at = 0.0
+        # Version des tables lues (voir ResultCache.version) lors du calcul des ancres et du total
+        self._version = None
+        # sqlite_stat1 n'est plus fiable après une écriture observée (jusqu'au prochain ANALYZE)
+        self._stats_stale = False
+        self._lock = threading.RLock()
+
+    def _fetch(self, condition: str = '', params: tuple = (), descending: bool = False,
+               offset: int = 0) -> List[Dict[str, Any]]:
+        order = 'DESC' if descending else 'ASC'
+        query = f"""
+            SELECT {self.key} AS __page_key, {self.select}
+            FROM {self.table_name} AS t
+            {f'WHERE {condition}' if condition else ''}
+            ORDER BY {self.key} {order}
+            LIMIT ? OFFSET ?
+        """
+        params = params + (self.page_size, offset)
+        # Pages déjà lues servies par le cache de résultats (invalidé par les écritures sur la table)
+        result_cache = self.connector.get_result_cache()
+        rows = result_cache.get(query, params)
+        if rows is None:
+            pending = result_cache.begin(query, params)
+            with self.connector.read_cursor() as cursor:
+                cursor.execute(query, params)
+                columns = [description[0] for description in cursor.description]
+                data = cursor.fetchall()
+            result_cache.put(pending, columns, data)
+            rows = [dict(zip(columns, row)) for row in data]
+        if descending:
+            rows.reverse()
+        return rows
+
+    def _table_version(self) -> tuple:
+        names = [self.table_name]
+        layout = self.connector.get_catalog_cache().partition_layout(self.table_name)
+        if layout is not None:
+            names += [partition.name for partition in layout.partitions]
+        result_cache = self.connector.get_result_cache()
+        return tuple(result_cache.version(name) for name in names)
+
+    def _check_writes(self) -> None:
+        """Oublie ancres et total si la table a été modifiée depuis leur calcul"""
+        version = self._table_version()
+        if version != self._version:
+            self._stats_stale = self._version is not None
+            self.invalidate()
+            self._version = version
+
+    def _set_page(self, page: int, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if rows:
+            self.page = page
+            self.first_key = rows[0]['__page_key']
+            self.last_key = rows[-1]['__page_key']
+        for row in rows:
+            del row['__page_key']
+        return rows
+
+    def first_page(self) -> List[Dict[str, Any]]:
+        """Retourne la première page"""
+        with self._lock:
+            self.page, self.first_key, self.last_key = 0, None, None
+            return self._set_page(1, self._fetch())
+
+    def next_page(self) -> List[Dict[str, Any]]:
+        """Retourne la page suivante (liste vide en fin de table)"""
+        with self._lock:
+            if self.last_key is None:
+                return self.first_page()
+            return self._set_page(self.page + 1, self._fetch(f"{self.key} > ?", (self.last_key,)))
+
+    def previous_page(self) -> List[Dict[str, Any]]:
+        """Retourne la page précédente"""
+        with self._lock:
+            if self.first_key is None or self.page <= 1:
+                return self.first_page()
+            return self._set_page(self.page - 1, self._fetch(f"{self.key} < ?", (self.first_key,), descending=True))
+
+    def current_page(self) -> List[Dict[str, Any]]:
+        """Relit la page courante"""
+        with self._lock:
+            if self.first_key is None:
+                return self.first_page()
+            return self._set_page(self.page, self._fetch(f"{self.key} >= ?", (self.first_key,)))
+
+    def goto_page(self, page: int) -> List[Dict[str, Any]]:
+        """Va à la page `page` (1-indexée) par le chemin le moins coûteux"""
+        page = max(1, int(page))
+        with self._lock:
+            if page == 1:
+                return self.first_page()
+            if page == self.page:
+                return self.current_page()
+            if page == self.page + 1:
+                return self.next_page()
+            if page == self.page - 1:
+                return self.previous_page()
+
+            anchors = self._get_anchors()
+            slot = (page - 1) // self.anchor_stride
+            if slot >= len(anchors):
+                return []
+            # Décalage borné à anchor_stride pages depuis l'ancre la plus proche
+            offset = ((page - 1) % self.anchor_stride) * self.page_size
+            rows = self._fetch(f"{self.key} >= ?", (anchors[slot],), offset=offset)
+            return self._set_page(page, rows)
+
+    def _get_anchors(self) -> List[Any]:
+        """Échantillonne la clé de début de page toutes les anchor_stride pages (parcours d'index unique)"""
+        self._check_writes()
+        if self._anchors is None:
+            stride = self.page_size * self.anchor_stride
+            anchors = []
+            with self.connector.read_cursor() as cursor:
+                cursor.execute(f"SELECT {self.key} FROM {self.table_name} AS t ORDER BY {self.key}")
+                position = 0
+                while True:
+                    keys = cursor.fetchmany(4096)
+                    if not keys:
+                        break
+                    for (key,) in keys:
+                        if position % stride == 0:
+                            anchors.append(key)
+                        position += 1
+            self._anchors = anchors
+            self._total, self._total_at = position, time.monotonic()
+            logging.info(f"{len(anchors)} ancre(s) de pagination calculée(s) pour {self.table_name}.")
+        return self._anchors
+
+    def total_rows(self, refresh: bool = False) -> int:
+        """
+        Nombre de lignes approximatif, mis en cache `count_ttl` secondes ou jusqu'à la prochaine
+        écriture sur la table (sqlite_stat1 si disponible et qu'aucune écriture n'a été observée)
+        """
+        with self._lock:
+            self._check_writes()
+            if not refresh and self._total is not None and time.monotonic() - self._total_at < self.count_ttl:
+                return self._total
+            return self._count()
+
+    def _count(self) -> int:
+        total = None
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() and not self._stats_stale:
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (self.table_name,))
+                stat = cursor.fetchone()
+                if stat and stat[0]:
+                    total = int(str(stat[0]).split()[0])
+            if total is None:
+                cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
+                total = cursor.fetchone()[0]
+        if total != self._total:
+            self._anchors = None
+        self._total, self._total_at = total, time.monotonic()
+        return total
+
+    def total_pages(self, refresh: bool = False) -> int:
+        """Nombre de pages approximatif"""
+        return max(1, math.ceil(self.total_rows(refresh) / self.page_size))
+
+    def invalidate(self) -> None:
+        """Oublie le total et les ancres après des écritures sur la table"""
+        with self._lock:
+            self._anchors = None
+            self._total = None
@@ -0,0 +1,402 @@
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Agrégats fusionnables : chaque partition de rowid renvoie un résultat partiel
+AGGREGATES = ('COUNT', 'SUM', 'TOTAL', 'MIN', 'MAX', 'AVG', 'APPROX_COUNT_DISTINCT')
+# Précision des esquisses HyperLogLog : 2^12 registres, erreur type ~1,6 %
+HLL_PRECISION = 12
+
+_QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+_AGGREGATE_QUERY = re.compile(
+    r"^\s*SELECT\s+(?P<select>.+?)\s+FROM\s+(?P<table>\w+)"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?(?:\s+GROUP\s+BY\s+(?P<group>.+?))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+# Clauses que la fusion des résultats partiels ne sait pas reproduire
+_UNSUPPORTED = re.compile(r"\b(SELECT|JOIN|UNION|INTERSECT|EXCEPT|ORDER|LIMIT|HAVING|WINDOW|OVER|DISTINCT)\b",
+                          re.IGNORECASE)
+_AGGREGATE_CALL = re.compile(rf"^({'|'.join(AGGREGATES)})\s*\((\s*DISTINCT\s+)?(.*)\)$", re.IGNORECASE | re.DOTALL)
+_ALIAS = re.compile(r"^(.*?)\s+AS\s+(\w+|\"[^\"]+\")$", re.IGNORECASE | re.DOTALL)
+
+# Connexions en lecture seule des processus de travail, réutilisées d'une tâche à l'autre
+_worker_connections: Dict[str, sqlite3.Connection] = {}
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Découpe une liste d'expressions SQL sur les virgules hors parenthèses et littéraux"""
+    parts, depth, quote, current = [], 0, None, []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return parts
+
+
+def _balanced(text: str) -> bool:
+    depth = 0
+    for char in _QUOTED.sub("''", text):
+        depth += char == '('
+        depth -= char == ')'
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def _normalize(expression: str) -> str:
+    return re.sub(r"\s+", ' ', expression.strip()).lower()
+
+
+def split_rowid_ranges(low: int, high: int, parts: int) -> List[Tuple[int, int]]:
+    """Découpe [low, high] en au plus `parts` intervalles [début, fin[ contigus de tailles égales"""
+    if high < low:
+        return []
+    parts = max(1, min(parts, high - low + 1))
+    step = (high - low + 1) / parts
+    bounds = [low + round(step * position) for position in range(parts)] + [high + 1]
+    return list(zip(bounds, bounds[1:]))
+
+
+class HyperLogLog:
+    """Esquisse HyperLogLog : nombre approché de valeurs distinctes, fusionnable par maximum registre à registre"""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            return
+        value = _distinct_value(value)
+        digest = hashlib.blake2b(repr((type(value).__name__, value)).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Correction des petites cardinalités (comptage linéaire)
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+
+class ApproxCountDistinct:
+    """Agrégat SQLite APPROX_COUNT_DISTINCT(x), pour les requêtes exécutées sur une seule connexion"""
+
+    def __init__(self):
+        self.sketch = HyperLogLog()
+
+    def step(self, value):
+        self.sketch.add(value)
+
+    def finalize(self):
+        return self.sketch.estimate()
+
+
+def register_functions(connector) -> None:
+    """Déclare APPROX_COUNT_DISTINCT sur toutes les connexions d'un DatabaseConnector"""
+    connector.create_aggregate("APPROX_COUNT_DISTINCT", 1, ApproxCountDistinct)
+
+
+class Aggregate(NamedTuple):
+    """Colonne de résultat : expression de regroupement (function None) ou agrégat à fusionner"""
+    name: str
+    function: Optional[str]
+    argument: str
+    distinct: bool = False
+
+
+class ScanPlan(NamedTuple):
+    """Requête d'agrégation découpée : requête partielle par plage de rowid, requêtes de valeurs distinctes, fusion"""
+    table: str
+    columns: Tuple[Aggregate, ...]
+    group_by: Tuple[str, ...]
+    partial_sql: str
+    distinct_sql: Tuple[str, ...]
+    params: Tuple
+
+
+def plan_aggregate(sql: str, params: Sequence = ()) -> Optional[ScanPlan]:
+    """
+    Découpe une requête « SELECT colonnes de regroupement, agrégats FROM table [WHERE ...] [GROUP BY ...] »
+    en requêtes partielles exécutables sur une plage de rowid. Retourne None si la requête n'a pas
+    cette forme (jointure, sous-requête, ORDER BY, HAVING, paramètres nommés ou dans la liste SELECT...).
+    """
+    if isinstance(params, dict):
+        return None
+    match = _AGGREGATE_QUERY.match(sql)
+    if not match:
+        return None
+    select, where, group = match.group('select'), match.group('where'), match.group('group')
+    masked = _QUOTED.sub("''", ' '.join((select, where or '', group or '')))
+    # COUNT(DISTINCT x) est fusionnable ; SELECT DISTINCT et les autres clauses ne le sont pas
+    if _UNSUPPORTED.search(re.sub(r"\(\s*DISTINCT\b", "(", masked, flags=re.IGNORECASE)):
+        return None
+    if '?' in _QUOTED.sub("''", select + (group or '')) or not _balanced(select):
+        return None
+    group_by = tuple(_split_top_level(group)) if group else ()
+    grouped = {_normalize(expression) for expression in group_by}
+
+    columns, partial, distinct_sql = [], list(group_by), []
+    for item in _split_top_level(select):
+        alias = _ALIAS.match(item)
+        expression, name = (alias.group(1).strip(), alias.group(2).strip('"')) if alias else (item, item)
+        call = _AGGREGATE_CALL.match(expression)
+        if call is None or not _balanced(call.group(3)):
+            if _normalize(expression) not in grouped:
+                return None
+            columns.append(Aggregate(name, None, expression))
+            continue
+        function, distinct, argument = call.group(1).upper(), bool(call.group(2)), call.group(3).strip()
+        if len(_split_top_level(argument)) != 1 or (distinct and function != 'COUNT'):
+            # MIN(a, b) est une fonction scalaire ; SUM(DISTINCT ...) n'est pas fusionnable
+            return None
+        if function == 'APPROX_COUNT_DISTINCT' or distinct:
+            distinct_sql.append(argument)
+        elif function == 'AVG':
+            partial += [f"SUM({argument})", f"COUNT({argument})"]
+        else:
+            partial.append(f"{function}({argument})")
+        columns.append(Aggregate(name, function, argument, distinct))
+
+    condition = f"({where}) AND rowid >= ? AND rowid < ?" if where else "rowid >= ? AND rowid < ?"
+    suffix = f" GROUP BY {', '.join(group_by)}" if group_by else ''
+    table = match.group('table')
+    return ScanPlan(
+        table,
+        tuple(columns),
+        group_by,
+        f"SELECT {', '.join(partial)} FROM {table} WHERE {condition}{suffix}",
+        tuple(
+            f"SELECT DISTINCT {', '.join(group_by + (argument,))} FROM {table} WHERE {condition}"
+            for argument in distinct_sql
+        ),
+        tuple(params),
+    )
+
+
+def _distinct_value(value: Any) -> Any:
+    # SQLite considère 1 et 1.0 comme une même valeur
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def scan_range(db_path: str, plan: ScanPlan, low: int, high: int) -> Tuple[List[tuple], List[Dict[tuple, Any]]]:
+    """
+    Tâche d'un processus de travail, sur sa connexion en lecture seule : agrégats partiels de la plage
+    [low, high[ de rowid et, par groupe, valeurs distinctes (ensemble) ou esquisse HyperLogLog (registres).
+    """
+    connection = _worker_connections.get(db_path)
+    if connection is None:
+        connection = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+        _worker_connections[db_path] = connection
+    params = plan.params + (low, high)
+    partial = connection.execute(plan.partial_sql, params).fetchall()
+    width = len(plan.group_by)
+    distinct = []
+    for column, query in zip(distinct_columns(plan), plan.distinct_sql):
+        values: Dict[tuple, Any] = {}
+        for row in connection.execute(query, params):
+            if column.function == 'APPROX_COUNT_DISTINCT':
+                sketch = values.setdefault(row[:width], HyperLogLog())
+                sketch.add(row[width])
+            else:
+                group = values.setdefault(row[:width], set())
+                if row[width] is not None:
+                    group.add(_distinct_value(row[width]))
+        if column.function == 'APPROX_COUNT_DISTINCT':
+            values = {key: bytes(sketch.registers) for key, sketch in values.items()}
+        distinct.append(values)
+    return partial, distinct
+
+
+def distinct_columns(plan: ScanPlan) -> List[Aggregate]:
+    """Colonnes calculées à partir des valeurs distinctes, dans l'ordre de plan.distinct_sql"""
+    return [column for column in plan.columns if column.function == 'APPROX_COUNT_DISTINCT' or column.distinct]
+
+
+def _sort_key(row: tuple) -> tuple:
+    # Ordre de SQLite : NULL, nombres, texte, BLOB
+    return tuple((0, 0) if value is None else (1, value) if isinstance(value, (int, float))
+                 else (2, value) if isinstance(value, str) else (3, bytes(value)) for value in row)
+
+
+def _merge_value(function: str, current: Any, value: Any) -> Any:
+    if value is None:
+        return current
+    if current is None:
+        return value
+    if function in ('COUNT', 'SUM', 'TOTAL'):
+        return current + value
+    if function == 'MIN':
+        return min(current, value, key=lambda item: _sort_key((item,)))
+    return max(current, value, key=lambda item: _sort_key((item,)))
+
+
+def merge_partials(plan: ScanPlan, results: Sequence[Tuple[List[tuple], List[Dict[tuple, Any]]]]) -> List[tuple]:
+    """
+    Fusionne les résultats partiels de chaque plage de rowid en lignes de résultat finales :
+    sommes des COUNT/SUM/TOTAL, extrêmes des MIN/MAX, AVG recalculé depuis (somme, nombre),
+    union des valeurs de COUNT(DISTINCT) et fusion des esquisses de APPROX_COUNT_DISTINCT.
+    """
+    width = len(plan.group_by)
+    # Fonction de fusion de chaque colonne partielle (AVG en occupe deux : somme et nombre)
+    functions = []
+    for column in plan.columns:
+        if column.function == 'AVG':
+            functions += ['SUM', 'COUNT']
+        elif column.function is not None and column.function != 'APPROX_COUNT_DISTINCT' and not column.distinct:
+            functions.append(column.function)
+    columns_from_distinct = distinct_columns(plan)
+
+    states: Dict[tuple, list] = {}
+    distinct_values: Dict[tuple, list] = {}
+    for partial_rows, distinct_parts in results:
+        for row in partial_rows:
+            key, values = row[:width], row[width:]
+            state = states.get(key)
+            if state is None:
+                states[key] = list(values)
+            else:
+                states[key] = [_merge_value(function, current, value)
+                               for function, current, value in zip(functions, state, values)]
+        for index, part in enumerate(distinct_parts):
+            approximate = columns_from_distinct[index].function == 'APPROX_COUNT_DISTINCT'
+            for key, values in part.items():
+                per_key = distinct_values.setdefault(key, [None] * len(columns_from_distinct))
+                if approximate:
+                    sketch = HyperLogLog(registers=values)
+                    if per_key[index] is None:
+                        per_key[index] = sketch
+                    else:
+                        per_key[index].merge(sketch)
+                elif per_key[index] is None:
+                    per_key[index] = set(values)
+                else:
+                    per_key[index] |= values
+
+    if not plan.group_by and not states:
+        # Agrégat sans GROUP BY : une ligne, même sans aucune plage lue
+        states[()] = [0 if function == 'COUNT' else None for function in functions]
+
+    group_positions = {_normalize(expression): position for position, expression in enumerate(plan.group_by)}
+    rows = []
+    for key in sorted(states, key=_sort_key):
+        state = states[key]
+        distinct = distinct_values.get(key, [None] * len(columns_from_distinct))
+        row, position, distinct_index = [], 0, 0
+        for column in plan.columns:
+            if column.function is None:
+                row.append(key[group_positions[_normalize(column.argument)]])
+            elif column.function == 'APPROX_COUNT_DISTINCT' or column.distinct:
+                values = distinct[distinct_index]
+                distinct_index += 1
+                if values is None:
+                    row.append(0)
+                else:
+                    row.append(values.estimate() if isinstance(values, HyperLogLog) else len(values))
+            elif column.function == 'AVG':
+                total, count = state[position], state[position + 1]
+                row.append(total / count if count else None)
+                position += 2
+            else:
+                row.append(state[position])
+                position += 1
+        rows.append(tuple(row))
+    return rows
+
+
+class ParallelAggregator:
+    """
+    Exécute une requête d'agrégation (COUNT, SUM, TOTAL, MIN, MAX, AVG, COUNT(DISTINCT),
+    APPROX_COUNT_DISTINCT) en découpant la table en plages de rowid traitées en parallèle
+    par des processus de travail, chacun sur sa propre connexion en lecture seule, puis en
+    fusionnant les résultats partiels. Les plages sont lues chacune dans sa propre transaction :
+    une écriture concurrente peut être vue par certaines plages et pas par d'autres.
+    """
+
+    def __init__(self, connector, workers: Optional[int] = None, min_rows: int = 200_000,
+                 ranges_per_worker: int = 4):
+        self.connector = connector
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_rows = min_rows
+        self.ranges_per_worker = max(1, ranges_per_worker)
+        self._executor = None
+        self.parallel_queries = 0
+
+    def _rowid_bounds(self, table: str) -> Optional[Tuple[int, int]]:
+        table_info = self.connector.get_catalog_cache().table(table)
+        if table_info is None or table_info.object_type != 'table':
+            # Vue (ex: table partitionnée) ou table inconnue
+            return None
+        try:
+            with self.connector.read_cursor() as cursor:
+                cursor.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}")
+                return cursor.fetchone()
+        except sqlite3.OperationalError:
+            # Table WITHOUT ROWID
+            return None
+
+    def plan(self, sql: str, params: Sequence = ()) -> Optional[Tuple[ScanPlan, List[Tuple[int, int]]]]:
+        """Plan parallèle de la requête, ou None si elle doit s'exécuter sur une seule connexion"""
+        db_path = self.connector.db_path
+        if db_path == ":memory:" or db_path.startswith("file:") or self.connector.in_transaction():
+            # Les processus ne voient ni une base en mémoire ni une transaction non validée
+            return None
+        plan = plan_aggregate(sql, params)
+        if plan is None:
+            return None
+        bounds = self._rowid_bounds(plan.table)
+        if bounds is None or bounds[0] is None:
+            return None
+        low, high = bounds
+        if high - low + 1 < self.min_rows:
+            return None
+        return plan, split_rowid_ranges(low, high, self.workers * self.ranges_per_worker)
+
+    def execute(self, plan: ScanPlan, ranges: Sequence[Tuple[int, int]]) -> Tuple[List[str], List[tuple]]:
+        """Exécute les requêtes partielles sur chaque plage et retourne (colonnes, lignes fusionnées)"""
+        if self._executor is None:
+            # « spawn » : créé depuis un thread quelconque d'un processus multithread (Qt, journal d'audit),
+            # un fork hériterait de verrous tenus ailleurs ; les processus n'ont besoin que de db_path
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        db_path = os.path.abspath(self.connector.db_path)
+        futures = [self._executor.submit(scan_range, db_path, plan, low, high) for low, high in ranges]
+        rows = merge_partials(plan, [future.result() for future in futures])
+        self.parallel_queries += 1
+        logging.info(f"Agrégation parallèle sur {plan.table} : {len(ranges)} plage(s), {self.workers} processus.")
+        return [column.name for column in plan.columns], rows
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
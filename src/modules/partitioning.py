@@ -0,0 +1,204 @@
+import calendar
+import re
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Version du schéma de sys_partitions (voir DatabaseConnector.ensure_schema)
+PARTITIONS_SCHEMA_VERSION = 1
+# Bornes sans affinité de type : un nombre reste un nombre, une date ISO reste du texte
+CREATE_PARTITIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS sys_partitions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        partition_name TEXT NOT NULL UNIQUE,
+        partition_key TEXT NOT NULL,
+        lower_bound,
+        upper_bound,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_QUOTED = re.compile(r"'(?:[^']|'')*'")
+_VALUE = r"(\?|:\w+|'(?:[^']|'')*'|-?\d+(?:\.\d+)?)"
+# Fin de la clause WHERE dans les conditions passées à CRUDOperator.read
+_CLAUSE_END = re.compile(r"\b(ORDER\s+BY|GROUP\s+BY|LIMIT|HAVING|WINDOW)\b", re.IGNORECASE)
+# Prédicats qui empêchent d'isoler les bornes de la clé : on lit alors toutes les partitions
+_UNPRUNABLE = re.compile(r"\b(OR|NOT|SELECT|CASE)\b", re.IGNORECASE)
+
+
+class Partition(NamedTuple):
+    """Table enfant couvrant l'intervalle [lower, upper[ de la clé de partitionnement"""
+    name: str
+    lower: Any
+    upper: Any
+
+
+def sql_literal(value: Any) -> str:
+    """Littéral SQL d'une borne (utilisé dans les contraintes CHECK, où les paramètres sont interdits)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Borne de partition non supportée : {value!r}")
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return repr(value)
+
+
+def partition_name(table_name: str, lower: Any) -> str:
+    """Nom de la table enfant dérivé de sa borne inférieure : events_p2024_01_01, measures_p1000"""
+    return f"{table_name}_p" + re.sub(r"\W", "_", str(lower))
+
+
+def _add_interval(value: date, interval: str) -> date:
+    if interval == 'day':
+        return date.fromordinal(value.toordinal() + 1)
+    if interval == 'month':
+        year, month = divmod(value.month, 12)
+        year, month = value.year + year, month + 1
+        return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+    if interval == 'year':
+        return value.replace(year=value.year + 1, day=28 if (value.month, value.day) == (2, 29) else value.day)
+    raise ValueError(f"Intervalle de partition inconnu : {interval}")
+
+
+def range_bounds(scheme) -> List[Tuple[Any, Any]]:
+    """
+    Intervalles [borne basse, borne haute[ décrits par un schéma de partitionnement :
+    - liste croissante de bornes [b0, b1, ..., bn] : n partitions ;
+    - dict {"interval": "day" | "month" | "year", "start": "AAAA-MM-JJ", "count": n} : dates ISO ;
+    - dict {"interval": pas numérique, "start": nombre, "count": n}.
+    """
+    if isinstance(scheme, dict):
+        interval, start, count = scheme.get("interval"), scheme.get("start"), int(scheme.get("count", 0))
+        if count < 1 or start is None or interval is None:
+            raise ValueError("Le schéma doit préciser interval, start et count (>= 1)")
+        if isinstance(interval, str):
+            current = date.fromisoformat(str(start))
+            bounds = [current.isoformat()]
+            for _ in range(count):
+                current = _add_interval(current, interval)
+                bounds.append(current.isoformat())
+        else:
+            if interval <= 0:
+                raise ValueError("Le pas de partition doit être positif")
+            bounds = [start + interval * position for position in range(count + 1)]
+    else:
+        bounds = list(scheme)
+    if len(bounds) < 2:
+        raise ValueError("Il faut au moins deux bornes pour définir une partition")
+    for lower, upper in zip(bounds, bounds[1:]):
+        sql_literal(lower)
+        try:
+            ordered = lower < upper
+        except TypeError:
+            raise ValueError(f"Bornes de types incompatibles : {lower!r}, {upper!r}")
+        if not ordered:
+            raise ValueError(f"Les bornes doivent être strictement croissantes : {lower!r} >= {upper!r}")
+    sql_literal(bounds[-1])
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_value(token: str, placeholder: Optional[int], params) -> Any:
+    if token == '?':
+        return params[placeholder]
+    if token.startswith(':'):
+        return params[token[1:]]
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    return float(token) if '.' in token else int(token)
+
+
+class PartitionLayout(NamedTuple):
+    """Découpage d'une table partitionnée par intervalles, trié par borne basse"""
+    table_name: str
+    key: str
+    partitions: Tuple[Partition, ...]
+
+    def partition_for(self, value: Any) -> Partition:
+        """Partition qui doit recevoir une ligne dont la clé vaut `value` (ValueError si aucune)"""
+        if value is None:
+            raise ValueError(f"La clé de partitionnement {self.key} ne peut pas être NULL")
+        try:
+            position = bisect_right([partition.lower for partition in self.partitions], value) - 1
+            if position >= 0 and value < self.partitions[position].upper:
+                return self.partitions[position]
+        except TypeError:
+            raise ValueError(f"Valeur de {self.key} incompatible avec les bornes de {self.table_name} : {value!r}")
+        raise ValueError(f"Aucune partition de {self.table_name} ne couvre {self.key} = {value!r}")
+
+    def bounds(self, conditions: str, params=()) -> Optional[Tuple[Any, bool, Any, bool]]:
+        """
+        Bornes de la clé imposées par des conditions (conjonction de comparaisons et BETWEEN) :
+        (basse, incluse, haute, incluse), None à la place d'une borne absente. Retourne None
+        si les conditions ne se prêtent pas à l'élagage (OR, NOT, sous-requête...).
+        """
+        masked = _QUOTED.sub(lambda match: "'" + '_' * (len(match.group()) - 2) + "'", conditions)
+        end = _CLAUSE_END.search(masked)
+        where = masked[:end.start()] if end else masked
+        if _UNPRUNABLE.search(re.sub(r"\bIS\s+NOT\b", "IS", where, flags=re.IGNORECASE)):
+            return None
+        column = rf"(?<![\w.])(?:\w+\.)?{re.escape(self.key)}(?!\w)"
+        lower = upper = None
+        lower_inclusive = upper_inclusive = True
+
+        def value_at(match, group):
+            token = conditions[match.start(group):match.end(group)]
+            return _parse_value(token, masked.count('?', 0, match.start(group)), params)
+
+        try:
+            constraints = []
+            for match in re.finditer(rf"{column}\s+BETWEEN\s+{_VALUE}\s+AND\s+{_VALUE}", where, re.IGNORECASE):
+                constraints += [('>=', value_at(match, 1)), ('<=', value_at(match, 2))]
+            for match in re.finditer(rf"{column}\s*(<=|>=|==|=|<|>)\s*{_VALUE}", where, re.IGNORECASE):
+                constraints.append((match.group(1), value_at(match, 2)))
+            for operator, value in constraints:
+                if operator in ('=', '==', '>', '>=') and (
+                        lower is None or value > lower or (value == lower and operator == '>')):
+                    lower, lower_inclusive = value, operator != '>'
+                if operator in ('=', '==', '<', '<=') and (
+                        upper is None or value < upper or (value == upper and operator == '<')):
+                    upper, upper_inclusive = value, operator != '<'
+        except (IndexError, KeyError, TypeError):
+            return None
+        return lower, lower_inclusive, upper, upper_inclusive
+
+    def prune(self, conditions: str = '', params=()) -> List[Partition]:
+        """Partitions qui peuvent contenir des lignes satisfaisant les conditions"""
+        bounds = self.bounds(conditions, params) if conditions else None
+        if bounds is None:
+            return list(self.partitions)
+        lower, _, upper, upper_inclusive = bounds
+        try:
+            return [
+                partition for partition in self.partitions
+                if (lower is None or partition.upper > lower)
+                and (upper is None or partition.lower < upper or (upper_inclusive and partition.lower == upper))
+            ]
+        except TypeError:
+            return list(self.partitions)
+
+    def source(self, partitions: Sequence[Partition]) -> str:
+        """Clause FROM lisant les partitions retenues sous le nom de la table partitionnée"""
+        if not partitions:
+            # Aucune partition ne peut correspondre : relation vide de même structure
+            return f"(SELECT * FROM {self.partitions[0].name} WHERE 0) AS {self.table_name}"
+        if len(partitions) == 1:
+            return f"{partitions[0].name} AS {self.table_name}"
+        union = " UNION ALL ".join(f"SELECT * FROM {partition.name}" for partition in partitions)
+        return f"({union}) AS {self.table_name}"
+
+
+def view_sql(table_name: str, partitions: Sequence[Partition]) -> str:
+    """Vue UNION ALL exposant toutes les partitions sous le nom de la table"""
+    union = " UNION ALL ".join(f"SELECT * FROM {partition.name}" for partition in partitions)
+    return f"CREATE VIEW {table_name} AS {union}"
+
+
+def load_layouts(rows: Sequence[tuple]) -> Dict[str, PartitionLayout]:
+    """Découpages construits depuis les lignes (table, partition, clé, borne basse, borne haute) de sys_partitions"""
+    grouped: Dict[str, Tuple[str, List[Partition]]] = {}
+    for table_name, name, key, lower, upper in rows:
+        grouped.setdefault(table_name, (key, []))[1].append(Partition(name, lower, upper))
+    return {
+        table_name: PartitionLayout(table_name, key, tuple(sorted(partitions, key=lambda partition: partition.lower)))
+        for table_name, (key, partitions) in grouped.items()
+    }
@@ -0,0 +1,105 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+_STATEMENT_PATTERN = re.compile(
+    r"\s*(CREATE\s+(?:UNIQUE\s+)?(?:TEMP\s+|TEMPORARY\s+)?(?:VIRTUAL\s+)?(?:TABLE|INDEX|VIEW|TRIGGER)"
+    r"|ALTER\s+TABLE|DROP\s+(?:TABLE|INDEX|VIEW|TRIGGER)"
+    r"|INSERT|REPLACE|UPDATE|DELETE|SELECT|WITH|VALUES|PRAGMA|EXPLAIN)\b",
+    re.IGNORECASE,
+)
+_IF_EXISTS = r"(?:IF\s+(?:NOT\s+)?EXISTS\s+)?"
+_NAME = r"((?:[\w]+\.)?[\w]+)"
+_TABLE_PATTERNS = {
+    'CREATE TABLE': re.compile(rf"CREATE\s+(?:TEMP\s+|TEMPORARY\s+)?(?:VIRTUAL\s+)?TABLE\s+{_IF_EXISTS}{_NAME}", re.IGNORECASE),
+    'CREATE INDEX': re.compile(rf"CREATE\s+(?:UNIQUE\s+)?INDEX\s+{_IF_EXISTS}[\w.]+\s+ON\s+{_NAME}", re.IGNORECASE),
+    'ALTER TABLE': re.compile(rf"ALTER\s+TABLE\s+{_NAME}", re.IGNORECASE),
+    'DROP TABLE': re.compile(rf"DROP\s+TABLE\s+{_IF_EXISTS}{_NAME}", re.IGNORECASE),
+    'INSERT': re.compile(rf"(?:INSERT|REPLACE)(?:\s+OR\s+\w+)?\s+INTO\s+{_NAME}", re.IGNORECASE),
+    'UPDATE': re.compile(rf"UPDATE(?:\s+OR\s+\w+)?\s+{_NAME}", re.IGNORECASE),
+    'DELETE': re.compile(rf"DELETE\s+FROM\s+{_NAME}", re.IGNORECASE),
+    'SELECT': re.compile(rf"\bFROM\s+{_NAME}", re.IGNORECASE),
+}
+# Littéraux, identifiants délimités et noms de paramètres : conservés tels quels dans la clé du cache
+_VERBATIM = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`(?:[^`]|``)*`|\[[^\]]*\]|[:@$]\w+)")
+_KINDS = {
+    'CREATE': 'DDL', 'ALTER': 'DDL', 'DROP': 'DDL',
+    'INSERT': 'DML', 'REPLACE': 'DML', 'UPDATE': 'DML', 'DELETE': 'DML',
+    'SELECT': 'SELECT', 'WITH': 'SELECT', 'VALUES': 'SELECT', 'PRAGMA': 'SELECT', 'EXPLAIN': 'SELECT',
+}
+
+
+class ParsedQuery(NamedTuple):
+    """Classification d'une requête : texte transmis à sqlite3, type, instruction et table cible"""
+    sql: str
+    kind: str
+    statement: str
+    table: Optional[str]
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """Classe une requête SQL (DDL/DML/SELECT) et extrait la table cible"""
+    sql = query.strip()
+    match = _STATEMENT_PATTERN.match(sql)
+    if not match:
+        return ParsedQuery(sql, 'OTHER', '', None)
+    statement = ' '.join(match.group(1).upper().split())
+    statement = re.sub(r"\s+(?:UNIQUE|TEMP|TEMPORARY|VIRTUAL)\b", "", statement)
+    if statement == 'REPLACE':
+        statement = 'INSERT'
+    kind = _KINDS[statement.split()[0]]
+    pattern = _TABLE_PATTERNS.get(statement) or (_TABLE_PATTERNS['SELECT'] if kind == 'SELECT' else None)
+    table_match = pattern.search(sql) if pattern else None
+    return ParsedQuery(sql, kind, statement, table_match.group(1) if table_match else None)
+
+
+def normalize_query(query: str) -> str:
+    """Clé du cache : espaces réduits et casse ignorée hors littéraux, identifiants délimités et paramètres, sans ';' final"""
+    parts = _VERBATIM.split(query.strip().rstrip(';').rstrip())
+    return ''.join(part if index % 2 else re.sub(r"\s+", ' ', part).lower() for index, part in enumerate(parts))
+
+
+class QueryCache:
+    """
+    Cache LRU borné des requêtes analysées, indexé par le texte SQL normalisé (normalize_query).
+    Les variantes d'une même requête partagent une entrée : le texte de la première est retransmis
+    à sqlite3, qui n'en prépare qu'une instruction dans son cache.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max(1, int(max_size))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, query: str) -> ParsedQuery:
+        """Retourne l'analyse de la requête, en la calculant au premier appel de sa forme normalisée"""
+        key = normalize_query(query)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parsed
+            self.misses += 1
+        parsed = parse_query(query)
+        with self._lock:
+            self._entries[key] = parsed
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return parsed
+
+    def stats(self) -> dict:
+        """Retourne les compteurs hit/miss/éviction du cache"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._entries), "max_size": self.max_size}
+
+    def clear(self) -> None:
+        """Vide le cache sans remettre les compteurs à zéro"""
+        with self._lock:
+            self._entries.clear()
@@ -1,21 +1,48 @@
 import logging
-from .database_connector import DatabaseConnector, DatabaseConnector
-from typing import List, Tuple, Dict
 import re
+import sqlite3
+from .catalog_cache import table_pragma
+from .database_connector import DatabaseConnector, DatabaseConnector, is_readonly_error
+from .parallel_scan import ParallelAggregator, register_functions
+from .query_cache import QueryCache
+from .query_profiler import QueryProfiler
+from typing import List, Tuple, Dict, Iterator, Optional
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# À incrémenter à chaque modification de _create_system_tables
+SYSTEM_SCHEMA_VERSION = 1
+# ATTACH / DETACH saisis dans l'éditeur : redirigés vers le connecteur pour toucher toutes les connexions du pool
+_ATTACH_PATTERN = re.compile(r"^\s*ATTACH\s+(?:DATABASE\s+)?'((?:[^']|'')*)'\s+AS\s+\"?(\w+)\"?\s*;?\s*$", re.IGNORECASE)
+_DETACH_PATTERN = re.compile(r"^\s*DETACH\s+(?:DATABASE\s+)?\"?(\w+)\"?\s*;?\s*$", re.IGNORECASE)
+
 class QueryExecutor:
-    def __init__(self, db_path: str):
-        """Initialisation avec le chemin de la base de données SQLite"""
+    def __init__(self, db_path: str, query_cache_size: int = 256, slow_query_ms: float = 100.0,
+                 parallel_workers: int = 0, parallel_min_rows: int = 200_000):
+        """
+        Initialisation avec le chemin de la base de données SQLite.
+        Les requêtes plus longues que slow_query_ms sont enregistrées dans sys_slow_queries.
+        Avec parallel_workers > 0, les agrégations sur une table d'au moins parallel_min_rows
+        lignes sont réparties par plages de rowid sur autant de processus (voir ParallelAggregator).
+        """
+        self.query_cache = QueryCache(query_cache_size)
         self.connector = DatabaseConnector(db_path)
         self.connector.connect()
         self.connection = self.connector.get_connection()
-        self._create_system_tables()
+        self.connector.ensure_schema('query_executor', SYSTEM_SCHEMA_VERSION, self._create_system_tables)
+        self.profiler = QueryProfiler(self.connector, slow_query_ms)
+        self.index_advisor = self.connector.get_index_advisor()
+        self.catalog = self.connector.get_catalog_cache()
+        self.result_cache = self.connector.get_result_cache()
+        # APPROX_COUNT_DISTINCT reste disponible quand la requête s'exécute sur une seule connexion
+        register_functions(self.connector)
+        self.parallel = None
+        if parallel_workers > 0:
+            self.parallel = ParallelAggregator(self.connector, parallel_workers, parallel_min_rows)
     
-    def _create_system_tables(self):
-        """Crée les tables système nécessaires"""
+    def _create_system_tables(self, cursor):
+        """Crée les tables système nécessaires (une fois par base, voir DatabaseConnector.ensure_schema)"""
         queries = [
             """
             CREATE TABLE IF NOT EXISTS sys_tables (
@@ -127,50 +154,48 @@ class QueryExecutor:
             ('sys_logs', 'SYSTEM', 'Table containing system operation logs')
         ]
         
-        with self.connector.transaction() as cursor:
-            for query in queries:
-                cursor.execute(query)
+        for query in queries:
+            cursor.execute(query)
+        
+        # Insert system tables metadata
+        for table_name, table_type, description in system_tables:
+            cursor.execute("""
+                INSERT OR IGNORE INTO sys_tables (table_name, table_type, description)
+                VALUES (?, ?, ?)
+            """, (table_name, table_type, description))
+            
+            # Get table schema information and populate sys_columns
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            table_info = cursor.fetchall()
+            
+            # Get the table_id
+            cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
+            table_id = cursor.fetchone()[0]
             
-            # Insert system tables metadata
-            for table_name, table_type, description in system_tables:
+            # Insert column information
+            for col in table_info:
                 cursor.execute("""
-                    INSERT OR IGNORE INTO sys_tables (table_name, table_type, description)
-                    VALUES (?, ?, ?)
-                """, (table_name, table_type, description))
-                
-                # Get table schema information and populate sys_columns
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                table_info = cursor.fetchall()
-                
-                # Get the table_id
-                cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
-                table_id = cursor.fetchone()[0]
-                
-                # Insert column information
-                for col in table_info:
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO sys_columns (
-                            table_id, column_name, data_type, 
-                            is_nullable, column_default, ordinal_position
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (table_id, col[1], col[2], not col[3], col[4], col[0]))
+                    INSERT OR IGNORE INTO sys_columns (
+                        table_id, column_name, data_type, 
+                        is_nullable, column_default, ordinal_position
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (table_id, col[1], col[2], not col[3], col[4], col[0]))
     
     def _log_operation(self, operation_type: str, table_name: str, details: str = None):
-        """Enregistre une opération dans sys_logs"""
-        with self.connector.transaction() as cursor:
-            cursor.execute("""
-                INSERT INTO sys_logs (operation_type, table_name, details)
-                VALUES (?, ?, ?)
-            """, (operation_type, table_name, details))
+        """Enregistre une opération dans sys_logs (écriture asynchrone par lots, après validation de la transaction)"""
+        self.connector.get_audit_writer().log_after_transaction(operation_type, table_name, details=details)
 
     def _register_table(self, table_name: str, columns_info: List[Tuple]):
-        """Enregistre une nouvelle table dans sys_tables et sys_columns"""
+        """Enregistre une nouvelle table dans sys_tables et sys_columns (sans effet si déjà enregistrée)"""
         with self.connector.transaction() as cursor:
+            # CREATE TABLE IF NOT EXISTS sur une table existante : l'enregistrement est déjà en place
             cursor.execute("""
-                INSERT INTO sys_tables (table_name, table_type)
+                INSERT OR IGNORE INTO sys_tables (table_name, table_type)
                 VALUES (?, 'USER')
-            """)
+            """, (table_name,))
+            if cursor.rowcount == 0:
+                return
             table_id = cursor.lastrowid
             
             for pos, col_info in enumerate(columns_info, 1):
@@ -186,63 +211,218 @@ class QueryExecutor:
         """Établit la connexion à la base de données"""
         self.connector.connect()
 
+    def attach_database(self, alias: str, db_path: str) -> None:
+        """Attache une base sous `alias` : ses tables sont accessibles en « alias.table » (jointures entre bases)"""
+        self.connector.attach(alias, db_path)
+        self.result_cache.invalidate()
+
+    def detach_database(self, alias: str) -> None:
+        """Détache la base attachée sous `alias`"""
+        self.connector.detach(alias)
+        self.result_cache.invalidate()
+
     def execute_query(self, query: str, params: Tuple = ()) -> List[Dict]:
         """Exécute une requête SQL avec gestion des erreurs et optimisation"""
-        query_upper = query.upper().strip()
-        
-        with self.connector.transaction() as cursor:
-            # Analyse du type de requête
-            if query_upper.startswith('CREATE TABLE'):
-                # Extraction du nom de la table et des colonnes
-                match = re.match(r'CREATE TABLE (?:IF NOT EXISTS )?([\w_]+)', query, re.IGNORECASE)
-                if match:
-                    table_name = match.group(1)
-                    cursor.execute(query, params)
-                    # Récupération des informations sur les colonnes
-                    cursor.execute(f"PRAGMA table_info({table_name})")
-                    columns_info = [(row[1], row[2], not row[3], row[4]) for row in cursor.fetchall()]
-                    self._register_table(table_name, columns_info)
-                    self._log_operation('CREATE_TABLE', table_name, query)
-                return []
+        attach = _ATTACH_PATTERN.match(query)
+        if attach:
+            self.attach_database(attach.group(2), attach.group(1).replace("''", "'"))
+            return []
+        detach = _DETACH_PATTERN.match(query)
+        if detach:
+            self.detach_database(detach.group(1))
+            return []
+        # Analyse du type de requête (mise en cache : aucune analyse pour une requête répétée)
+        parsed = self.query_cache.get(query)
+        pending = None
+        if parsed.statement in ('SELECT', 'WITH', 'VALUES'):
+            cached = self.result_cache.get(parsed.sql, params)
+            if cached is not None:
+                self.index_advisor.observe_query(parsed.sql, self.profiler.plan_for(parsed.sql), parsed.kind)
+                return cached
+            pending = self.result_cache.begin(parsed.sql, params)
+
+        if parsed.kind == 'SELECT' and self.parallel is not None:
+            parallel_plan = self.parallel.plan(parsed.sql, params)
+            if parallel_plan is not None:
+                return self._run_parallel(parsed, params, pending, *parallel_plan)
+
+        if parsed.statement in ('SELECT', 'WITH', 'VALUES'):
+            # Lecture : connexion de lecture du pool (celle d'écriture dans une unit_of_work),
+            # rejouée si la base est verrouillée
+            try:
+                results, unknown_write = self.connector.retry('SELECT', self._run_read, parsed, params, pending)
+            except sqlite3.OperationalError as e:
+                if not is_readonly_error(e):
+                    raise
+                # WITH ... INSERT/UPDATE/DELETE : refusée par la connexion de lecture avant tout effet
+                results, unknown_write = self._run_statement(parsed, query, params, pending, None)
+        elif parsed.kind == 'SELECT':
+            # PRAGMA, EXPLAIN : transaction DEFERRED sur la connexion d'écriture, dont ils décrivent l'état
+            results, unknown_write = self.connector.retry(
+                'SELECT', self._run_statement, parsed, query, params, pending, 'DEFERRED')
+        else:
+            # PRAGMA, VACUUM, ATTACH... ne supportent pas une transaction ouverte explicitement
+            mode = 'AUTO' if parsed.kind == 'OTHER' else None
+            results, unknown_write = self._run_statement(parsed, query, params, pending, mode)
+        if parsed.kind in ('SELECT', 'DML'):
+            self.index_advisor.observe_query(parsed.sql, self.profiler.plan_for(parsed.sql), parsed.kind)
+        if parsed.kind == 'DML':
+            self.result_cache.invalidate(parsed.table)
+        elif parsed.kind == 'DDL':
+            # Toutes les tables si la cible est inconnue (vue, trigger, DROP INDEX)
+            self.catalog.invalidate(parsed.table)
+            if parsed.table:
+                self.result_cache.invalidate_schema(parsed.table)
             else:
-                cursor.execute(query, params)
-                
-                if query_upper.startswith(('INSERT', 'UPDATE', 'DELETE')):
-                    return []
-                
-                columns = [description[0] for description in cursor.description]
-                results = []
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
-                
-                logging.info(f"Requête exécutée avec succès.")
-                return results if results else []
-    
+                self.result_cache.invalidate()
+        elif parsed.kind == 'OTHER' or unknown_write:
+            self.result_cache.invalidate()
+        self.profiler.flush()
+        return results
+
+    def _run_statement(self, parsed, query: str, params: Tuple, pending, mode: Optional[str]) -> Tuple[List[Dict], bool]:
+        """Exécute une requête analysée dans une transaction ; retourne (résultats, écriture non classée)"""
+        # WITH ... DELETE est classé en lecture : sans résultat, on la traite comme une écriture
+        results, unknown_write = [], False
+        with self.connector.transaction(mode=mode, operation=parsed.statement) as cursor:
+            with self.profiler.profile(cursor, parsed.sql, params,
+                                       explain=parsed.kind in ('SELECT', 'DML')) as record_rows:
+                if parsed.statement == 'CREATE TABLE':
+                    if parsed.table:
+                        table_name = parsed.table
+                        cursor.execute(parsed.sql, params)
+                        # Récupération des informations sur les colonnes
+                        cursor.execute(table_pragma('table_info', table_name))
+                        columns_info = [(row[1], row[2], not row[3], row[4]) for row in cursor.fetchall()]
+                        self._register_table(table_name, columns_info)
+                        self._log_operation('CREATE_TABLE', table_name, query)
+                else:
+                    results, unknown_write = self._execute(cursor, parsed, params, pending, record_rows)
+        return results, unknown_write
+
+    def _run_read(self, parsed, params: Tuple, pending) -> Tuple[List[Dict], bool]:
+        """Exécute une lecture sans prendre la connexion d'écriture (voir DatabaseConnector.query_cursor)"""
+        with self.connector.query_cursor() as cursor:
+            with self.profiler.profile(cursor, parsed.sql, params) as record_rows:
+                return self._execute(cursor, parsed, params, pending, record_rows)
+
+    def _execute(self, cursor, parsed, params: Tuple, pending, record_rows) -> Tuple[List[Dict], bool]:
+        """Exécute la requête sur `cursor` et met en cache son résultat ; retourne (résultats, écriture non classée)"""
+        cursor.execute(parsed.sql, params)
+        if parsed.kind == 'DML' or cursor.description is None:
+            record_rows(max(cursor.rowcount, 0))
+            return [], parsed.kind != 'DML'
+        columns = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+        results = [dict(zip(columns, row)) for row in rows]
+        record_rows(len(results))
+        self.result_cache.put(pending, columns, rows)
+        logging.info(f"Requête exécutée avec succès ({len(results)} ligne(s)).")
+        return results, False
+
+    def _run_parallel(self, parsed, params: Tuple, pending, plan, ranges) -> List[Dict]:
+        """Agrégation répartie sur les processus de travail, résultat mis en cache comme une lecture ordinaire"""
+        columns, rows = self.parallel.execute(plan, ranges)
+        results = [dict(zip(columns, row)) for row in rows]
+        self.result_cache.put(pending, columns, rows)
+        self.index_advisor.observe_query(parsed.sql, self.profiler.plan_for(parsed.sql), parsed.kind)
+        self.profiler.flush()
+        logging.info(f"Requête exécutée avec succès ({len(results)} ligne(s)).")
+        return results
+
+    def stream_query(self, query: str, params: Tuple = (), batch_size: int = 1000, row_format: str = 'dict') -> Iterator[List]:
+        """
+        Exécute une requête de lecture et produit les résultats par lots de `batch_size` lignes (fetchmany).
+        row_format : 'dict' (un dict par ligne), 'tuple' (tuples bruts) ou
+        'row' (sqlite3.Row, qui partage le mapping nom -> index entre toutes les lignes).
+        Seul le lot courant est en mémoire : la consommation reste constante quelle que soit la taille du résultat.
+        """
+        if row_format not in ('dict', 'tuple', 'row'):
+            raise ValueError(f"Format de ligne inconnu : {row_format}")
+        with self.connector.read_cursor() as cursor:
+            if row_format == 'row':
+                cursor.row_factory = sqlite3.Row
+            cursor.execute(query, params)
+            if cursor.description is None:
+                return
+            columns = [description[0] for description in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if row_format == 'dict':
+                    rows = [dict(zip(columns, row)) for row in rows]
+                yield rows
+
+    def get_query_columns(self, query: str, params: Tuple = ()) -> List[str]:
+        """Retourne les noms des colonnes d'une requête SELECT sans lire de ligne"""
+        with self.connector.read_cursor() as cursor:
+            cursor.execute(f"SELECT * FROM ({query.rstrip().rstrip(';')}) LIMIT 0", params)
+            return [description[0] for description in cursor.description]
+
     def execute_insert(self, query: str, params: Tuple = ()) -> int:
         """Exécute une requête d'insertion et retourne l'ID du dernier enregistrement inséré"""
+        parsed = self.query_cache.get(query)
+        inserted_id = None
         with self.connector.transaction() as cursor:
-            match = re.match(r'INSERT INTO ([\w_]+)', query, re.IGNORECASE)
-            if match:
-                table_name = match.group(1)
-                cursor.execute(query, params)
+            if parsed.statement == 'INSERT' and parsed.table:
+                table_name = parsed.table
+                with self.profiler.profile(cursor, parsed.sql, params) as record_rows:
+                    cursor.execute(parsed.sql, params)
+                    inserted_id = cursor.lastrowid
+                    record_rows(max(cursor.rowcount, 0))
                 self._log_operation('INSERT', table_name, query)
-                inserted_id = cursor.lastrowid
                 logging.info(f"Insertion réussie. ID inséré : {inserted_id}")
-                return inserted_id
+        if parsed.table:
+            self.result_cache.invalidate(parsed.table)
+        self.profiler.flush()
+        return inserted_id
 
     def get_column_names(self) -> List[Tuple[str, str]]:
         """Retourne les noms et types des colonnes de la dernière requête exécutée"""
-        with self.connector.transaction() as cursor:
+        with self.connector.transaction(mode='DEFERRED') as cursor:
             return cursor.description or []
 
     def get_table_columns(self, table_name: str) -> List[str]:
-        """Retourne la liste des noms de colonnes d'une table"""
-        query = f"PRAGMA table_info({table_name})"
-        with self.connector.transaction() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            return [row[1] for row in results] if results else []
+        """Retourne la liste des noms de colonnes d'une table (catalogue en cache)"""
+        return self.catalog.columns(table_name)
+
+    def top_queries(self, order_by: str = 'total', limit: int = 20) -> List[Dict]:
+        """Requêtes les plus coûteuses depuis le démarrage, par temps cumulé ('total') ou p95 ('p95')"""
+        return self.profiler.top_queries(order_by, limit)
+
+    def slow_queries(self, limit: int = 100) -> List[Dict]:
+        """Dernières requêtes lentes enregistrées dans sys_slow_queries"""
+        return self.profiler.slow_queries(limit)
+
+    def recommend_indexes(self, analyze: bool = True) -> List[Dict]:
+        """Recommandations d'index d'après la charge observée (ANALYZE préalable pour des statistiques à jour)"""
+        if analyze:
+            self.index_advisor.analyze()
+        return self.index_advisor.recommend()
+
+    def unused_indexes(self) -> List[Dict]:
+        """Index jamais utilisés par la charge observée mais maintenus à chaque écriture"""
+        return self.index_advisor.unused_indexes()
+
+    def cache_stats(self) -> Dict:
+        """Retourne les compteurs du cache de requêtes analysées"""
+        return self.query_cache.stats()
+
+    def result_cache_stats(self) -> Dict:
+        """Retourne le taux de succès et la mémoire occupée par le cache de résultats"""
+        return self.result_cache.stats()
+
+    def catalog_stats(self) -> Dict:
+        """Retourne les compteurs du cache du catalogue (tables, colonnes, index)"""
+        return self.catalog.stats()
+
+    def flush_logs(self):
+        """Écrit immédiatement les entrées sys_logs en attente"""
+        self.connector.get_audit_writer().flush()
 
     def close(self): 
         """Ferme la connexion à la base de données"""
+        if self.parallel is not None:
+            self.parallel.close()
         self.connector.close_connection()
\ No newline at end of file
@@ -0,0 +1,213 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+# Nombre d'instructions de la VM SQLite entre deux appels du progress handler
+PROGRESS_STEP = 1000
+# Parcours complet d'une table (sans index) dans la sortie d'EXPLAIN QUERY PLAN
+_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!\()(\w+)(?!.*\bUSING\b)")
+
+CREATE_SLOW_QUERIES_TABLE = """
+    CREATE TABLE IF NOT EXISTS sys_slow_queries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query_text TEXT NOT NULL,
+        params TEXT,
+        duration_ms REAL NOT NULL,
+        rows_returned INTEGER,
+        vm_steps INTEGER,
+        full_scan BOOLEAN DEFAULT 0,
+        scanned_tables TEXT,
+        query_plan TEXT,
+        executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def percentile(samples, fraction: float) -> float:
+    """Percentile par rang le plus proche d'une série de mesures"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def full_scans(plan: List[Tuple]) -> List[str]:
+    """Tables parcourues intégralement d'après les lignes (id, parent, notused, detail) d'EXPLAIN QUERY PLAN"""
+    tables = []
+    for row in plan:
+        match = _FULL_SCAN.match(row[-1])
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+class QueryStats:
+    """Mesures cumulées d'une requête (même texte SQL)"""
+
+    def __init__(self, sql: str, max_samples: int):
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.vm_steps = 0
+        self.samples = deque(maxlen=max_samples)
+        self.plan = None
+        self.scanned_tables = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.sql,
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p95_ms": percentile(self.samples, 0.95),
+            "max_ms": self.max_ms,
+            "rows": self.rows,
+            "vm_steps": self.vm_steps,
+            "full_scan": bool(self.scanned_tables),
+            "scanned_tables": ", ".join(self.scanned_tables),
+        }
+
+
+class QueryProfiler:
+    """
+    Instrumente chaque requête : durée, lignes retournées et travail de la VM SQLite
+    (compté par le progress handler, approximation des lignes parcourues). Le plan
+    d'EXPLAIN QUERY PLAN est calculé une fois par texte SQL pour signaler les SCAN complets.
+    Les requêtes au-delà de `slow_threshold_ms` sont enregistrées dans sys_slow_queries.
+    """
+
+    def __init__(self, connector, slow_threshold_ms: float = 100.0, max_queries: int = 500,
+                 max_samples: int = 1000, enabled: bool = True):
+        self.connector = connector
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_queries = max_queries
+        self.max_samples = max_samples
+        self.enabled = enabled
+        self._stats: Dict[str, QueryStats] = {}
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self.connector.ensure_schema('query_profiler', 1, lambda cursor: cursor.execute(CREATE_SLOW_QUERIES_TABLE))
+
+    @contextmanager
+    def profile(self, cursor, sql: str, params: tuple = (), explain: bool = True):
+        """
+        Mesure l'exécution faite dans le bloc sur `cursor`. Le bloc renseigne le nombre
+        de lignes retournées via la fonction reçue : `with profiler.profile(...) as rows: rows(n)`.
+        """
+        if not self.enabled:
+            yield lambda count: None
+            return
+        connection = cursor.connection
+        steps = [0]
+        returned = [0]
+
+        def on_progress():
+            steps[0] += PROGRESS_STEP
+            return 0
+
+        connection.set_progress_handler(on_progress, PROGRESS_STEP)
+        started = time.perf_counter()
+        try:
+            yield lambda count: returned.__setitem__(0, count)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            connection.set_progress_handler(None, PROGRESS_STEP)
+        stats = self._record(cursor, sql, duration_ms, returned[0], steps[0], explain)
+        if duration_ms >= self.slow_threshold_ms:
+            logging.warning(f"Requête lente ({duration_ms:.1f} ms, {returned[0]} lignes) : {sql}")
+            self._pending.append((
+                sql, repr(params) if params else None, duration_ms, returned[0], steps[0],
+                1 if stats.scanned_tables else 0, ", ".join(stats.scanned_tables),
+                "\n".join(row[-1] for row in stats.plan or []),
+            ))
+
+    def _record(self, cursor, sql: str, duration_ms: float, rows: int, vm_steps: int, explain: bool) -> QueryStats:
+        with self._lock:
+            stats = self._stats.get(sql)
+            if stats is None:
+                if len(self._stats) >= self.max_queries:
+                    # Oubli de la requête la moins coûteuse pour borner la mémoire
+                    cheapest = min(self._stats.values(), key=lambda s: s.total_ms)
+                    del self._stats[cheapest.sql]
+                stats = self._stats[sql] = QueryStats(sql, self.max_samples)
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.rows += rows
+            stats.vm_steps += vm_steps
+            stats.samples.append(duration_ms)
+        if explain and stats.plan is None:
+            stats.plan = self._explain(cursor, sql)
+            stats.scanned_tables = full_scans(stats.plan)
+            if stats.scanned_tables:
+                logging.warning(f"Parcours complet de {', '.join(stats.scanned_tables)} : {sql}")
+        return stats
+
+    def _explain(self, cursor, sql: str) -> List[Tuple]:
+        """Plan d'exécution de la requête (vide si la requête n'est pas explicable sans paramètres)"""
+        placeholders = sql.count('?')
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * placeholders)
+            return cursor.fetchall()
+        except Exception as e:
+            logging.debug(f"EXPLAIN QUERY PLAN impossible pour {sql}: {e}")
+            return []
+
+    def flush(self) -> int:
+        """
+        Écrit les requêtes lentes en attente dans sys_slow_queries. À appeler hors de la
+        transaction mesurée pour ne pas la valider prématurément. Retourne le nombre d'entrées écrites.
+        """
+        entries = []
+        while self._pending:
+            entries.append(self._pending.popleft())
+        if not entries:
+            return 0
+        try:
+            with self.connector.transaction() as cursor:
+                cursor.executemany("""
+                    INSERT INTO sys_slow_queries (
+                        query_text, params, duration_ms, rows_returned,
+                        vm_steps, full_scan, scanned_tables, query_plan
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, entries)
+        except Exception as e:
+            logging.error(f"Impossible d'enregistrer {len(entries)} requête(s) lente(s) : {e}")
+            return 0
+        self.connector.get_result_cache().invalidate("sys_slow_queries")
+        return len(entries)
+
+    def plan_for(self, sql: str) -> List[Tuple]:
+        """Plan EXPLAIN QUERY PLAN mémorisé pour ce texte SQL (liste vide si inconnu)"""
+        stats = self._stats.get(sql)
+        return (stats.plan or []) if stats else []
+
+    def top_queries(self, order_by: str = 'total', limit: int = 20) -> List[Dict[str, Any]]:
+        """Requêtes les plus coûteuses, triées par temps cumulé ('total') ou 95e percentile ('p95')"""
+        key = {'total': 'total_ms', 'p95': 'p95_ms', 'max': 'max_ms', 'count': 'count'}.get(order_by)
+        if key is None:
+            raise ValueError(f"Critère de tri inconnu : {order_by}")
+        with self._lock:
+            rows = [stats.as_dict() for stats in self._stats.values()]
+        rows.sort(key=lambda row: row[key], reverse=True)
+        return rows[:limit]
+
+    def slow_queries(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Dernières entrées de sys_slow_queries"""
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT * FROM sys_slow_queries ORDER BY id DESC LIMIT ?", (limit,))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def reset(self) -> None:
+        """Oublie les statistiques en mémoire (sys_slow_queries est conservée)"""
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,285 @@
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from .catalog_cache import qualified_name
+
+# Tables du catalogue réécrites par les DDL et la synchronisation des métadonnées
+CATALOG_TABLES = ('sys_tables', 'sys_columns', 'sys_indexes', 'sys_constraints')
+# Nombre de lignes mesurées pour estimer la taille d'un résultat
+SIZE_SAMPLE = 64
+
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH|VALUES)\b", re.IGNORECASE)
+_VOLATILE = re.compile(
+    r"\b(random|randomblob|changes|total_changes|last_insert_rowid|current_(?:date|time|timestamp))\b",
+    re.IGNORECASE,
+)
+_NOW = re.compile(r"'now'", re.IGNORECASE)
+# WITH ... INSERT/UPDATE/DELETE (RETURNING) est une écriture
+_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+# Opcodes d'ouverture de curseur sur une table ou un index (p2 = page racine, p3 = base)
+_OPEN_OPCODES = ('OpenRead', 'ReopenIdx')
+
+
+def normalize_sql(sql: str) -> str:
+    """Texte SQL canonique pour la clé du cache : espaces réduits hors des littéraux, sans ';' final"""
+    parts = _QUOTED.split(sql.strip().rstrip(';').rstrip())
+    return ''.join(part if index % 2 else re.sub(r"\s+", ' ', part) for index, part in enumerate(parts))
+
+
+def referenced_tables(cursor, sql: str, params=()) -> Optional[List[str]]:
+    """
+    Tables réellement lues par une requête, d'après son bytecode (EXPLAIN) : les sous-requêtes,
+    CTE et vues sont résolues par SQLite. Retourne None si la requête lit une table virtuelle
+    (FTS, pragma_*, json_each...), une base attachée ou temporaire, ou le schéma lui-même.
+    """
+    cursor.execute(f"EXPLAIN {sql}", params)
+    rootpages = set()
+    for _, opcode, _, p2, p3, *_ in cursor.fetchall():
+        if opcode == 'VOpen':
+            return None
+        if opcode in _OPEN_OPCODES:
+            if p3 != 0 or p2 == 1:
+                return None
+            rootpages.add(p2)
+    if not rootpages:
+        return []
+    cursor.execute(
+        f"SELECT DISTINCT tbl_name FROM sqlite_master WHERE rootpage IN ({', '.join('?' * len(rootpages))})",
+        tuple(rootpages),
+    )
+    return sorted(row[0] for row in cursor.fetchall())
+
+
+def is_cacheable(sql: str) -> bool:
+    """Lecture déterministe : SELECT / WITH / VALUES sans écriture, fonction volatile ni date('now')"""
+    if not _READ_STATEMENT.match(sql):
+        return False
+    text = _QUOTED.sub("''", sql)
+    return not _WRITE.search(text) and not _VOLATILE.search(text) and not _NOW.search(sql)
+
+
+def estimate_size(rows: Sequence[tuple]) -> int:
+    """Taille mémoire approximative (octets) d'une liste de tuples, extrapolée depuis un échantillon"""
+    size = sys.getsizeof(rows)
+    if not rows:
+        return size
+    sample = rows[:SIZE_SAMPLE]
+    sampled = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sample)
+    return size + sampled * len(rows) // len(sample)
+
+
+def _freeze(params) -> Any:
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params or ())
+
+
+class PendingResult(NamedTuple):
+    """Lecture en cours : clé, tables dont elle dépend et générations au moment de la lecture"""
+    key: Tuple[str, Any]
+    tables: Tuple[str, ...]
+    generations: Tuple[int, ...]
+    epoch: int
+
+
+class ResultCache:
+    """
+    Cache LRU des résultats de lecture, borné en mémoire (`max_bytes`) et partagé par CRUDOperator
+    et QueryExecutor. Clé : SQL normalisé + paramètres. Chaque entrée dépend des tables lues
+    (et des tables parentes de leurs clés étrangères, pour les suppressions en cascade) ;
+    une écriture sur une table invalide les entrées qui en dépendent. Les écritures d'autres
+    connexions sont détectées par PRAGMA data_version, relu au plus toutes les `validate_interval` secondes.
+    Seules les requêtes SELECT déterministes sur des tables ordinaires (ou des vues sur celles-ci)
+    sont mises en cache ; les tables lues sont déterminées une fois par texte SQL via EXPLAIN.
+    """
+
+    def __init__(self, connector, max_bytes: int = 32 << 20, max_entry_bytes: Optional[int] = None,
+                 validate_interval: float = 1.0, enabled: bool = True):
+        self.connector = connector
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 4
+        self.validate_interval = validate_interval
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, Any], Tuple[List[str], List[tuple], int, Tuple[str, ...]]]" = OrderedDict()
+        self._by_table: Dict[str, set] = defaultdict(set)
+        self._generations: Dict[str, int] = defaultdict(int)
+        # Tables lues par chaque texte SQL normalisé (None : non cacheable), vidé à chaque DDL
+        self._dependency_cache: Dict[str, Optional[Tuple[str, ...]]] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._data_version = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.uncacheable = 0
+
+    def _check_external_writes(self) -> None:
+        """
+        Vide le cache si une autre connexion a validé une écriture depuis la dernière vérification.
+        Ne bloque jamais : si un autre thread écrit, la vérification est reportée à la lecture suivante.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.validate_interval:
+            return
+        data_version = self.connector.data_version(wait=False)
+        if data_version is None:
+            return
+        self._checked_at = now
+        if self._data_version is not None and data_version != self._data_version:
+            logging.info("Écriture d'une autre connexion détectée, cache de résultats vidé.")
+            self.invalidate()
+        self._data_version = data_version
+
+    def get(self, sql: str, params=()) -> Optional[List[Dict[str, Any]]]:
+        """Résultat en cache (liste de dicts neuve à chaque appel) ou None"""
+        if not self.enabled:
+            return None
+        self._check_external_writes()
+        key = (normalize_sql(sql), _freeze(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        columns, rows = entry[0], entry[1]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def begin(self, sql: str, params=()) -> Optional[PendingResult]:
+        """
+        À appeler avant d'exécuter une lecture manquée : retourne le jeton à passer à put(),
+        ou None si la requête ne peut pas être mise en cache.
+        """
+        if not self.enabled:
+            return None
+        normalized = normalize_sql(sql)
+        with self._lock:
+            epoch = self._epoch
+        tables = self._dependencies(normalized, sql, params) if is_cacheable(sql) else None
+        if not tables:
+            self.uncacheable += 1
+            return None
+        with self._lock:
+            return PendingResult((normalized, _freeze(params)), tables,
+                                 tuple(self._generations[table] for table in tables), epoch)
+
+    def _dependencies(self, normalized: str, sql: str, params) -> Optional[Tuple[str, ...]]:
+        if normalized in self._dependency_cache:
+            return self._dependency_cache[normalized]
+        try:
+            with self.connector.read_cursor() as cursor:
+                names = referenced_tables(cursor, sql, params)
+        except Exception as e:
+            logging.debug(f"Dépendances indéterminées pour {sql}: {e}")
+            return None
+        tables = None
+        if names:
+            catalog = self.connector.get_catalog_cache()
+            tables = set(names)
+            for name in names:
+                table = catalog.table(name)
+                # Tables parentes des clés étrangères : une suppression en cascade y modifie la table lue
+                tables.update(table.references if table else ())
+            tables = tuple(sorted(tables))
+        self._dependency_cache[normalized] = tables
+        return tables
+
+    def put(self, pending: Optional[PendingResult], columns: Sequence[str], rows: Iterable[tuple]) -> bool:
+        """Mémorise le résultat, sauf si une écriture sur ses tables a eu lieu depuis begin()"""
+        if pending is None:
+            return False
+        rows = [tuple(row) for row in rows]
+        size = estimate_size(rows)
+        if size > self.max_entry_bytes:
+            return False
+        with self._lock:
+            if pending.epoch != self._epoch or any(
+                    self._generations[table] != generation
+                    for table, generation in zip(pending.tables, pending.generations)):
+                return False
+            self._discard(pending.key)
+            self._entries[pending.key] = (list(columns), rows, size, pending.tables)
+            self._bytes += size
+            for table in pending.tables:
+                self._by_table[table].add(pending.key)
+            while self._bytes > self.max_bytes and self._entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _discard(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[2]
+        for table in entry[3]:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Oublie les résultats qui dépendent de la table (de toutes les tables si None). Une table
+        portant des triggers peut écrire ailleurs : tout le cache est alors invalidé.
+        Dans une transaction encore ouverte (unit_of_work), l'invalidation est répétée à sa fin :
+        un résultat lu entre-temps sur l'état validé précédent ne survit pas au commit.
+        """
+        if self.connector.in_transaction():
+            self.connector.after_transaction(lambda: self._invalidate(table_name))
+        self._invalidate(table_name)
+
+    def _invalidate(self, table_name: Optional[str]) -> None:
+        if table_name is not None:
+            # « main.items » et « items » : mêmes entrées (les bases attachées ne sont jamais en cache)
+            table_name = qualified_name(table_name)
+            table = self.connector.get_catalog_cache().table(table_name)
+            if table is not None and table.has_triggers:
+                table_name = None
+        with self._lock:
+            self.invalidations += 1
+            if table_name is None:
+                self._epoch += 1
+                self._dependency_cache.clear()
+                self._entries.clear()
+                self._by_table.clear()
+                self._bytes = 0
+                return
+            self._generations[table_name] += 1
+            for key in list(self._by_table.get(table_name, ())):
+                self._discard(key)
+
+    def version(self, table_name: str) -> Tuple[int, int]:
+        """(époque, génération de la table) : change à chaque invalidation de la table ou du cache entier"""
+        with self._lock:
+            return self._epoch, self._generations[qualified_name(table_name)]
+
+    def invalidate_schema(self, table_name: Optional[str] = None) -> None:
+        """Invalidation après un DDL ou une resynchronisation des métadonnées : la table touchée et le catalogue système"""
+        self._dependency_cache.clear()
+        for name in ((table_name,) if table_name else ()) + CATALOG_TABLES:
+            self.invalidate(name)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "uncacheable": self.uncacheable,
+        }
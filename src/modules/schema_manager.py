@@ -1,11 +1,106 @@
+import logging
+import re
 import sqlite3
+from contextlib import contextmanager
 from .database_connector import DatabaseConnector
+from .partitioning import (
+    CREATE_PARTITIONS_TABLE, PARTITIONS_SCHEMA_VERSION, Partition,
+    partition_name, range_bounds, sql_literal, view_sql,
+)
+
+# Versions de SQLite apportant ALTER TABLE ... RENAME COLUMN et DROP COLUMN
+NATIVE_RENAME_COLUMN = (3, 25, 0)
+NATIVE_DROP_COLUMN = (3, 35, 0)
+
+
+def _split_definitions(body):
+    """Découpe le corps d'un CREATE TABLE sur les virgules de premier niveau (hors parenthèses et guillemets)"""
+    parts, depth, quote, current = [], 0, None, []
+    for char in body:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"`[":
+            quote = ']' if char == '[' else char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+
+def _rename_identifiers(sql, rename):
+    """Renomme les colonnes nues ou qualifiées par new. / old. (triggers), sans toucher aux autres tables"""
+    for old, new in rename.items():
+        sql = re.sub(rf"(?:(?<=\bnew\.)|(?<=\bold\.)|(?<![\w.'\"])){re.escape(old)}(?![\w'\"])",
+                     new, sql, flags=re.IGNORECASE)
+    return sql
+
+
+def _references(sql, columns):
+    return any(re.search(rf"(?<![\w'\"]){re.escape(column)}(?![\w'\"])", sql) for column in columns)
+
+
+_TABLE_CONSTRAINT = re.compile(r"^(CONSTRAINT|PRIMARY\s+KEY|UNIQUE|CHECK|FOREIGN\s+KEY)\b", re.IGNORECASE)
+
+
+def _rewrite_create_table(create_sql, table_name, new_table, rename, drop, retype):
+    """
+    Produit le CREATE TABLE de la table reconstruite à partir de la définition d'origine :
+    colonnes renommées, supprimées ou retypées, contraintes de table conservées
+    (sauf celles qui portent sur une colonne supprimée).
+    """
+    start, end = create_sql.index('('), create_sql.rindex(')')
+    definitions = []
+    for definition in _split_definitions(create_sql[start + 1:end]):
+        if _TABLE_CONSTRAINT.match(definition):
+            if drop and _references(definition, drop):
+                continue
+            definitions.append(_rename_identifiers(definition, rename))
+            continue
+        match = re.match(r"([\"`\[]?)(\w+)[\"`\]]?\s*(.*)", definition, re.DOTALL)
+        name, rest = match.group(2), match.group(3)
+        if name in drop:
+            continue
+        if name in retype:
+            # Le type est la suite de mots (et éventuels paramètres) avant la première contrainte de colonne
+            rest = re.sub(r"^(?!(?:CONSTRAINT|PRIMARY|NOT|NULL|UNIQUE|CHECK|DEFAULT|COLLATE|REFERENCES|GENERATED|AS)\b)"
+                          r"[\w\s]*?(?:\([^)]*\))?(?=\s*(?:CONSTRAINT|PRIMARY|NOT|NULL|UNIQUE|CHECK|DEFAULT|COLLATE"
+                          r"|REFERENCES|GENERATED|AS)\b|$)", retype[name], rest, count=1, flags=re.IGNORECASE).strip()
+        definitions.append(f"{rename.get(name, name)} {_rename_identifiers(rest, rename)}".strip())
+    return f"CREATE TABLE {new_table} ({', '.join(definitions)}){create_sql[end + 1:]}"
 
 class SchemaManager:
     def __init__(self, db_path):
         """Initialisation avec connexion à la base de données"""
         self.connector = DatabaseConnector(db_path)
         self.connector.connect()
+        self.catalog = self.connector.get_catalog_cache()
+        self.result_cache = self.connector.get_result_cache()
+
+    @contextmanager
+    def _ddl(self, *table_names):
+        """
+        Transaction de DDL : le catalogue et les résultats en cache des tables touchées
+        (de toutes si aucune) sont invalidés à la sortie
+        """
+        try:
+            with self.connector.transaction() as cursor:
+                yield cursor
+        finally:
+            for table_name in table_names or (None,):
+                self.catalog.invalidate(table_name)
+            if table_names:
+                for table_name in table_names:
+                    self.result_cache.invalidate_schema(table_name)
+            else:
+                self.result_cache.invalidate()
 
     def create_table(self, table_name, columns, constraints=None):
         """
@@ -22,7 +117,7 @@ class SchemaManager:
                 columns_def += ", " + ", ".join(constraints)
             query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_def})"
             
-            with self.connector.transaction() as cursor:
+            with self._ddl(table_name) as cursor:
                 cursor.execute(query)
                 # Ajout des métadonnées dans sys_tables
                 cursor.execute("""
@@ -30,79 +125,40 @@ class SchemaManager:
                     VALUES (?, ?, ?)
                 """, (table_name, 'USER', f"Table created with {len(columns)} columns"))
                 
-                table_id = cursor.lastrowid
-                
-                # Récupération des informations complètes sur les colonnes
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                table_info = cursor.fetchall()
-                
-                # Ajout de toutes les colonnes dans sys_columns
-                for col_info in table_info:
+                # Colonnes et index (y compris ceux des contraintes UNIQUE / PRIMARY KEY) depuis SQLite
+                self._sync_catalog(cursor, table_name)
+                cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
+                table_id = cursor.fetchone()[0]
+
+                # Gestion des contraintes de table
+                for position, constraint in enumerate(constraints or (), start=1):
+                    constraint_upper = constraint.upper()
+                    if "PRIMARY KEY" in constraint_upper:
+                        constraint_type = "PRIMARY KEY"
+                    elif "FOREIGN KEY" in constraint_upper:
+                        constraint_type = "FOREIGN KEY"
+                    elif "UNIQUE" in constraint_upper:
+                        constraint_type = "UNIQUE"
+                    else:
+                        constraint_type = "CHECK" if "CHECK" in constraint_upper else "NOT NULL"
+                    referenced_table = referenced_column = None
+                    if constraint_type == "FOREIGN KEY":
+                        reference = re.search(r"REFERENCES\s+(\w+)\s*(?:\(\s*(\w+))?", constraint, re.IGNORECASE)
+                        if reference:
+                            referenced_table, referenced_column = reference.groups()
+                    column = re.search(r"\(\s*(\w+)", constraint)
                     cursor.execute("""
-                        INSERT INTO sys_columns (
-                            table_id, column_name, data_type, 
-                            is_nullable, ordinal_position, is_system,
-                            default_value, max_length, is_identity,
-                            is_computed, is_hidden
+                        INSERT INTO sys_constraints (
+                            table_id, constraint_name, constraint_type, column_name,
+                            referenced_table, referenced_column, check_clause
                         )
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
                     """, (
-                        table_id, col_info[1], col_info[2],
-                        1 if col_info[3] == 0 else 0, col_info[0] + 1,
-                        0, col_info[4], None, 0, 0, 0
+                        table_id, f"constraint_{table_name}_{constraint_type.lower().replace(' ', '_')}_{position}",
+                        constraint_type, column.group(1) if column else "",
+                        referenced_table, referenced_column, constraint if constraint_type == "CHECK" else None
                     ))
-                
-                # Gestion des index et contraintes
-                if constraints:
-                    for constraint in constraints:
-                        constraint_upper = constraint.upper()
-                        if "PRIMARY KEY" in constraint_upper:
-                            constraint_type = "PRIMARY KEY"
-                            # Création d'un index automatique pour la clé primaire
-                            index_name = f"pk_{table_name}"
-                            cursor.execute("""
-                                INSERT INTO sys_indexes (
-                                    table_id, index_name, is_unique, 
-                                    is_primary, index_type, columns
-                                )
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (table_id, index_name, 1, 1, "BTREE", constraint))
-                        elif "FOREIGN KEY" in constraint_upper:
-                            constraint_type = "FOREIGN KEY"
-                            # Extraction des informations de la clé étrangère
-                            fk_info = constraint.split("REFERENCES")
-                            referenced_table = fk_info[1].strip().split("(")[0].strip()
-                            cursor.execute("""
-                                INSERT INTO sys_indexes (
-                                    table_id, index_name, is_unique, 
-                                    is_primary, index_type, columns
-                                )
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (table_id, f"fk_{table_name}", 0, 0, "BTREE", constraint))
-                        elif "UNIQUE" in constraint_upper:
-                            constraint_type = "UNIQUE"
-                            cursor.execute("""
-                                INSERT INTO sys_indexes (
-                                    table_id, index_name, is_unique, 
-                                    is_primary, index_type, columns
-                                )
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """, (table_id, f"uk_{table_name}", 1, 0, "BTREE", constraint))
-                        else:
-                            constraint_type = "CHECK" if "CHECK" in constraint_upper else "NOT NULL"
-                            
-                        cursor.execute("""
-                            INSERT INTO sys_constraints (
-                                table_id, constraint_name, constraint_type,
-                                constraint_definition, is_enabled, is_system_generated,
-                                referenced_table_id, referenced_columns
-                            )
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            table_id, f"constraint_{table_name}_{constraint_type.lower()}",
-                            constraint_type, constraint, 1, 0, None, None
-                        ))
-                
+
                 cursor.execute("""
                     INSERT INTO sys_logs (operation_type, table_name, status, details)
                     VALUES (?, ?, ?, ?)
@@ -115,7 +171,7 @@ class SchemaManager:
 
     def rename_table(self, old_name, new_name):
         """Renomme une table"""
-        with self.connector.transaction() as cursor:
+        with self._ddl(old_name, new_name) as cursor:
             cursor.execute(f"ALTER TABLE {old_name} RENAME TO {new_name}")
             cursor.execute("UPDATE sys_tables SET table_name = ?, updated_at = CURRENT_TIMESTAMP WHERE table_name = ?",
                          (new_name, old_name))
@@ -131,118 +187,387 @@ class SchemaManager:
 
     def add_column(self, table_name, column_name, column_type):
         """Ajoute une colonne à une table existante"""
-        with self.connector.transaction() as cursor:
+        with self._ddl(table_name) as cursor:
             cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
-            cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
-            table_id = cursor.fetchone()[0]
-            
-            # Récupération des informations de la nouvelle colonne
+            self._sync_catalog(cursor, table_name)
+            cursor.execute("""
+                INSERT INTO sys_logs (operation_type, table_name, details)
+                VALUES (?, ?, ?)
+            """, ("ADD_COLUMN", table_name, f"Added column {column_name}"))
+
+    def rename_column(self, table_name, old_column, new_column, batch_size=5000, progress=None):
+        """
+        Renomme une colonne avec ALTER TABLE ... RENAME COLUMN (SQLite >= 3.25), qui conserve
+        index, contraintes et triggers ; sinon reconstruction de la table par lots.
+        """
+        if sqlite3.sqlite_version_info >= NATIVE_RENAME_COLUMN:
+            with self._ddl(table_name) as cursor:
+                cursor.execute(f"ALTER TABLE {table_name} RENAME COLUMN {old_column} TO {new_column}")
+                self._sync_catalog(cursor, table_name)
+                self._log(cursor, "RENAME_COLUMN", table_name, f"Renamed column {old_column} to {new_column}")
+            return
+        self.rebuild_table(table_name, rename={old_column: new_column}, batch_size=batch_size, progress=progress)
+
+    def drop_column(self, table_name, column_name, batch_size=5000, progress=None):
+        """
+        Supprime une colonne avec ALTER TABLE ... DROP COLUMN (SQLite >= 3.35). SQLite refuse
+        ce chemin pour une colonne indexée, clé ou contrainte : la table est alors reconstruite par lots.
+        """
+        if sqlite3.sqlite_version_info >= NATIVE_DROP_COLUMN:
+            try:
+                with self._ddl(table_name) as cursor:
+                    cursor.execute(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
+                    self._sync_catalog(cursor, table_name)
+                    self._log(cursor, "DROP_COLUMN", table_name, f"Dropped column {column_name}")
+                return
+            except sqlite3.OperationalError as e:
+                logging.info(f"DROP COLUMN natif impossible sur {table_name}.{column_name} ({e}), reconstruction.")
+        self.rebuild_table(table_name, drop=[column_name], batch_size=batch_size, progress=progress)
+
+    def alter_column_type(self, table_name, column_name, new_type, batch_size=5000, progress=None):
+        """Change le type d'une colonne (SQLite n'a pas d'ALTER COLUMN) par reconstruction de la table"""
+        self.rebuild_table(table_name, retype={column_name: new_type}, batch_size=batch_size, progress=progress)
+
+    def rebuild_table(self, table_name, rename=None, drop=None, retype=None, batch_size=5000, progress=None):
+        """
+        Reconstruit la table avec les colonnes renommées, supprimées ou retypées, sans la verrouiller
+        pendant toute la copie :
+        - la nouvelle table reprend la définition d'origine (contraintes comprises), modifiée colonne par colonne ;
+        - des triggers répercutent sur la nouvelle table les écritures faites pendant la copie ;
+        - les lignes sont copiées par lots de `batch_size` (une transaction par lot, rowid conservé),
+          les lecteurs et les autres écrivains passent entre deux lots ;
+        - la bascule finale (DROP, RENAME, recréation des index et triggers) se fait en une transaction.
+        progress(lignes_copiées, total) est appelé après chaque lot. Retourne le nombre de lignes copiées.
+        """
+        rename, drop, retype = dict(rename or {}), set(drop or ()), dict(retype or {})
+        new_table = f"{table_name}__rebuild"
+        sync_prefix = f"{new_table}_sync"
+
+        with self._ddl(table_name, new_table) as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Table inconnue : {table_name}")
+            create_sql = row[0]
+            if re.search(r"\)\s*WITHOUT\s+ROWID\s*$", create_sql, re.IGNORECASE):
+                raise ValueError(f"Reconstruction en ligne impossible pour la table WITHOUT ROWID {table_name}")
             cursor.execute(f"PRAGMA table_info({table_name})")
-            col_info = [col for col in cursor.fetchall() if col[1] == column_name][0]
-            
+            old_columns = [col[1] for col in cursor.fetchall()]
+            unknown = (set(rename) | drop | set(retype)) - set(old_columns)
+            if unknown:
+                raise ValueError(f"Colonne(s) inconnue(s) dans {table_name} : {', '.join(sorted(unknown))}")
+            cursor.execute("""
+                SELECT type, name, sql FROM sqlite_master
+                WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL
+            """, (table_name,))
+            dependents = [dependent for dependent in cursor.fetchall() if not dependent[1].startswith(sync_prefix)]
+
+            kept = [col for col in old_columns if col not in drop]
+            new_columns = [rename.get(col, col) for col in kept]
+            cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+            cursor.execute(_rewrite_create_table(create_sql, table_name, new_table, rename, drop, retype))
+
+            # Capture des écritures concurrentes, indexée par rowid
+            target = f"{new_table} (rowid, {', '.join(new_columns)})"
+            cursor.execute(f"""
+                CREATE TRIGGER {sync_prefix}_ai AFTER INSERT ON {table_name} BEGIN
+                    INSERT OR REPLACE INTO {target} VALUES (new.rowid, {', '.join(f'new.{c}' for c in kept)});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {sync_prefix}_au AFTER UPDATE ON {table_name} BEGIN
+                    DELETE FROM {new_table} WHERE rowid = old.rowid;
+                    INSERT OR REPLACE INTO {target} VALUES (new.rowid, {', '.join(f'new.{c}' for c in kept)});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {sync_prefix}_ad AFTER DELETE ON {table_name} BEGIN
+                    DELETE FROM {new_table} WHERE rowid = old.rowid;
+                END
+            """)
+            cursor.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table_name}")
+            total, max_rowid = cursor.fetchone()
+
+        copied = 0
+        last_rowid = None
+        copy_sql = (f"INSERT OR IGNORE INTO {target} "
+                    f"SELECT rowid, {', '.join(kept)} FROM {table_name} "
+                    f"WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?")
+        try:
+            while max_rowid is not None:
+                with self.connector.transaction() as cursor:
+                    cursor.execute(f"""
+                        SELECT MAX(rowid) FROM (
+                            SELECT rowid FROM {table_name} WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?
+                        )
+                    """, (last_rowid if last_rowid is not None else -2 ** 63, max_rowid, batch_size))
+                    batch_end = cursor.fetchone()[0]
+                    if batch_end is None:
+                        break
+                    cursor.execute(copy_sql, (last_rowid if last_rowid is not None else -2 ** 63, batch_end, batch_size))
+                    copied += cursor.rowcount
+                last_rowid = batch_end
+                if progress:
+                    progress(min(copied, total), total)
+
+            with self._ddl(table_name, new_table) as cursor:
+                cursor.execute("PRAGMA legacy_alter_table = ON")
+                try:
+                    for suffix in ("ai", "au", "ad"):
+                        cursor.execute(f"DROP TRIGGER IF EXISTS {sync_prefix}_{suffix}")
+                    cursor.execute(f"DROP TABLE {table_name}")
+                    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table_name}")
+                    for kind, name, sql in dependents:
+                        sql = _rename_identifiers(sql, rename)
+                        if drop and _references(sql, drop):
+                            logging.warning(f"{kind} {name} supprimé : il référence une colonne supprimée.")
+                            continue
+                        cursor.execute(sql)
+                finally:
+                    cursor.execute("PRAGMA legacy_alter_table = OFF")
+                self._sync_catalog(cursor, table_name)
+                changes = [f"renamed {old} to {new}" for old, new in rename.items()]
+                changes += [f"dropped {col}" for col in sorted(drop)]
+                changes += [f"retyped {col} as {new_type}" for col, new_type in retype.items()]
+                self._log(cursor, "REBUILD_TABLE", table_name, f"Rebuilt in batches ({copied} rows): {', '.join(changes)}")
+        except Exception:
+            with self._ddl(table_name, new_table) as cursor:
+                for suffix in ("ai", "au", "ad"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {sync_prefix}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+            raise
+        logging.info(f"Table {table_name} reconstruite : {copied} lignes copiées par lots de {batch_size}.")
+        return copied
+
+    def _sync_catalog(self, cursor, table_name):
+        """Réaligne sys_columns et sys_indexes sur la définition réelle de la table"""
+        cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
+        row = cursor.fetchone()
+        if row is None:
+            return
+        table_id = row[0]
+        cursor.execute("UPDATE sys_tables SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (table_id,))
+        cursor.execute("DELETE FROM sys_columns WHERE table_id = ?", (table_id,))
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        for col_info in cursor.fetchall():
             cursor.execute("""
                 INSERT INTO sys_columns (
-                    table_id, column_name, data_type, is_nullable,
-                    ordinal_position, is_system, default_value,
-                    max_length, is_identity, is_computed, is_hidden
+                    table_id, column_name, data_type,
+                    is_nullable, column_default,
+                    ordinal_position, is_primary_key
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
-                table_id, column_name, column_type, 1,
-                col_info[0] + 1, 0, None, None, 0, 0, 0
+                table_id, col_info[1], col_info[2],
+                1 if col_info[3] == 0 else 0, col_info[4],
+                col_info[0] + 1, 1 if col_info[5] else 0
             ))
-            
+        cursor.execute("DELETE FROM sys_indexes WHERE table_id = ?", (table_id,))
+        cursor.execute(f"PRAGMA index_list({table_name})")
+        for index in cursor.fetchall():
+            cursor.execute(f"PRAGMA index_info({index[1]})")
+            for index_column in cursor.fetchall():
+                cursor.execute("""
+                    INSERT INTO sys_indexes (table_id, index_name, column_name, is_unique, is_primary)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (table_id, index[1], index_column[2], 1 if index[2] else 0, 1 if index[3] == 'pk' else 0))
+
+    def _log(self, cursor, operation_type, table_name, details):
+        cursor.execute("""
+            INSERT INTO sys_logs (operation_type, table_name, details)
+            VALUES (?, ?, ?)
+        """, (operation_type, table_name, details))
+
+    def create_index(self, table_name, columns, index_name=None, unique=False):
+        """
+        Crée un index (composite si plusieurs colonnes) et l'enregistre dans sys_indexes.
+        columns : liste de colonnes dans l'ordre de la clé. Retourne le nom de l'index.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        index_name = index_name or f"idx_{table_name}_{'_'.join(columns)}"
+        with self._ddl(table_name) as cursor:
+            cursor.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} "
+                f"ON {table_name} ({', '.join(columns)})"
+            )
+            cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
+            table = cursor.fetchone()
+            if table:
+                cursor.execute("DELETE FROM sys_indexes WHERE table_id = ? AND index_name = ?", (table[0], index_name))
+                cursor.executemany("""
+                    INSERT INTO sys_indexes (table_id, index_name, column_name, is_unique, is_primary)
+                    VALUES (?, ?, ?, ?, 0)
+                """, [(table[0], index_name, column, 1 if unique else 0) for column in columns])
             cursor.execute("""
                 INSERT INTO sys_logs (operation_type, table_name, details)
                 VALUES (?, ?, ?)
-            """, ("ADD_COLUMN", table_name, f"Added column {column_name}"))
+            """, ("CREATE_INDEX", table_name, f"Created index {index_name} ({', '.join(columns)})"))
+        return index_name
 
-    def rename_column(self, table_name, old_column, new_column):
-        """Renomme une colonne"""
-        with self.connector.transaction() as cursor:
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns_info = cursor.fetchall()
-            
-            new_columns = []
-            for col in columns_info:
-                col_name, col_type = col[1], col[2]
-                if col_name == old_column:
-                    new_columns.append(f"{new_column} {col_type}")
-                else:
-                    new_columns.append(f"{col_name} {col_type}")
-
-            new_table_sql = f"""
-                CREATE TABLE {table_name}_new ({", ".join(new_columns)});
-                INSERT INTO {table_name}_new SELECT * FROM {table_name};
-                DROP TABLE {table_name};
-                ALTER TABLE {table_name}_new RENAME TO {table_name};
-            """
-            cursor.executescript(new_table_sql)
-            
-            cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
-            table_id = cursor.fetchone()[0]
-            
-            # Mise à jour de sys_columns
-            cursor.execute("""
-                UPDATE sys_columns 
-                SET column_name = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE table_id = ? AND column_name = ?
-            """, (new_column, table_id, old_column))
-            
-            # Mise à jour des index et contraintes qui référencent cette colonne
-            cursor.execute("""
-                UPDATE sys_indexes 
-                SET columns = replace(columns, ?, ?),
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE table_id = ? AND columns LIKE ?
-            """, (old_column, new_column, table_id, f"%{old_column}%"))
-            
-            cursor.execute("""
-                UPDATE sys_constraints 
-                SET constraint_definition = replace(constraint_definition, ?, ?),
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE table_id = ? AND constraint_definition LIKE ?
-            """, (old_column, new_column, table_id, f"%{old_column}%"))
-            
+    def drop_index(self, index_name):
+        """Supprime un index et ses métadonnées"""
+        with self._ddl() as cursor:
+            cursor.execute("SELECT tbl_name FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,))
+            row = cursor.fetchone()
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            cursor.execute("DELETE FROM sys_indexes WHERE index_name = ?", (index_name,))
             cursor.execute("""
                 INSERT INTO sys_logs (operation_type, table_name, details)
                 VALUES (?, ?, ?)
-            """, ("RENAME_COLUMN", table_name, f"Renamed column {old_column} to {new_column}"))
+            """, ("DROP_INDEX", row[0] if row else "", f"Dropped index {index_name}"))
 
     def list_tables(self):
         """Retourne la liste des tables de la base de données"""
-        with self.connector.transaction() as cursor:
-            cursor.execute("SELECT table_name FROM sys_tables")
-            return [table[0] for table in cursor.fetchall()]
+        return self.catalog.table_names(None)
 
     def validate_schema(self, table_name):
-        """Vérifie la structure d'une table"""
-        with self.connector.transaction() as cursor:
-            cursor.execute("""
-                SELECT c.column_name, c.data_type, c.is_nullable,
-                       c.is_system, c.default_value, c.max_length,
-                       c.is_identity, c.is_computed, c.is_hidden
-                FROM sys_tables t
-                JOIN sys_columns c ON t.id = c.table_id
-                WHERE t.table_name = ?
-                ORDER BY c.ordinal_position
-            """, (table_name,))
-            return cursor.fetchall()
+        """Vérifie la structure d'une table : lignes de PRAGMA table_info (cid, nom, type, notnull, défaut, pk)"""
+        table = self.catalog.table(table_name)
+        return list(table.column_info) if table else []
 
     def check_foreign_keys(self):
         """Vérifie si les clés étrangères sont activées"""
-        with self.connector.transaction() as cursor:
+        with self.connector.transaction(mode="DEFERRED") as cursor:
             cursor.execute("PRAGMA foreign_keys")
             return cursor.fetchone()[0] == 1
 
     def enable_foreign_keys(self):
         """Active les clés étrangères si elles ne le sont pas"""
-        with self.connector.transaction() as cursor:
+        # Sans effet dans une transaction ouverte : pas de BEGIN explicite
+        with self.connector.transaction(mode="AUTO") as cursor:
             cursor.execute("PRAGMA foreign_keys = ON")
 
+    def create_partitioned_table(self, table_name, columns, partition_key, scheme, constraints=None):
+        """
+        Crée une table partitionnée par intervalles de `partition_key` : une table enfant par
+        intervalle [borne basse, borne haute[ (avec CHECK et index sur la clé) et une vue
+        UNION ALL `table_name` pour la lecture. CRUDOperator route les insertions vers la bonne
+        partition et ne lit que les partitions compatibles avec les bornes des conditions.
+        scheme : voir partitioning.range_bounds (liste de bornes ou {"interval", "start", "count"}).
+        Les contraintes d'unicité (dont la clé primaire) ne valent qu'au sein d'une partition.
+        Retourne les noms des partitions.
+        """
+        if not isinstance(columns, dict):
+            raise ValueError("columns must be a dictionary")
+        if partition_key not in columns:
+            raise ValueError(f"La clé de partitionnement {partition_key} n'est pas une colonne de {table_name}")
+        bounds = range_bounds(scheme)
+        definitions = [f"{col} {dtype}" for col, dtype in columns.items()] + list(constraints or ())
+        self.connector.ensure_schema('partitioning', PARTITIONS_SCHEMA_VERSION,
+                                     lambda cursor: cursor.execute(CREATE_PARTITIONS_TABLE))
+        partitions = [Partition(partition_name(table_name, lower), lower, upper) for lower, upper in bounds]
+        with self._ddl(table_name) as cursor:
+            for partition in partitions:
+                self._create_partition(cursor, table_name, partition_key, definitions, partition)
+            cursor.execute(view_sql(table_name, partitions))
+            cursor.execute("""
+                INSERT INTO sys_tables (table_name, table_type, description)
+                VALUES (?, ?, ?)
+            """, (table_name, 'USER', f"Partitioned by range of {partition_key} ({len(partitions)} partitions)"))
+            self._sync_catalog(cursor, table_name)
+            self._log(cursor, "CREATE_PARTITIONED_TABLE", table_name,
+                      f"Created {len(partitions)} partitions on {partition_key}")
+        return [partition.name for partition in partitions]
+
+    def _create_partition(self, cursor, table_name, partition_key, definitions, partition):
+        check = (f"CHECK ({partition_key} >= {sql_literal(partition.lower)} "
+                 f"AND {partition_key} < {sql_literal(partition.upper)})")
+        cursor.execute(f"CREATE TABLE {partition.name} ({', '.join(definitions + [check])})")
+        cursor.execute(f"CREATE INDEX idx_{partition.name}_{partition_key} ON {partition.name} ({partition_key})")
+        cursor.execute("""
+            INSERT INTO sys_partitions (table_name, partition_name, partition_key, lower_bound, upper_bound)
+            VALUES (?, ?, ?, ?, ?)
+        """, (table_name, partition.name, partition_key, partition.lower, partition.upper))
+
+    def _partition_layout(self, cursor, table_name):
+        layout = self.catalog.partition_layout(table_name, cursor)
+        if layout is None:
+            raise ValueError(f"{table_name} n'est pas une table partitionnée")
+        return layout
+
+    def _replace_view(self, cursor, table_name, partitions):
+        cursor.execute(f"DROP VIEW IF EXISTS {table_name}")
+        cursor.execute(view_sql(table_name, partitions))
+
+    def list_partitions(self, table_name):
+        """Partitions d'une table partitionnée, par borne croissante : [(nom, borne basse, borne haute)]"""
+        layout = self.catalog.partition_layout(table_name)
+        return [tuple(partition) for partition in layout.partitions] if layout else []
+
+    def add_partition(self, table_name, lower, upper):
+        """Ajoute une partition [lower, upper[ (sans chevauchement) avec la structure des partitions existantes"""
+        (lower, upper), = range_bounds([lower, upper])
+        with self._ddl(table_name) as cursor:
+            layout = self._partition_layout(cursor, table_name)
+            for existing in layout.partitions:
+                if lower < existing.upper and existing.lower < upper:
+                    raise ValueError(f"L'intervalle chevauche la partition {existing.name}")
+            # Structure reprise d'une partition existante, sans sa contrainte d'intervalle (toujours en dernier)
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                           (layout.partitions[0].name,))
+            create_sql = cursor.fetchone()[0]
+            definitions = _split_definitions(create_sql[create_sql.index('(') + 1:create_sql.rindex(')')])[:-1]
+            partition = Partition(partition_name(table_name, lower), lower, upper)
+            self._create_partition(cursor, table_name, layout.key, definitions, partition)
+            self._replace_view(cursor, table_name, sorted(layout.partitions + (partition,), key=lambda p: p.lower))
+            self._log(cursor, "ADD_PARTITION", table_name, f"Added partition {partition.name}")
+        return partition.name
+
+    def detach_partition(self, table_name, partition):
+        """
+        Retire une partition de la table partitionnée sans toucher à ses lignes (ex: archivage) :
+        elle devient une table ordinaire. Coût indépendant du volume de données.
+        """
+        with self._ddl(table_name, partition) as cursor:
+            remaining = self._remove_partition(cursor, table_name, partition)
+            cursor.execute("""
+                INSERT INTO sys_tables (table_name, table_type, description)
+                VALUES (?, 'USER', ?)
+            """, (partition, f"Detached partition of {table_name}"))
+            self._sync_catalog(cursor, partition)
+            self._log(cursor, "DETACH_PARTITION", table_name,
+                      f"Detached partition {partition} ({len(remaining)} remaining)")
+
+    def drop_partition(self, table_name, partition):
+        """Supprime une partition et ses lignes (rétention) : DROP TABLE, sans DELETE ligne à ligne"""
+        with self._ddl(table_name, partition) as cursor:
+            remaining = self._remove_partition(cursor, table_name, partition)
+            cursor.execute(f"DROP TABLE {partition}")
+            self._log(cursor, "DROP_PARTITION", table_name,
+                      f"Dropped partition {partition} ({len(remaining)} remaining)")
+
+    def _remove_partition(self, cursor, table_name, partition):
+        layout = self._partition_layout(cursor, table_name)
+        remaining = [existing for existing in layout.partitions if existing.name != partition]
+        if len(remaining) == len(layout.partitions):
+            raise ValueError(f"{partition} n'est pas une partition de {table_name}")
+        if not remaining:
+            raise ValueError(f"Impossible de retirer la dernière partition de {table_name} (utiliser drop_table)")
+        self._replace_view(cursor, table_name, remaining)
+        cursor.execute("DELETE FROM sys_partitions WHERE partition_name = ?", (partition,))
+        return remaining
+
     def drop_table(self, table_name):
-        """Supprime une table de la base de données"""
-        with self.connector.transaction() as cursor:
+        """Supprime une table de la base de données (et toutes ses partitions si elle est partitionnée)"""
+        layout = self.catalog.partition_layout(table_name)
+        if layout is not None:
+            with self._ddl(table_name, *(partition.name for partition in layout.partitions)) as cursor:
+                cursor.execute(f"DROP VIEW IF EXISTS {table_name}")
+                for partition in layout.partitions:
+                    cursor.execute(f"DROP TABLE IF EXISTS {partition.name}")
+                cursor.execute("DELETE FROM sys_partitions WHERE table_name = ?", (table_name,))
+                cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
+                row = cursor.fetchone()
+                if row:
+                    cursor.execute("DELETE FROM sys_columns WHERE table_id = ?", (row[0],))
+                    cursor.execute("DELETE FROM sys_indexes WHERE table_id = ?", (row[0],))
+                    cursor.execute("DELETE FROM sys_constraints WHERE table_id = ?", (row[0],))
+                    cursor.execute("DELETE FROM sys_tables WHERE id = ?", (row[0],))
+                self._log(cursor, "DROP_TABLE", table_name,
+                          f"Partitioned table and its {len(layout.partitions)} partitions dropped")
+            return
+        with self._ddl(table_name) as cursor:
             # Récupération de l'ID de la table
             cursor.execute("SELECT id FROM sys_tables WHERE table_name = ?", (table_name,))
             table_id = cursor.fetchone()[0]
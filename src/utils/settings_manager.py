@@ -10,6 +10,9 @@ class SettingsManager:
             "user_profile": {
                 "name": "root",
                 "email": "root@example.com"
+            },
+            "database": {
+                "profile": "balanced"
             }
         }
         self.load_settings()
@@ -27,6 +30,10 @@ class SettingsManager:
         else:
             self.settings = self.default_settings
 
+    def get_database_profile(self):
+        """Return the connection profile: a profile name or a dict of PRAGMA overrides."""
+        return self.settings.get("database", {}).get("profile", self.default_settings["database"]["profile"])
+
     def reset_settings(self):
         """Reset settings to default values."""
         self.settings = self.default_settings
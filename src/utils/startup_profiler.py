@@ -0,0 +1,50 @@
+import importlib
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Collects import and initialization timings per component during application startup."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.records = []
+        self.started = time.perf_counter()
+        self.reported = False
+
+    @contextmanager
+    def measure(self, phase, component):
+        """Time the enclosed block as `component` of `phase` ('import', 'init' or 'lazy')."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.records.append((phase, component, seconds))
+            # Tabs built after the startup report are printed as they load
+            if self.reported:
+                print(f"{phase:<7} {component} {seconds * 1000:.1f} ms")
+
+    def import_module(self, name):
+        """Import and time a module; dependencies already loaded by an earlier component are not counted again."""
+        with self.measure("import", name):
+            return importlib.import_module(name)
+
+    def report(self):
+        """Return the recorded timings as an aligned text table, slowest component first within each phase."""
+        self.reported = True
+        width = max([len(component) for _, component, _ in self.records] + [len('(since startup)')])
+        lines = [f"{'phase':<7} {'component':<{width}} {'ms':>9}"]
+        for phase in ("import", "init", "lazy"):
+            records = sorted((r for r in self.records if r[0] == phase), key=lambda r: r[2], reverse=True)
+            for _, component, seconds in records:
+                lines.append(f"{phase:<7} {component:<{width}} {seconds * 1000:>9.1f}")
+        lines.append(f"{'total':<7} {'(since startup)':<{width}} {(time.perf_counter() - self.started) * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+# Shared by main.py and MainWindow; enabled with --profile-startup
+startup_profiler = StartupProfiler()
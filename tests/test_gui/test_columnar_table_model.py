@@ -0,0 +1,99 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5 import QtCore
+from src.gui.widgets.columnar_table_model import ColumnarTableModel
+
+
+@pytest.fixture
+def model(qapp):
+    return ColumnarTableModel()
+
+
+def test_data_roles(model):
+    """Display, alignment, check state and raw values per column"""
+    model.set_headers(["id", "name", "active"])
+    model.append_rows([(1, "a", True), (2.5, None, False)])
+    assert model.rowCount() == 2 and model.columnCount() == 3
+    assert model.headerData(1, QtCore.Qt.Horizontal) == "name"
+    assert model.headerData(0, QtCore.Qt.Vertical) == 1
+    assert model.data(model.index(0, 0)) == 1
+    assert model.data(model.index(1, 1)) == ""
+    assert model.data(model.index(1, 2)) == "False"
+    assert model.data(model.index(0, 2), QtCore.Qt.CheckStateRole) == QtCore.Qt.Checked
+    assert model.data(model.index(1, 0), QtCore.Qt.TextAlignmentRole) == QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+    assert model.data(model.index(1, 1), QtCore.Qt.UserRole) is None
+    assert model.row(1) == (2.5, None, False)
+
+
+def test_iterator_source_fetches_on_demand(model, qtmodeltester):
+    """Only the batches asked for through fetchMore are pulled; the iterator is closed at the end"""
+    pulled = []
+
+    def batches():
+        for start in range(0, 6, 2):
+            pulled.append(start)
+            yield [(value, str(value)) for value in range(start, start + 2)]
+
+    source = batches()
+    model.set_source(["id", "name"], source)
+    assert model.rowCount() == 2 and pulled == [0]
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 4 and pulled == [0, 2]
+    qtmodeltester.check(model)
+    model.fetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 6
+    assert not model.canFetchMore() and not model.has_more()
+    assert model.data(model.index(5, 1)) == "5"
+
+
+def test_clear_closes_iterator_source(model):
+    closed = []
+
+    def batches():
+        try:
+            while True:
+                yield [(1,)]
+        finally:
+            closed.append(True)
+
+    model.set_source(["id"], batches())
+    model.clear()
+    assert closed == [True]
+    assert model.rowCount() == 0 and not model.canFetchMore()
+
+
+def test_fetcher_requests_one_batch_at_a_time(model, qtmodeltester):
+    """An asynchronous fetch is requested once, then the delivered rows are appended"""
+    requests = []
+    model.set_fetcher(["id"], lambda position, deliver: requests.append((position, deliver)),
+                      [(1,), (2,)], ('rowid', 2))
+    assert model.rowCount() == 2 and model.canFetchMore()
+    model.fetchMore()
+    model.fetchMore()
+    assert [position for position, _ in requests] == [('rowid', 2)]
+    assert not model.canFetchMore() and model.has_more()
+
+    requests[0][1]([(3,), (4,)], ('rowid', 4))
+    assert model.rowCount() == 4 and model.canFetchMore()
+    model.fetchMore()
+    requests[1][1]([(5,)], None)
+    assert model.rowCount() == 5
+    assert not model.canFetchMore() and not model.has_more()
+    assert model.data(model.index(4, 0)) == 5
+    qtmodeltester.check(model)
+
+
+def test_fetcher_ignores_batches_for_previous_source(model):
+    """A batch delivered after the model was reset is dropped"""
+    requests = []
+    model.set_fetcher(["id"], lambda position, deliver: requests.append(deliver), [(1,)], ('offset', 1))
+    model.fetchMore()
+    model.set_fetcher(["name"], lambda position, deliver: None, [("x",)], None)
+    requests[0]([(2,)], None)
+    assert model.rowCount() == 1 and model.data(model.index(0, 0)) == "x"
+    assert not model.canFetchMore()
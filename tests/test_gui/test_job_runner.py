@@ -0,0 +1,68 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sqlite3
+import threading
+
+import pytest
+from src.gui.job_runner import JobRunner
+from src.modules.database_connector import DatabaseConnector
+
+
+@pytest.fixture
+def runner(qapp):
+    DatabaseConnector._instance = None
+    connector = DatabaseConnector(":memory:")
+    jobs = JobRunner(connector)
+    yield jobs
+    jobs.cancel_all()
+    jobs.wait_for_done()
+    connector.close_connection()
+    DatabaseConnector._instance = None
+
+
+def _outcomes(runner, func):
+    outcomes = []
+    job_id = runner.submit(func,
+                           on_success=lambda result: outcomes.append(("finished", result)),
+                           on_error=lambda error: outcomes.append(("failed", error)),
+                           on_cancel=lambda: outcomes.append(("cancelled", None)))
+    return job_id, outcomes
+
+
+def test_cancel_after_work_completed_still_reports_result(runner, qtbot):
+    """A job whose work already ran (and committed) is reported as finished, not cancelled"""
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        return "committed"
+
+    job_id, outcomes = _outcomes(runner, work)
+    assert started.wait(5)
+    runner.cancel(job_id)
+    release.set()
+    qtbot.waitUntil(lambda: bool(outcomes), timeout=5000)
+    assert outcomes == [("finished", "committed")]
+
+
+def test_interrupted_statement_is_cancelled(runner, qtbot):
+    """Only an interrupted statement is reported as a cancellation"""
+    def work():
+        raise sqlite3.OperationalError("interrupted")
+
+    _, outcomes = _outcomes(runner, work)
+    qtbot.waitUntil(lambda: bool(outcomes), timeout=5000)
+    assert outcomes == [("cancelled", None)]
+
+
+def test_other_errors_are_failures(runner, qtbot):
+    """A database error that is not an interruption is reported as a failure"""
+    def work():
+        raise sqlite3.OperationalError("no such table: missing")
+
+    _, outcomes = _outcomes(runner, work)
+    qtbot.waitUntil(lambda: bool(outcomes), timeout=5000)
+    assert outcomes[0][0] == "failed"
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from src.modules.audit_logger import AuditLogWriter
+from src.modules.crud_operator import CRUDOperator
+from src.modules.database_connector import DatabaseConnector
+
+
+class TestAuditLogWriter(unittest.TestCase):
+
+    def setUp(self):
+        """Initialisation d'une base en mémoire avec les tables système"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        self.connector = self.crud.connector
+
+    def tearDown(self):
+        """Fermeture de la connexion après chaque test"""
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def _log_count(self):
+        with self.connector.transaction() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM sys_logs")
+            return cursor.fetchone()[0]
+
+    def test_batched_flush(self):
+        """Les entrées sont écrites par lots lors du flush"""
+        writer = AuditLogWriter(self.connector, batch_size=50, max_latency=10)
+        for i in range(120):
+            writer.log("SELECT", "items", message=str(i))
+        writer.flush()
+        self.assertEqual(self._log_count(), 120)
+        stats = writer.stats()
+        self.assertEqual(stats["written"], 120)
+        self.assertEqual(stats["batches"], 3)
+        writer.close()
+
+    def test_close_flushes_pending(self):
+        """close() écrit de façon synchrone les entrées en attente"""
+        writer = AuditLogWriter(self.connector, max_latency=10)
+        writer.log("INSERT", "items")
+        writer.close()
+        self.assertEqual(self._log_count(), 1)
+        with self.assertRaises(RuntimeError):
+            writer.log("INSERT", "items")
+
+    def test_drop_policy(self):
+        """La politique 'drop' ignore les entrées quand la file est pleine"""
+        writer = AuditLogWriter(self.connector, max_queue=1, policy='drop', max_latency=10)
+        # Bloquer l'écrivain sur la connexion pour saturer la file
+        with self.connector.transaction():
+            for _ in range(10):
+                writer.log("SELECT", "items")
+            self.assertGreater(writer.stats()["dropped"], 0)
+        writer.close()
+
+    def test_read_does_not_commit_log_synchronously(self):
+        """Une lecture CRUD n'écrit plus sys_logs dans sa propre transaction"""
+        self.crud.flush_logs()
+        before = self._log_count()
+        self.crud.read("sys_tables")
+        self.crud.flush_logs()
+        self.assertEqual(self._log_count(), before + 1)
+
+    def test_rolled_back_work_is_not_logged(self):
+        """Seules les opérations validées sont journalisées en SUCCESS"""
+        with self.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        self.crud.flush_logs()
+        before = self._log_count()
+        with self.assertRaises(RuntimeError):
+            with self.crud.unit_of_work():
+                self.crud.create("items", {"name": "a"})
+                raise RuntimeError("abandon")
+        with self.crud.unit_of_work():
+            self.crud.create("items", {"name": "b"})
+        self.crud.flush_logs()
+        self.assertEqual(self._log_count(), before + 1)
+
+    def test_failed_batch_falls_back_to_application_log(self):
+        """Un lot impossible à écrire est reporté dans le journal applicatif"""
+        writer = AuditLogWriter(self.connector, max_latency=10)
+        with self.connector.transaction() as cursor:
+            cursor.execute("DROP TABLE sys_logs")
+        with self.assertLogs(level='WARNING') as captured:
+            writer.log("INSERT", "items", message="perdu ?")
+            writer.flush()
+        self.assertEqual(writer.stats()["fallback"], 1)
+        self.assertTrue(any("perdu ?" in line for line in captured.output))
+        writer.close()
+
+    def test_invalid_policy(self):
+        """Une politique inconnue est refusée"""
+        with self.assertRaises(ValueError):
+            AuditLogWriter(self.connector, policy='fifo')
+
+
+
+class TestAuditLogUnderContention(unittest.TestCase):
+
+    def setUp(self):
+        """Base fichier avec un délai d'attente du pool très court"""
+        DatabaseConnector._instance = None
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, "audit.db")
+        self.connector = DatabaseConnector(db_path, pool_timeout=0.5)
+        self.crud = CRUDOperator(db_path)
+        self.connector.configure_audit_log(max_queue=50, batch_size=10)
+        with self.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        self.crud.flush_logs()
+
+    def tearDown(self):
+        """Fermeture de la connexion et suppression de la base"""
+        self.crud.close()
+        DatabaseConnector._instance = None
+        self.tmp_dir.cleanup()
+
+    def test_long_unit_of_work_loses_nothing(self):
+        """L'écrivain attend la fin d'une longue transaction au lieu d'abandonner ses lots"""
+        writer = self.connector.get_audit_writer()
+        base = writer.stats()["written"]
+        other = threading.Thread(target=lambda: [writer.log("SELECT", "items", message=str(i)) for i in range(20)])
+        started = time.perf_counter()
+        with self.crud.unit_of_work():
+            other.start()
+            for i in range(80):
+                self.crud.create("items", {"name": f"item{i}"})
+            time.sleep(1.0)
+        other.join()
+        self.crud.flush_logs()
+        self.assertLess(time.perf_counter() - started, 5)
+        stats = writer.stats()
+        self.assertEqual(stats["written"] - base, 100)
+        self.assertEqual((stats["errors"], stats["fallback"]), (0, 0))
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM sys_logs WHERE operation_type = 'INSERT' AND table_name = 'items'")
+            self.assertEqual(cursor.fetchone()[0], 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.crud_operator import CRUDOperator
+from src.modules.query_executor import QueryExecutor
+from src.modules.schema_manager import SchemaManager
+
+
+class TestCatalogCache(unittest.TestCase):
+
+    def setUp(self):
+        """Catalogue partagé sur une base en mémoire contenant une table indexée"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        self.manager = SchemaManager(":memory:")
+        self.executor = QueryExecutor(":memory:")
+        self.manager.create_table("items", {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "price": "REAL"})
+        self.manager.create_index("items", ["name"])
+        self.catalog = self.crud.connector.get_catalog_cache()
+        self.statements = []
+
+    def tearDown(self):
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def test_lookups_are_cached(self):
+        """Après le premier chargement, les recherches n'exécutent plus aucune requête"""
+        table = self.catalog.table("items")
+        self.assertEqual(table.columns, ["id", "name", "price"])
+        self.assertEqual(table.rowid_column, "id")
+        self.assertEqual([index.columns for index in table.indexes], [("name",)])
+        self.assertIsNotNone(table.table_id)
+        self.manager.list_tables()
+        self.crud.create("items", {"name": "a", "price": 1.0})
+
+        self.crud.connector.get_connection().set_trace_callback(self.statements.append)
+        self.assertEqual(self.executor.get_table_columns("items"), ["id", "name", "price"])
+        self.assertEqual(self.catalog.column_types("items")["price"], "REAL")
+        self.assertIn("items", self.manager.list_tables())
+        self.crud.create("items", {"name": "b", "price": 2.0})
+        self.crud.create("items", {"name": "c", "price": 3.0})
+        self.assertFalse([sql for sql in self.statements if "sys_tables" in sql or "PRAGMA table_info" in sql])
+        self.assertGreater(self.catalog.stats()["hits"], 0)
+
+    def test_ddl_invalidates(self):
+        """Les DDL de SchemaManager et de QueryExecutor sont visibles immédiatement"""
+        self.assertEqual(self.catalog.columns("items"), ["id", "name", "price"])
+        self.manager.add_column("items", "stock", "INTEGER")
+        self.assertEqual(self.catalog.columns("items"), ["id", "name", "price", "stock"])
+        self.manager.rename_column("items", "stock", "quantity")
+        self.assertEqual([col[1] for col in self.manager.validate_schema("items")], ["id", "name", "price", "quantity"])
+        self.executor.execute_query("CREATE INDEX idx_items_price ON items(price)")
+        self.assertIn("idx_items_price", [index.name for index in self.catalog.indexes("items")])
+        self.executor.execute_query("DROP INDEX idx_items_price")
+        self.assertNotIn("idx_items_price", [index.name for index in self.catalog.indexes("items")])
+        self.manager.drop_table("items")
+        self.assertIsNone(self.catalog.table("items"))
+        self.assertNotIn("items", self.catalog.table_names())
+
+
+class TestCatalogCacheExternalWriter(unittest.TestCase):
+
+    def setUp(self):
+        DatabaseConnector._instance = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "catalog.db")
+        self.crud = CRUDOperator(self.db_path)
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        self.catalog = self.crud.connector.get_catalog_cache()
+
+    def tearDown(self):
+        self.crud.close()
+        DatabaseConnector._instance = None
+        self.directory.cleanup()
+
+    def test_schema_version_change_from_other_connection(self):
+        """Un DDL d'une autre connexion vide le cache à la revalidation suivante"""
+        self.assertEqual(self.catalog.columns("items"), ["id", "name"])
+        other = sqlite3.connect(self.db_path)
+        other.execute("ALTER TABLE items ADD COLUMN price REAL")
+        other.commit()
+        other.close()
+        self.assertEqual(self.catalog.columns("items"), ["id", "name"])
+        self.catalog.validate_interval = 0
+        self.assertEqual(self.catalog.columns("items"), ["id", "name", "price"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.crud_operator import CRUDOperator
+
+
+class TestCRUDOperator(unittest.TestCase):
+
+    def setUp(self):
+        """Initialisation d'une base en mémoire avec une table utilisateur"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        self.statements = []
+
+    def tearDown(self):
+        """Fermeture de la connexion après chaque test"""
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def _trace(self):
+        self.statements.clear()
+        self.crud.connector.get_connection().set_trace_callback(self.statements.append)
+
+    def _column_names(self, table_name):
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("""
+                SELECT c.column_name FROM sys_columns c
+                JOIN sys_tables t ON t.id = c.table_id
+                WHERE t.table_name = ?
+                ORDER BY c.ordinal_position
+            """, (table_name,))
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_create_and_read(self):
+        """Insertion puis lecture d'un enregistrement"""
+        inserted_id = self.crud.create("items", {"name": "a"})
+        self.assertEqual(self.crud.read("items", "WHERE id = ?", (inserted_id,)), [{"id": inserted_id, "name": "a"}])
+        self.assertEqual(self._column_names("items"), ["id", "name"])
+
+    def test_data_write_skips_metadata_rebuild(self):
+        """Une écriture de données ne reconstruit plus les métadonnées"""
+        self.crud.create("items", {"name": "a"})
+        self._trace()
+        self.crud.create("items", {"name": "b"})
+        self.crud.update("items", {"name": "c"}, "id = ?", (2,))
+        self.crud.delete("items", "id = ?", (1,))
+        catalog = [sql for sql in self.statements if "sys_columns" in sql or "table_info" in sql or "sqlite_master" in sql]
+        self.assertEqual(catalog, [])
+
+    def test_ddl_triggers_metadata_rebuild(self):
+        """Un DDL sur la table déclenche la reconstruction à l'écriture suivante"""
+        self.crud.create("items", {"name": "a"})
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("ALTER TABLE items ADD COLUMN price REAL")
+        self.crud.create("items", {"name": "b", "price": 1.5})
+        self.assertEqual(self._column_names("items"), ["id", "name", "price"])
+
+    def test_unrelated_ddl_keeps_metadata(self):
+        """Un DDL sur une autre table ne reconstruit pas les métadonnées"""
+        self.crud.create("items", {"name": "a"})
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE other (id INTEGER)")
+        self._trace()
+        self.crud.create("items", {"name": "b"})
+        self.assertFalse(any("DELETE FROM sys_columns" in sql for sql in self.statements))
+
+    def test_unit_of_work_commits_once(self):
+        """Plusieurs appels CRUD dans unit_of_work() ne valident qu'une fois"""
+        self.crud.create("items", {"name": "a"})
+        self._trace()
+        with self.crud.unit_of_work():
+            self.crud.create("items", {"name": "b"})
+            self.crud.update("items", {"name": "c"}, "id = ?", (1,))
+            self.crud.delete("items", "id = ?", (2,))
+        self.assertEqual([sql for sql in self.statements if sql == "COMMIT"], ["COMMIT"])
+        self.assertEqual(self.crud.read("items"), [{"id": 1, "name": "c"}])
+
+    def test_unit_of_work_rolls_back_everything(self):
+        """Une exception dans unit_of_work() annule toutes les opérations du bloc"""
+        self.crud.create("items", {"name": "a"})
+        with self.assertRaises(ValueError):
+            with self.crud.unit_of_work():
+                self.crud.create("items", {"name": "b"})
+                self.crud.update("items", {"name": "c"}, "id = ?", (1,))
+                raise ValueError("échec")
+        self.assertEqual(self.crud.read("items"), [{"id": 1, "name": "a"}])
+
+    def test_failed_operation_in_unit_of_work_keeps_others(self):
+        """Une opération en échec n'annule que son SAVEPOINT si l'appelant l'intercepte"""
+        with self.crud.unit_of_work():
+            self.crud.create("items", {"name": "a"})
+            with self.assertRaises(Exception):
+                self.crud.create("items", {"missing": "b"})
+        self.assertEqual(self.crud.read("items"), [{"id": 1, "name": "a"}])
+
+    def test_create_many_dicts(self):
+        """Insertion en masse de dicts par lots, une entrée sys_logs par lot"""
+        rows = ({"name": f"item{i}"} for i in range(25))
+        first, last = self.crud.create_many("items", rows, batch_size=10)
+        self.assertEqual((first, last), (1, 25))
+        self.assertEqual(self.crud.last_bulk_stats["batches"], 3)
+        self.crud.flush_logs()
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM items")
+            self.assertEqual(cursor.fetchone()[0], 25)
+            cursor.execute("SELECT COUNT(*) FROM sys_logs WHERE operation_type = 'BULK_INSERT'")
+            self.assertEqual(cursor.fetchone()[0], 3)
+
+    def test_create_many_tuples(self):
+        """Insertion en masse de tuples, avec ou sans liste de colonnes"""
+        self.assertEqual(self.crud.create_many("items", [(None, "a"), (None, "b")]), (1, 2))
+        self.assertEqual(self.crud.create_many("items", [("c",)], columns=["name"]), (3, 3))
+        self.assertEqual(self.crud.create_many("items", []), (None, None))
+
+    def test_search_index_ranking_and_prefix(self):
+        """L'index FTS5 couvre les lignes existantes et suit les écritures via les triggers"""
+        self.crud.create_many("items", [("red apple",), ("green apple pie",), ("banana",)], columns=["name"])
+        self.assertEqual(self.crud.enable_search("items"), ["name"])
+        self.assertTrue(self.crud.search_enabled("items"))
+
+        results = self.crud.search("items", "app")
+        self.assertEqual({row["name"] for row in results}, {"red apple", "green apple pie"})
+        self.assertTrue(all("_rank" in row for row in results))
+        self.assertEqual([row["name"] for row in self.crud.search("items", "apple red")], ["red apple"])
+
+        self.crud.update("items", {"name": "cherry"}, "name = ?", ("banana",))
+        self.crud.delete("items", "name = ?", ("red apple",))
+        self.crud.create("items", {"name": "cherry tart"})
+        self.assertEqual(self.crud.search("items", "banana"), [])
+        self.assertEqual(len(self.crud.search("items", "cher")), 2)
+        self.assertEqual(len(self.crud.search("items", "apple")), 1)
+        self.assertEqual(self.crud.search("items", "  \"*  "), [])
+
+        self.crud.disable_search("items")
+        self.assertFalse(self.crud.search_enabled("items"))
+
+    def test_read_batch_walks_table(self):
+        """Lots successifs par rowid (table) ou par décalage (vue), jusqu'à la position None"""
+        self.crud.create_many("items", [(f"item{i}",) for i in range(7)], columns=["name"])
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("CREATE VIEW items_view AS SELECT name FROM items")
+        for table_name, columns in (("items", ["id", "name"]), ("items_view", ["name"])):
+            names, position = [], None
+            while True:
+                batch_columns, rows, position = self.crud.read_batch(table_name, position, limit=3)
+                self.assertEqual(batch_columns, columns)
+                names += [row[-1] for row in rows]
+                if position is None:
+                    break
+            self.assertEqual(names, [f"item{i}" for i in range(7)])
+
+
+if __name__ == '__main__':
+    unittest.main()
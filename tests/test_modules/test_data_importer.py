@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.data_importer import DataImporter, infer_column_types, record_boundary
+
+
+class TestDataImporter(unittest.TestCase):
+
+    def setUp(self):
+        """Base en mémoire et petits blocs pour forcer plusieurs transactions"""
+        DatabaseConnector._instance = None
+        self.importer = DataImporter(":memory:", chunk_size=1024, workers=0)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Fermeture de la connexion et suppression des fichiers temporaires"""
+        self.importer.close()
+        self.tmp.cleanup()
+        DatabaseConnector._instance = None
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(content)
+        return path
+
+    def _rows(self, query):
+        with self.importer.connector.transaction() as cursor:
+            cursor.execute(query)
+            return cursor.fetchall()
+
+    def _csv(self, count=200):
+        lines = ["id,name,price"]
+        lines += [f'{i},"item ""{i}"",\nline",{i * 0.5}' for i in range(count)]
+        return self._write("items.csv", "\n".join(lines) + "\n")
+
+    def test_record_boundary_respects_quotes(self):
+        """La fin d'enregistrement ignore les sauts de ligne entre guillemets"""
+        data = b'1,"a\nb"\n2,"c\n'
+        self.assertEqual(record_boundary(data, 'csv'), 8)
+        self.assertEqual(record_boundary(b'{"a": 1}\n{"a"', 'jsonl'), 9)
+
+    def test_infer_column_types(self):
+        """Types déduits de l'échantillon : INTEGER, REAL, sinon TEXT"""
+        sample = [("1", "1.5", "x", ""), ("2", "3", "4", "")]
+        self.assertEqual(infer_column_types(sample, 4), ["INTEGER", "REAL", "TEXT", "TEXT"])
+
+    def test_import_csv_creates_typed_table(self):
+        """Import CSV : table créée avec les types déduits, point de reprise effacé à la fin"""
+        stats = self.importer.import_file(self._csv())
+        self.assertEqual(stats["rows"], 200)
+        columns = {row[1]: row[2] for row in self._rows("PRAGMA table_info(items)")}
+        self.assertEqual(columns, {"id": "INTEGER", "name": "TEXT", "price": "REAL"})
+        self.assertEqual(self._rows("SELECT name, price FROM items WHERE id = 7"), [('item "7",\nline', 3.5)])
+        self.assertEqual(self._rows("SELECT COUNT(*) FROM sys_import_checkpoints"), [(0,)])
+
+    def test_import_jsonl_and_tsv(self):
+        """Import JSON Lines et TSV, nom de table tiré du nom de fichier"""
+        jsonl = self._write("events.jsonl", "".join(json.dumps({"n": i, "tags": [i]}) + "\n" for i in range(50)))
+        tsv = self._write("pairs.tsv", "k\tv\n" + "".join(f"k{i}\t{i}\n" for i in range(50)))
+        self.assertEqual(self.importer.import_file(jsonl)["rows"], 50)
+        self.assertEqual(self.importer.import_file(tsv)["rows"], 50)
+        self.assertEqual(self._rows("SELECT tags FROM events WHERE n = 3"), [("[3]",)])
+        self.assertEqual(self._rows("SELECT SUM(v) FROM pairs"), [(1225,)])
+
+    def test_resume_after_interruption(self):
+        """Un import interrompu reprend après le dernier lot validé, sans doublon"""
+        path = self._csv()
+
+        def crash(stats):
+            raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.importer.import_file(path, progress=crash)
+        committed = self._rows("SELECT COUNT(*) FROM items")[0][0]
+        self.assertGreater(committed, 0)
+        self.assertLess(committed, 200)
+
+        stats = self.importer.import_file(path)
+        self.assertEqual(stats["resumed_from"], committed)
+        self.assertEqual(self._rows("SELECT COUNT(*), COUNT(DISTINCT id) FROM items"), [(200, 200)])
+
+    def test_worker_process_parsing(self):
+        """L'analyse des blocs dans un processus de travail (démarré par spawn) donne le même résultat"""
+        self.importer.workers = 1
+        self.assertEqual(self.importer.import_file(self._csv(100))["rows"], 100)
+        self.assertEqual(self._rows("SELECT COUNT(*) FROM items"), [(100,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.data_viewer import DataViewer, read_columnar
+
+
+class TestDataViewer(unittest.TestCase):
+
+    def setUp(self):
+        """Base en mémoire avec une table de 25 lignes et un dossier d'export temporaire"""
+        DatabaseConnector._instance = None
+        self.viewer = DataViewer(":memory:")
+        with self.viewer.crud_operator.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)")
+            cursor.executemany("INSERT INTO items (name, price) VALUES (?, ?)",
+                               [(f"item,{i}", i * 1.5) for i in range(25)])
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Fermeture de la connexion et suppression du dossier d'export"""
+        self.viewer.close()
+        self.tmp.cleanup()
+        DatabaseConnector._instance = None
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_export_csv_in_batches(self):
+        """Export CSV lot par lot avec progression, sans fichier .part résiduel"""
+        progress = []
+        path = self._path("items.csv")
+        written = self.viewer.export_data("items", path, batch_size=10, progress=progress.append)
+        self.assertEqual(written, 25)
+        self.assertEqual(progress, [10, 20, 25])
+        with open(path, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["id", "name", "price"])
+        self.assertEqual(rows[1], ["1", "item,0", "0.0"])
+        self.assertEqual(len(rows), 26)
+        self.assertFalse(os.path.exists(path + ".part"))
+
+    def test_export_jsonl_gzip(self):
+        """Export JSON Lines compressé, format et compression déduits de l'extension"""
+        path = self._path("items.jsonl.gz")
+        self.viewer.export_data("items", path, "WHERE id <= ?", (3,), batch_size=2)
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual([r["id"] for r in records], [1, 2, 3])
+        self.assertEqual(records[2]["price"], 3.0)
+
+    def test_export_columnar_roundtrip(self):
+        """Un fichier colonnaire se relit lot par lot"""
+        path = self._path("items.sgbdcol")
+        self.viewer.export_data("items", path, batch_size=10)
+        blocks = list(read_columnar(path))
+        self.assertEqual(len(blocks), 3)
+        columns, values = blocks[0]
+        self.assertEqual(columns, ["id", "name", "price"])
+        self.assertEqual(values[0], list(range(1, 11)))
+        self.assertEqual(sum(len(v[0]) for _, v in blocks), 25)
+
+    def test_export_empty_result_writes_nothing(self):
+        """Aucun fichier n'est créé quand il n'y a rien à exporter"""
+        path = self._path("empty.csv")
+        self.assertEqual(self.viewer.export_data("items", path, "WHERE id < 0"), 0)
+        self.assertFalse(os.path.exists(path))
+
+    def test_export_columnar_value_types(self):
+        """NULL, texte, BLOB et grands entiers conservent leur valeur et leur type"""
+        with self.viewer.crud_operator.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE mixed (id INTEGER PRIMARY KEY, big INTEGER, label TEXT, payload BLOB, ratio)")
+            cursor.executemany("INSERT INTO mixed (big, label, payload, ratio) VALUES (?, ?, ?, ?)", [
+                (2 ** 62, "été", b"\x00\xff", 0.5),
+                (None, None, None, 3),
+                (-(2 ** 63), "", b"", "x"),
+            ])
+        path = self._path("mixed.col.gz")
+        self.viewer.export_data("mixed", path)
+        [(columns, values)] = list(read_columnar(path))
+        self.assertEqual(columns, ["id", "big", "label", "payload", "ratio"])
+        self.assertEqual(values[1], [2 ** 62, None, -(2 ** 63)])
+        self.assertEqual(values[2], ["été", None, ""])
+        self.assertEqual(values[3], [b"\x00\xff", None, b""])
+        self.assertEqual(values[4], [0.5, 3, "x"])
+        self.assertIsInstance(values[4][1], int)
+
+    def test_read_columnar_rejects_unknown_version(self):
+        """Un fichier d'une autre version du format est refusé"""
+        path = self._path("old.sgbdcol")
+        with open(path, 'wb') as file:
+            file.write(b"SGBDCOL1")
+        with self.assertRaises(ValueError):
+            list(read_columnar(path))
+
+    def test_unknown_format(self):
+        """Un format d'export inconnu est refusé"""
+        with self.assertRaises(ValueError):
+            self.viewer.export_data("items", self._path("x.csv"), export_format="xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,330 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.modules.database_connector import DatabaseConnector, PoolTimeoutError, is_busy_error, resolve_profile
+
+
+class TestDatabaseConnector(unittest.TestCase):
+
+    def setUp(self):
+        """Création d'une base fichier temporaire (le pool ne s'applique pas à :memory:)"""
+        DatabaseConnector._instance = None
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "test.db")
+        self.connector = DatabaseConnector(self.db_path, pool_size=2, pool_timeout=0.2)
+        self.connector.connect()
+        with self.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            cursor.execute("INSERT INTO items (name) VALUES ('a')")
+
+    def tearDown(self):
+        """Fermeture du pool et réinitialisation du singleton"""
+        self.connector.close_connection()
+        DatabaseConnector._instance = None
+        self.tmp_dir.cleanup()
+
+    def test_transaction_commits(self):
+        """La transaction conserve son contrat : commit à la sortie du bloc"""
+        with self.connector.transaction() as cursor:
+            cursor.execute("INSERT INTO items (name) VALUES ('b')")
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM items")
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_transaction_rollback(self):
+        """Une exception annule la transaction"""
+        with self.assertRaises(ValueError):
+            with self.connector.transaction() as cursor:
+                cursor.execute("INSERT INTO items (name) VALUES ('b')")
+                raise ValueError("échec")
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM items")
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_read_from_background_thread(self):
+        """Un thread de travail peut lire via sa propre connexion"""
+        results = []
+
+        def worker():
+            with self.connector.read_cursor() as cursor:
+                cursor.execute("SELECT name FROM items")
+                results.append(cursor.fetchone()[0])
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(results, ["a"])
+
+    def test_reader_is_read_only(self):
+        """Les connexions de lecture refusent les écritures"""
+        with self.connector.read_cursor() as cursor:
+            with self.assertRaises(Exception):
+                cursor.execute("INSERT INTO items (name) VALUES ('c')")
+
+    def test_checkout_timeout(self):
+        """Le pool lève PoolTimeoutError quand toutes les connexions sont prises"""
+        held = threading.Event()
+        release = threading.Event()
+
+        def holder():
+            with self.connector.read_cursor():
+                held.set()
+                release.wait()
+
+        threads = [threading.Thread(target=holder) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            held.wait()
+            held.clear()
+        try:
+            with self.assertRaises(PoolTimeoutError):
+                with self.connector.read_cursor():
+                    pass
+        finally:
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        stats = self.connector.pool_stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["readers_open"], 2)
+
+    def test_interleaved_streams_share_reader_until_last_closes(self):
+        """Deux lectures en flux d'un même thread : la connexion reste réservée jusqu'à la fin de la dernière"""
+        with self.connector.transaction() as cursor:
+            cursor.executemany("INSERT INTO items (name) VALUES (?)", [(str(i),) for i in range(10)])
+
+        def stream():
+            with self.connector.read_cursor() as cursor:
+                cursor.execute("SELECT name FROM items")
+                while True:
+                    rows = cursor.fetchmany(2)
+                    if not rows:
+                        break
+                    yield cursor.connection, rows
+
+        first, second = stream(), stream()
+        shared, _ = next(first)
+        self.assertIs(next(second)[0], shared)
+        first.close()
+        self.assertEqual(self.connector.pool_stats()["in_use"], 1)
+
+        other = []
+
+        def worker():
+            with self.connector.read_cursor() as cursor:
+                other.append(cursor.connection)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], shared)
+        self.assertEqual(sum(len(rows) for _, rows in second), 9)
+        self.assertEqual(self.connector.pool_stats()["in_use"], 0)
+
+    def test_default_profile_enables_wal(self):
+        """Le profil par défaut active le journal WAL"""
+        with self.connector.transaction() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_set_profile(self):
+        """Le changement de profil s'applique à la connexion d'écriture"""
+        self.connector.set_profile("durable")
+        with self.connector.transaction() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 2)  # FULL
+
+    def test_resolve_profile_overrides(self):
+        """Un profil peut surcharger un profil de base"""
+        pragmas = resolve_profile({"base": "bulk-load", "busy_timeout": 100})
+        self.assertEqual(pragmas["synchronous"], "OFF")
+        self.assertEqual(pragmas["busy_timeout"], 100)
+        with self.assertRaises(ValueError):
+            resolve_profile("inconnu")
+        with self.assertRaises(ValueError):
+            resolve_profile({"page_size": 4096})
+
+    def test_nested_transaction_uses_savepoint(self):
+        """Un bloc imbriqué en échec n'annule que ses propres écritures"""
+        with self.connector.transaction() as cursor:
+            cursor.execute("INSERT INTO items (name) VALUES ('b')")
+            with self.assertRaises(ValueError):
+                with self.connector.transaction() as inner:
+                    inner.execute("INSERT INTO items (name) VALUES ('c')")
+                    raise ValueError("échec")
+            with self.connector.transaction() as inner:
+                inner.execute("INSERT INTO items (name) VALUES ('d')")
+            # Rien n'est encore visible des autres connexions
+            with self.connector.read_cursor() as reader:
+                reader.execute("SELECT COUNT(*) FROM items")
+                self.assertEqual(reader.fetchone()[0], 1)
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT name FROM items ORDER BY id")
+            self.assertEqual([row[0] for row in cursor.fetchall()], ["a", "b", "d"])
+
+    def test_after_transaction_runs_at_outermost_end(self):
+        """Les rappels de fin de transaction attendent le bloc le plus externe"""
+        calls = []
+        with self.connector.unit_of_work():
+            with self.connector.transaction():
+                self.connector.after_transaction(lambda: calls.append(1))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [1])
+        self.assertFalse(self.connector.in_transaction())
+
+    def test_after_commit_skips_rolled_back_work(self):
+        """Un rappel on_commit n'est pas exécuté si son SAVEPOINT ou la transaction est annulé"""
+        calls = []
+        with self.connector.unit_of_work():
+            with self.assertRaises(ValueError):
+                with self.connector.transaction():
+                    self.connector.after_transaction(lambda: calls.append("annulé"), on_commit=True)
+                    self.connector.after_transaction(lambda: calls.append("toujours"))
+                    raise ValueError("savepoint")
+            self.connector.after_transaction(lambda: calls.append("validé"), on_commit=True)
+        with self.assertRaises(ValueError):
+            with self.connector.transaction():
+                self.connector.after_transaction(lambda: calls.append("annulé"), on_commit=True)
+                raise ValueError("transaction")
+        self.assertEqual(calls, ["toujours", "validé"])
+
+    def test_ensure_schema_runs_once(self):
+        """Le DDL système n'est exécuté qu'une fois par version, y compris après réouverture"""
+        calls = []
+
+        def create(cursor):
+            calls.append(1)
+            cursor.execute("CREATE TABLE IF NOT EXISTS sys_demo (id INTEGER PRIMARY KEY)")
+
+        self.assertTrue(self.connector.ensure_schema("demo", 1, create))
+        self.assertFalse(self.connector.ensure_schema("demo", 1, create))
+        self.connector.close_connection()
+        self.connector.connect()
+        self.assertFalse(self.connector.ensure_schema("demo", 1, create))
+        self.assertEqual(len(calls), 1)
+        # Nouvelle version : le DDL est rejoué
+        self.assertTrue(self.connector.ensure_schema("demo", 2, create))
+        self.assertEqual(len(calls), 2)
+
+    def test_modules_bootstrap_system_tables_once(self):
+        """Instancier plusieurs modules ne duplique pas les métadonnées des tables système"""
+        from src.modules.crud_operator import CRUDOperator
+        from src.modules.query_executor import QueryExecutor
+        CRUDOperator(self.db_path)
+        QueryExecutor(self.db_path)
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM sys_columns")
+            columns = cursor.fetchone()[0]
+        CRUDOperator(self.db_path)
+        QueryExecutor(self.db_path)
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM sys_columns")
+            self.assertEqual(cursor.fetchone()[0], columns)
+
+    def test_is_busy_error(self):
+        """Seules les erreurs de verrou sont considérées comme rejouables"""
+        self.assertTrue(is_busy_error(PoolTimeoutError("pool")))
+        self.assertTrue(is_busy_error(sqlite3.OperationalError("database is locked")))
+        self.assertFalse(is_busy_error(sqlite3.OperationalError("no such table: x")))
+        self.assertFalse(is_busy_error(ValueError("database is locked")))
+
+    def test_lock_wait_recorded_per_operation(self):
+        """Chaque transaction alimente l'histogramme d'attente de son opération"""
+        with self.connector.transaction(operation="INSERT") as cursor:
+            cursor.execute("INSERT INTO items (name) VALUES ('b')")
+        stats = self.connector.lock_stats()["INSERT"]
+        self.assertEqual(stats["transactions"], 1)
+        self.assertEqual(sum(stats["wait_histogram"].values()), 1)
+        with self.assertRaises(ValueError):
+            with self.connector.transaction(mode="SHARED"):
+                pass
+
+    def test_retry_on_busy_database(self):
+        """Une écriture bloquée par une autre connexion est rejouée puis abandonnée ou réussie"""
+        self.connector.configure_busy_handling(busy_timeout_ms=10, retries=2, base_delay=0.01, max_delay=0.05)
+        other = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self.addCleanup(other.close)
+
+        def insert():
+            with self.connector.transaction() as cursor:
+                cursor.execute("INSERT INTO items (name) VALUES ('b')")
+
+        other.execute("BEGIN IMMEDIATE")
+        with self.assertRaises(sqlite3.OperationalError):
+            self.connector.retry("INSERT", insert)
+        stats = self.connector.lock_stats()["INSERT"]
+        self.assertEqual((stats["retries"], stats["busy_errors"], stats["gave_up"]), (2, 3, 1))
+
+        # Le verrou est libéré pendant les nouvelles tentatives
+        self.connector.configure_busy_handling(retries=20)
+        release = threading.Timer(0.05, lambda: other.execute("COMMIT"))
+        release.start()
+        self.connector.retry("INSERT", insert)
+        release.join()
+        stats = self.connector.lock_stats()["INSERT"]
+        self.assertEqual((stats["calls"], stats["gave_up"]), (2, 1))
+        self.assertGreater(stats["retries"], 2)
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM items")
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_registry_one_connector_per_path(self):
+        """Un connecteur par fichier : même instance pour un même chemin, distincte pour un autre"""
+        relative = os.path.relpath(self.db_path)
+        self.assertIs(DatabaseConnector(relative), self.connector)
+        self.assertIs(DatabaseConnector(), self.connector)
+        other = DatabaseConnector(os.path.join(self.tmp_dir.name, "other.db"))
+        self.addCleanup(other.close_connection)
+        self.assertIsNot(other, self.connector)
+        with other.transaction() as cursor:
+            cursor.execute("CREATE TABLE things (id INTEGER PRIMARY KEY)")
+        self.assertEqual(set(DatabaseConnector.instances()), {os.path.realpath(self.db_path), os.path.realpath(other.db_path)})
+        self.assertEqual(self.connector.get_catalog_cache().columns("things"), [])
+
+    def test_attach_cross_database_query(self):
+        """Une base attachée est visible en alias.table par l'écriture et par les lecteurs"""
+        archive_path = os.path.join(self.tmp_dir.name, "archive.db")
+        self.connector.attach("archive", archive_path)
+        with self.assertRaises(ValueError):
+            self.connector.attach("main", archive_path)
+        with self.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE archive.orders (id INTEGER PRIMARY KEY, item_id INTEGER, qty INTEGER)")
+            cursor.execute("CREATE INDEX archive.idx_orders_item ON orders (item_id)")
+            cursor.execute("INSERT INTO archive.orders (item_id, qty) VALUES (1, 3)")
+        results = []
+
+        def worker():
+            with self.connector.read_cursor() as cursor:
+                cursor.execute("SELECT i.name, o.qty FROM items i JOIN archive.orders o ON o.item_id = i.id")
+                results.extend(cursor.fetchall())
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [("a", 3)])
+        catalog = self.connector.get_catalog_cache()
+        self.assertEqual(catalog.columns("archive.orders"), ["id", "item_id", "qty"])
+        self.assertEqual([index.columns for index in catalog.indexes("archive.orders")], [("item_id",)])
+        self.assertEqual(catalog.columns("main.items"), catalog.columns("items"))
+        # Rattachée après une réouverture, puis détachée
+        self.connector.close_connection()
+        self.connector.connect()
+        with self.connector.read_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM archive.orders")
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.connector.detach("archive")
+        self.assertEqual(self.connector.attached(), {})
+        self.assertEqual(catalog.columns("archive.orders"), [])
+        with self.connector.read_cursor() as cursor:
+            with self.assertRaises(sqlite3.OperationalError):
+                cursor.execute("SELECT COUNT(*) FROM archive.orders")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.crud_operator import CRUDOperator
+from src.modules.index_advisor import parse_access_patterns
+from src.modules.query_executor import QueryExecutor
+from src.modules.schema_manager import SchemaManager
+
+
+class TestIndexAdvisor(unittest.TestCase):
+
+    def setUp(self):
+        """Base en mémoire avec une table de commandes de 2000 lignes"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        self.executor = QueryExecutor(":memory:")
+        self.schema = SchemaManager(":memory:")
+        self.advisor = self.crud.connector.get_index_advisor()
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER,
+                                     status TEXT, created_at TEXT, total REAL)
+            """)
+            cursor.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY, region TEXT)")
+        self.crud.create_many("orders", [(i % 200, "open" if i % 2 else "closed", f"2024-01-{i % 28 + 1:02d}", i)
+                                         for i in range(2000)],
+                              columns=["customer_id", "status", "created_at", "total"])
+        self.advisor.reset()
+
+    def tearDown(self):
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def test_parse_access_patterns(self):
+        refs = parse_access_patterns("WHERE a = ? AND b >= 'x' ORDER BY c DESC")
+        self.assertEqual(refs, ((None, "a", "eq"), (None, "b", "range"), (None, "c", "order")))
+        self.assertEqual(parse_access_patterns("name = ?"), ((None, "name", "eq"),))
+
+    def test_recommends_composite_index_and_applies_it(self):
+        for _ in range(3):
+            self.crud.read("orders", "WHERE customer_id = ? AND created_at > ? ORDER BY created_at", (5, "2024-01-10"))
+        recommendation = self.executor.recommend_indexes()[0]
+        self.assertEqual(recommendation["columns"], ["customer_id", "created_at"])
+        self.assertEqual(recommendation["executions"], 3)
+        self.assertEqual(recommendation["table_rows"], 2000)
+        self.assertLess(recommendation["estimated_rows_per_lookup"], 2000)
+        self.assertGreater(recommendation["estimated_rows_saved"], 0)
+
+        name = self.advisor.apply(recommendation, self.schema)
+        self.assertEqual(self.executor.recommend_indexes(), [])
+        plan = self.executor.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM orders WHERE customer_id = ? AND created_at > ?", (5, "x"))
+        self.assertIn(name, plan[0]["detail"])
+
+    def test_covering_index_for_query_with_joins(self):
+        self.executor.execute_query("SELECT status FROM orders WHERE customer_id = ?", (3,))
+        self.executor.execute_query(
+            "SELECT o.id FROM orders o JOIN customers c ON c.id = o.customer_id WHERE c.region = ?", ("eu",))
+        recommendations = {(r["table"], tuple(r["columns"])): r for r in self.executor.recommend_indexes(analyze=False)}
+        self.assertTrue(recommendations[("orders", ("customer_id", "status"))]["covering"])
+        self.assertIn(("customers", ("region",)), recommendations)
+
+    def test_unused_index_flagged(self):
+        self.schema.create_index("orders", ["total"])
+        self.crud.read("orders", "WHERE customer_id = ?", (1,))
+        self.crud.update("orders", {"status": "closed"}, "customer_id = ?", (1,))
+        unused = self.executor.unused_indexes()
+        self.assertEqual([u["index_name"] for u in unused], ["idx_orders_total"])
+        self.assertEqual(unused[0]["writes"], 1)
+
+        self.executor.execute_query("SELECT id FROM orders WHERE total > ?", (1990,))
+        self.assertEqual(self.executor.unused_indexes(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.keyset_paginator import KeysetPaginator
+from src.modules.query_executor import QueryExecutor
+
+
+class TestKeysetPaginator(unittest.TestCase):
+
+    def setUp(self):
+        """Initialisation d'une base en mémoire avec 95 lignes"""
+        DatabaseConnector._instance = None
+        self.connector = DatabaseConnector(":memory:")
+        self.connector.connect()
+        with self.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            cursor.executemany("INSERT INTO items (id, name) VALUES (?, ?)", [(i * 2, f"item{i}") for i in range(1, 96)])
+        self.paginator = KeysetPaginator(self.connector, "items", key="id", page_size=10, anchor_stride=3)
+
+    def tearDown(self):
+        """Fermeture de la connexion après chaque test"""
+        self.connector.close_connection()
+        DatabaseConnector._instance = None
+
+    def _ids(self, rows):
+        return [row["id"] for row in rows]
+
+    def test_sequential_navigation(self):
+        """Navigation avant/arrière par clé"""
+        self.assertEqual(self._ids(self.paginator.first_page()), list(range(2, 21, 2)))
+        self.assertEqual(self._ids(self.paginator.next_page()), list(range(22, 41, 2)))
+        self.assertEqual(self.paginator.page, 2)
+        self.assertEqual(self._ids(self.paginator.previous_page()), list(range(2, 21, 2)))
+        self.assertEqual(self.paginator.page, 1)
+
+    def test_last_page_and_end(self):
+        """La dernière page est partielle, au-delà la page est vide"""
+        self.assertEqual(self.paginator.total_pages(), 10)
+        self.assertEqual(self._ids(self.paginator.goto_page(10)), list(range(182, 191, 2)))
+        self.assertEqual(self.paginator.next_page(), [])
+        self.assertEqual(self.paginator.page, 10)
+
+    def test_jump_matches_offset(self):
+        """Un saut de page par ancre retourne les mêmes lignes que LIMIT/OFFSET"""
+        for page in (4, 7, 5, 8, 2):
+            with self.connector.read_cursor() as cursor:
+                cursor.execute("SELECT id FROM items ORDER BY id LIMIT 10 OFFSET ?", ((page - 1) * 10,))
+                expected = [row[0] for row in cursor.fetchall()]
+            self.assertEqual(self._ids(self.paginator.goto_page(page)), expected)
+            self.assertEqual(self.paginator.page, page)
+
+    def test_custom_select(self):
+        """Les colonnes sélectionnées peuvent référencer l'alias t"""
+        paginator = KeysetPaginator(self.connector, "items", key="id", page_size=2,
+                                    select="t.id, upper(t.name) AS label")
+        self.assertEqual(paginator.first_page(), [{"id": 2, "label": "ITEM1"}, {"id": 4, "label": "ITEM2"}])
+
+    def test_writes_reset_anchors_and_total(self):
+        """Après une écriture, ancres et total sont recalculés, même avec sqlite_stat1"""
+        with self.connector.transaction(mode='AUTO') as cursor:
+            cursor.execute("ANALYZE")
+        self.assertEqual(self.paginator.total_pages(), 10)
+        self.assertEqual(self._ids(self.paginator.goto_page(7))[0], 122)
+        executor = QueryExecutor(":memory:")
+        executor.execute_query("DELETE FROM items WHERE id <= ?", (40,))
+        executor.execute_query("INSERT INTO items (id, name) VALUES " + ", ".join(f"({i}, 'new{i}')" for i in range(191, 231, 2)))
+        self.assertEqual(self.paginator.total_pages(), 10)
+        self.assertEqual(self._ids(self.paginator.goto_page(5)), list(range(122, 141, 2)))
+        self.assertEqual(self._ids(self.paginator.goto_page(10)), list(range(221, 230, 2)))
+
+    def test_concurrent_jumps(self):
+        """Des sauts de page lancés depuis plusieurs threads retournent chacun leur page"""
+        results = {}
+
+        def jump(page):
+            results[page] = self._ids(self.paginator.goto_page(page))
+
+        threads = [threading.Thread(target=jump, args=(page,)) for page in (3, 9, 6, 4, 8, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for page, ids in results.items():
+            self.assertEqual(ids, list(range(page * 20 - 18, page * 20 + 1, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
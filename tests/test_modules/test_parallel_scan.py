@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.parallel_scan import HyperLogLog, plan_aggregate, split_rowid_ranges
+from src.modules.query_executor import QueryExecutor
+
+
+class TestScanPlan(unittest.TestCase):
+
+    def test_split_rowid_ranges(self):
+        """Plages [début, fin[ contiguës couvrant exactement [low, high]"""
+        self.assertEqual(split_rowid_ranges(1, 10, 3), [(1, 4), (4, 8), (8, 11)])
+        self.assertEqual(split_rowid_ranges(5, 6, 8), [(5, 6), (6, 7)])
+        self.assertEqual(split_rowid_ranges(3, 2, 4), [])
+
+    def test_plan_aggregate(self):
+        """Seules les agrégations fusionnables sur une table sont découpées"""
+        plan = plan_aggregate("SELECT kind, AVG(amount) AS average FROM sales WHERE amount > ? GROUP BY kind", (3,))
+        self.assertEqual(plan.partial_sql, "SELECT kind, SUM(amount), COUNT(amount) FROM sales "
+                                           "WHERE (amount > ?) AND rowid >= ? AND rowid < ? GROUP BY kind")
+        self.assertEqual([column.name for column in plan.columns], ["kind", "average"])
+        for sql in ("SELECT kind, COUNT(*) FROM sales GROUP BY kind ORDER BY kind",
+                    "SELECT COUNT(*) FROM sales JOIN shops ON sales.shop = shops.id",
+                    "SELECT kind, COUNT(*) FROM sales GROUP BY kind HAVING COUNT(*) > 1",
+                    "SELECT DISTINCT kind FROM sales",
+                    "SELECT kind, COUNT(*) FROM sales",
+                    "SELECT SUM(DISTINCT amount) FROM sales",
+                    "SELECT COUNT(*) FROM sales WHERE kind IN (SELECT kind FROM kinds)"):
+            self.assertIsNone(plan_aggregate(sql), sql)
+        self.assertIsNone(plan_aggregate("SELECT COUNT(*) FROM sales WHERE kind = :kind", {"kind": "a"}))
+
+    def test_hyperloglog_merge(self):
+        """La fusion de deux esquisses équivaut à l'esquisse de l'union"""
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for value in range(6000):
+            (left if value < 4000 else right).add(value)
+            union.add(value)
+        right.add(10)
+        left.merge(right)
+        self.assertEqual(left.registers, union.registers)
+        self.assertLess(abs(left.estimate() - 6000), 6000 * 0.05)
+
+
+class TestParallelAggregation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.directory.name, "sales.db")
+        with sqlite3.connect(cls.db_path) as connection:
+            connection.execute("CREATE TABLE sales (id INTEGER PRIMARY KEY, kind TEXT, shop INTEGER, amount REAL)")
+            connection.executemany("INSERT INTO sales (kind, shop, amount) VALUES (?, ?, ?)", [
+                ("abc"[index % 3], index % 97, None if index % 11 == 0 else (index * 7) % 500 / 4)
+                for index in range(5000)
+            ])
+        connection.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        DatabaseConnector._instance = None
+        self.executor = QueryExecutor(self.db_path, parallel_workers=2, parallel_min_rows=0)
+
+    def tearDown(self):
+        self.executor.close()
+        DatabaseConnector._instance = None
+
+    def _serial(self, sql, params=()):
+        with sqlite3.connect(self.db_path) as connection:
+            cursor = connection.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def assertSameRows(self, parallel, serial):
+        self.assertEqual(len(parallel), len(serial))
+        for left, right in zip(parallel, serial):
+            self.assertEqual(left.keys(), right.keys())
+            for name in left:
+                if isinstance(right[name], float):
+                    self.assertAlmostEqual(left[name], right[name])
+                else:
+                    self.assertEqual(left[name], right[name])
+
+    def test_matches_serial_results(self):
+        """Mêmes résultats qu'une exécution sur une seule connexion"""
+        queries = [
+            ("SELECT COUNT(*), COUNT(amount), SUM(amount), TOTAL(amount), MIN(amount), MAX(amount), AVG(amount) "
+             "FROM sales", ()),
+            ("SELECT kind, COUNT(*) AS n, AVG(amount) AS average, MAX(shop) FROM sales GROUP BY kind", ()),
+            ("SELECT shop % 2, kind, SUM(amount) FROM sales WHERE amount > ? AND kind <> 'b' GROUP BY shop % 2, kind",
+             (20,)),
+            ("SELECT kind, COUNT(DISTINCT shop) AS shops, COUNT(DISTINCT amount) FROM sales GROUP BY kind", ()),
+            ("SELECT COUNT(*), SUM(amount), AVG(amount) FROM sales WHERE amount > ?", (10_000,)),
+        ]
+        for sql, params in queries:
+            with self.subTest(sql=sql):
+                self.assertSameRows(self.executor.execute_query(sql, params), self._serial(sql, params))
+        self.assertEqual(self.executor.parallel.parallel_queries, len(queries))
+
+    def test_approx_count_distinct(self):
+        """Esquisses fusionnées en parallèle ; même fonction disponible en exécution séquentielle"""
+        rows = self.executor.execute_query(
+            "SELECT kind, APPROX_COUNT_DISTINCT(id) AS ids, APPROX_COUNT_DISTINCT(shop) AS shops "
+            "FROM sales GROUP BY kind")
+        # Exécution séquentielle (ORDER BY) : même esquisse, donc même estimation que la fusion des plages
+        serial = self.executor.execute_query("SELECT APPROX_COUNT_DISTINCT(shop) AS shops FROM sales ORDER BY 1")
+        self.assertLess(abs(serial[0]["shops"] - 97), 97 * 0.05)
+        self.assertEqual([row["kind"] for row in rows], ["a", "b", "c"])
+        for row in rows:
+            self.assertLess(abs(row["ids"] - 5000 / 3), 5000 / 3 * 0.05)
+            self.assertEqual(row["shops"], serial[0]["shops"])
+        self.assertEqual(self.executor.parallel.parallel_queries, 1)
+
+    def test_serial_fallback(self):
+        """Petites tables et transactions ouvertes restent sur la connexion courante"""
+        self.executor.parallel.min_rows = 10_000
+        self.assertEqual(self.executor.execute_query("SELECT COUNT(*) AS n FROM sales"), [{"n": 5000}])
+        self.executor.parallel.min_rows = 0
+        with self.executor.connector.transaction() as cursor:
+            cursor.execute("INSERT INTO sales (kind, shop, amount) VALUES ('z', 1, 1)")
+            self.assertIsNone(self.executor.parallel.plan("SELECT COUNT(*) FROM sales"))
+            cursor.execute("DELETE FROM sales WHERE kind = 'z'")
+        self.assertEqual(self.executor.parallel.parallel_queries, 0)
+
+    def test_memory_database_runs_serially(self):
+        """Les processus de travail ne peuvent pas lire une base en mémoire"""
+        self.executor.close()
+        DatabaseConnector._instance = None
+        self.executor = QueryExecutor(":memory:", parallel_workers=2, parallel_min_rows=0)
+        self.executor.execute_query("CREATE TABLE numbers (value INTEGER)")
+        self.executor.execute_query("INSERT INTO numbers (value) VALUES (1), (2), (2)")
+        rows = self.executor.execute_query("SELECT COUNT(DISTINCT value) AS n, SUM(value) AS total FROM numbers")
+        self.assertEqual(rows, [{"n": 2, "total": 5}])
+        self.assertEqual(self.executor.parallel.parallel_queries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
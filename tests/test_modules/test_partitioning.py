@@ -0,0 +1,142 @@
+import sqlite3
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.crud_operator import CRUDOperator
+from src.modules.partitioning import Partition, PartitionLayout, range_bounds
+from src.modules.schema_manager import SchemaManager
+
+
+class TestPartitionLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.layout = PartitionLayout("events", "day", tuple(
+            Partition(f"events_p{lower}", lower, upper) for lower, upper in range_bounds([0, 10, 20, 30])))
+
+    def test_range_bounds(self):
+        """Schémas par dates (fin de mois respectée) ou par pas numérique"""
+        self.assertEqual(range_bounds({"interval": "month", "start": "2024-01-31", "count": 2}),
+                         [("2024-01-31", "2024-02-29"), ("2024-02-29", "2024-03-29")])
+        self.assertEqual(range_bounds({"interval": 100, "start": 0, "count": 2}), [(0, 100), (100, 200)])
+        with self.assertRaises(ValueError):
+            range_bounds([10, 5])
+        with self.assertRaises(ValueError):
+            range_bounds([0, "a"])
+
+    def test_partition_for(self):
+        """Une valeur est routée vers l'intervalle [basse, haute[ qui la contient"""
+        self.assertEqual(self.layout.partition_for(10).name, "events_p10")
+        self.assertEqual(self.layout.partition_for(29).name, "events_p20")
+        for value in (30, -1, None, "x"):
+            with self.assertRaises(ValueError):
+                self.layout.partition_for(value)
+
+    def test_prune(self):
+        """Seules les partitions compatibles avec les bornes de la clé sont retenues"""
+        def names(conditions, params=()):
+            return [partition.name for partition in self.layout.prune(conditions, params)]
+
+        self.assertEqual(names("WHERE day = ?", (15,)), ["events_p10"])
+        self.assertEqual(names("WHERE day >= 10 AND day < 20 ORDER BY day LIMIT ?", (5,)), ["events_p10"])
+        self.assertEqual(names("WHERE kind = ? AND day BETWEEN ? AND ?", ("a", 5, 10)), ["events_p0", "events_p10"])
+        self.assertEqual(names("WHERE events.day > :start", {"start": 19}), ["events_p10", "events_p20"])
+        self.assertEqual(names("WHERE day < 0"), [])
+        # Conditions non analysables : toutes les partitions
+        self.assertEqual(len(names("WHERE day = 5 OR day = 25")), 3)
+        self.assertEqual(len(names("WHERE note = 'day = 5'")), 3)
+        self.assertEqual(len(names("")), 3)
+
+
+class TestPartitionedTable(unittest.TestCase):
+
+    def setUp(self):
+        """Table d'événements partitionnée par mois sur trois mois"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        self.manager = SchemaManager(":memory:")
+        self.partitions = self.manager.create_partitioned_table(
+            "events", {"id": "INTEGER PRIMARY KEY", "created_on": "DATE NOT NULL", "kind": "TEXT"},
+            "created_on", {"interval": "month", "start": "2024-01-01", "count": 3})
+        self.crud.create_many("events", [
+            {"created_on": f"2024-{month:02d}-{day:02d}", "kind": "click" if day % 2 else "view"}
+            for month in (1, 2, 3) for day in range(1, 11)
+        ], batch_size=7)
+
+    def tearDown(self):
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def _count(self, table_name):
+        with self.crud.connector.read_cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            return cursor.fetchone()[0]
+
+    def test_layout_recorded_in_catalog(self):
+        """Partitions, vue UNION ALL et catalogue sys_ créés ensemble"""
+        self.assertEqual(self.partitions, ["events_p2024_01_01", "events_p2024_02_01", "events_p2024_03_01"])
+        self.assertEqual(self.manager.list_partitions("events")[1], ("events_p2024_02_01", "2024-02-01", "2024-03-01"))
+        self.assertIn("events", self.manager.list_tables())
+        self.assertNotIn("events_p2024_01_01", self.manager.list_tables())
+        self.assertEqual(self.crud.catalog.columns("events"), ["id", "created_on", "kind"])
+
+    def test_writes_are_routed(self):
+        """Chaque ligne est insérée dans la partition de son mois"""
+        self.assertEqual([self._count(name) for name in self.partitions], [10, 10, 10])
+        self.crud.create("events", {"created_on": "2024-02-29", "kind": "view"})
+        self.assertEqual(self._count("events_p2024_02_01"), 11)
+        self.assertEqual(self._count("events"), 31)
+        with self.assertRaises(ValueError):
+            self.crud.create("events", {"created_on": "2024-04-01", "kind": "view"})
+        with self.assertRaises(ValueError):
+            self.crud.create("events", {"kind": "view"})
+
+    def test_reads_are_pruned(self):
+        """Une lecture bornée sur la clé ne lit que les partitions concernées"""
+        statements = []
+        self.crud.connector.get_connection().set_trace_callback(statements.append)
+        try:
+            rows = self.crud.read("events", "WHERE created_on >= ? AND created_on < ? AND kind = ?",
+                                  ("2024-02-05", "2024-02-08", "click"))
+        finally:
+            self.crud.connector.get_connection().set_trace_callback(None)
+        self.assertEqual([row["created_on"] for row in rows], ["2024-02-05", "2024-02-07"])
+        reads = [sql for sql in statements if sql.startswith("SELECT * FROM")]
+        self.assertTrue(reads)
+        self.assertTrue(all("events_p2024_02_01" in sql and "events_p2024_01_01" not in sql for sql in reads))
+        self.assertEqual(len(self.crud.read("events", "WHERE kind = ?", ("view",))), 15)
+
+    def test_update_and_delete_in_partitions(self):
+        """Les modifications sont appliquées aux partitions non élaguées et invalident le cache"""
+        self.assertEqual(len(self.crud.read("events", "WHERE kind = 'click'")), 15)
+        self.crud.update("events", {"kind": "click"}, "created_on < ?", ("2024-01-05",))
+        self.assertEqual(len(self.crud.read("events", "WHERE kind = 'click'")), 17)
+        self.crud.delete("events", "created_on >= ?", ("2024-03-06",))
+        self.assertEqual(self._count("events_p2024_03_01"), 5)
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.crud.update("events", {"created_on": "2024-02-01"}, "created_on = ?", ("2024-01-01",))
+
+    def test_retention(self):
+        """Retrait d'une partition (détachée ou supprimée) sans toucher aux autres lignes"""
+        self.assertEqual(len(self.crud.read("events")), 30)
+        self.manager.detach_partition("events", "events_p2024_01_01")
+        self.assertEqual(len(self.crud.read("events")), 20)
+        self.assertEqual(self._count("events_p2024_01_01"), 10)
+        self.assertIn("events_p2024_01_01", self.manager.list_tables())
+        self.manager.drop_partition("events", "events_p2024_02_01")
+        self.assertEqual(len(self.crud.read("events")), 10)
+        with self.assertRaises(ValueError):
+            self.manager.drop_partition("events", "events_p2024_03_01")
+        name = self.manager.add_partition("events", "2024-04-01", "2024-05-01")
+        self.crud.create("events", {"created_on": "2024-04-15", "kind": "view"})
+        self.assertEqual(self._count(name), 1)
+        self.assertEqual(len(self.crud.read("events", "WHERE created_on >= '2024-03-01'")), 11)
+        with self.assertRaises(ValueError):
+            self.manager.add_partition("events", "2024-03-15", "2024-04-15")
+        self.manager.drop_table("events")
+        self.assertEqual(self.manager.list_partitions("events"), [])
+        with self.crud.connector.read_cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE 'events%' AND type IN ('table', 'view')")
+            self.assertEqual([row[0] for row in cursor.fetchall()], ["events_p2024_01_01"])
+
+
+if __name__ == '__main__':
+    unittest.main()
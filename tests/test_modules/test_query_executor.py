@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.modules.crud_operator import CRUDOperator
+from src.modules.database_connector import DatabaseConnector
+from src.modules.query_cache import QueryCache, normalize_query, parse_query
+from src.modules.query_executor import QueryExecutor
+
+
+class TestQueryExecutor(unittest.TestCase):
+
+    def setUp(self):
+        """Initialisation d'une base en mémoire avec une table de test"""
+        DatabaseConnector._instance = None
+        self.executor = QueryExecutor(":memory:")
+        with self.executor.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            cursor.executemany("INSERT INTO items (name) VALUES (?)", [(f"item{i}",) for i in range(25)])
+
+    def tearDown(self):
+        """Fermeture de la connexion après chaque test"""
+        self.executor.close()
+        DatabaseConnector._instance = None
+
+    def test_cross_database_join(self):
+        """ATTACH saisi comme requête : jointure entre la base principale et la base attachée"""
+        self.executor.execute_query("ATTACH DATABASE ':memory:' AS archive")
+        self.assertEqual(self.executor.connector.attached(), {"archive": ":memory:"})
+        self.executor.execute_query("CREATE TABLE archive.orders (id INTEGER PRIMARY KEY, item_id INTEGER, qty INTEGER)")
+        self.executor.execute_query("INSERT INTO archive.orders (item_id, qty) VALUES (2, 5)")
+        self.assertEqual(self.executor.get_table_columns("archive.orders"), ["id", "item_id", "qty"])
+        query = "SELECT i.name, o.qty FROM items i JOIN archive.orders o ON o.item_id = i.id"
+        self.assertEqual(self.executor.execute_query(query), [{"name": "item1", "qty": 5}])
+        self.executor.execute_query("UPDATE archive.orders SET qty = 6")
+        self.assertEqual(self.executor.execute_query(query), [{"name": "item1", "qty": 6}])
+        self.executor.execute_query("DETACH DATABASE archive")
+        with self.assertRaises(sqlite3.OperationalError):
+            self.executor.execute_query(query)
+
+    def test_stream_query_batches(self):
+        """Les résultats sont produits par lots de batch_size lignes"""
+        batches = list(self.executor.stream_query("SELECT * FROM items ORDER BY id", batch_size=10))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(batches[0][0], {"id": 1, "name": "item0"})
+
+    def test_stream_query_row_formats(self):
+        """Les formats tuple et row évitent un dict par ligne"""
+        batch = next(self.executor.stream_query("SELECT id, name FROM items WHERE id = ?", (3,), row_format="tuple"))
+        self.assertEqual(batch, [(3, "item2")])
+        batch = next(self.executor.stream_query("SELECT id, name FROM items WHERE id = ?", (3,), row_format="row"))
+        self.assertIsInstance(batch[0], sqlite3.Row)
+        self.assertEqual(batch[0]["name"], "item2")
+        with self.assertRaises(ValueError):
+            next(self.executor.stream_query("SELECT * FROM items", row_format="json"))
+
+    def test_get_query_columns(self):
+        """Les colonnes d'une requête sont disponibles sans lire de ligne"""
+        self.assertEqual(self.executor.get_query_columns("SELECT id, name AS label FROM items"), ["id", "label"])
+
+    def test_parse_query(self):
+        """Classification des requêtes et extraction de la table cible"""
+        self.assertEqual(parse_query("  create table if not exists t1 (a)").statement, "CREATE TABLE")
+        self.assertEqual(parse_query("CREATE UNIQUE INDEX ix ON t2 (a)")[1:], ("DDL", "CREATE INDEX", "t2"))
+        self.assertEqual(parse_query("INSERT OR REPLACE INTO t3 VALUES (1)")[1:], ("DML", "INSERT", "t3"))
+        self.assertEqual(parse_query("select * from aux.t4 where a = 1")[1:], ("SELECT", "SELECT", "aux.t4"))
+        self.assertEqual(parse_query("BEGIN").kind, "OTHER")
+
+    def test_query_cache_lru(self):
+        """Le cache compte hits, miss et évictions"""
+        cache = QueryCache(max_size=2)
+        for query in ("SELECT 1", "SELECT 1", "SELECT 2", "SELECT 3", "SELECT 1"):
+            cache.get(query)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 4)
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_query_cache_normalizes_text(self):
+        """Espaces et casse sont ignorés, sauf dans les littéraux et les noms de paramètres"""
+        cache = QueryCache()
+        first = cache.get("SELECT name FROM items WHERE id = ?")
+        self.assertIs(cache.get("  select name\n  FROM Items where id = ?;"), first)
+        cache.get("SELECT name FROM items WHERE name = 'A'")
+        cache.get("SELECT name FROM items WHERE name = 'a'")
+        cache.get("SELECT name FROM items WHERE name = :Name")
+        cache.get("SELECT name FROM items WHERE name = :name")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["size"], 5)
+        self.assertEqual(normalize_query("SELECT  'A  b' FROM [My  Table]"), "select 'A  b' from [My  Table]")
+
+    def test_repeated_query_hits_cache(self):
+        """Une requête répétée n'est analysée qu'une fois"""
+        for i in range(5):
+            self.executor.execute_query("SELECT name FROM items WHERE id = ?", (i + 1,))
+        self.assertEqual(self.executor.cache_stats()["misses"], 1)
+        self.assertEqual(self.executor.cache_stats()["hits"], 4)
+
+    def test_execute_create_table_registers(self):
+        """CREATE TABLE via execute_query enregistre la table dans sys_tables"""
+        self.executor.execute_query("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+        rows = self.executor.execute_query("SELECT table_type FROM sys_tables WHERE table_name = ?", ("notes",))
+        self.assertEqual(rows, [{"table_type": "USER"}])
+        self.assertEqual(self.executor.execute_query("ALTER TABLE notes ADD COLUMN title TEXT"), [])
+
+    def test_create_table_if_not_exists_twice(self):
+        """CREATE TABLE IF NOT EXISTS sur une table déjà enregistrée ne l'enregistre pas une seconde fois"""
+        query = "CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, body TEXT)"
+        self.executor.execute_query(query)
+        self.executor.execute_query(query)
+        tables = self.executor.execute_query("SELECT id FROM sys_tables WHERE table_name = ?", ("notes",))
+        self.assertEqual(len(tables), 1)
+        columns = self.executor.execute_query("SELECT column_name FROM sys_columns WHERE table_id = ?",
+                                              (tables[0]["id"],))
+        self.assertEqual([row["column_name"] for row in columns], ["id", "body"])
+
+    def test_profiler_flags_full_scans(self):
+        """Chaque requête est mesurée ; un SCAN complet est signalé, une recherche par clé non"""
+        self.executor.execute_query("SELECT * FROM items WHERE name = ?", ("item3",))
+        self.executor.execute_query("SELECT * FROM items WHERE id = ?", (3,))
+        self.executor.execute_query("SELECT * FROM items WHERE id = ?", (4,))
+        top = {row["query"]: row for row in self.executor.top_queries(order_by='p95')}
+        scan = top["SELECT * FROM items WHERE name = ?"]
+        seek = top["SELECT * FROM items WHERE id = ?"]
+        self.assertTrue(scan["full_scan"])
+        self.assertEqual(scan["scanned_tables"], "items")
+        self.assertEqual(scan["rows"], 1)
+        self.assertFalse(seek["full_scan"])
+        self.assertEqual(seek["count"], 2)
+
+    def test_slow_queries_logged(self):
+        """Au-delà du seuil, la requête et son plan sont écrits dans sys_slow_queries"""
+        self.executor.profiler.slow_threshold_ms = 0
+        self.executor.execute_query("SELECT COUNT(*) FROM items WHERE name LIKE ?", ("item%",))
+        slow = self.executor.slow_queries()
+        self.assertEqual(len(slow), 1)
+        self.assertEqual(slow[0]["rows_returned"], 1)
+        self.assertEqual(slow[0]["full_scan"], 1)
+        self.assertIn("SCAN items", slow[0]["query_plan"])
+
+
+class TestReadsUseReaderPool(unittest.TestCase):
+
+    def setUp(self):
+        """Base fichier : les lectures passent par les connexions de lecture du pool"""
+        DatabaseConnector._instance = None
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, "reads.db")
+        DatabaseConnector(db_path, pool_timeout=0.5)
+        self.crud = CRUDOperator(db_path)
+        self.executor = QueryExecutor(db_path)
+        # Lecture réelle à chaque appel (le cache de résultats n'est pas l'objet de ces tests)
+        self.executor.result_cache.enabled = False
+        with self.executor.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            cursor.executemany("INSERT INTO items (name) VALUES (?)", [(f"item{i}",) for i in range(5)])
+
+    def tearDown(self):
+        self.executor.close()
+        DatabaseConnector._instance = None
+        self.tmp_dir.cleanup()
+
+    def test_reads_do_not_wait_for_writer(self):
+        """Une transaction d'écriture ouverte dans un autre thread ne bloque ni SELECT ni read()"""
+        writing, release = threading.Event(), threading.Event()
+
+        def writer():
+            with self.executor.connector.transaction() as cursor:
+                cursor.execute("INSERT INTO items (name) VALUES ('pending')")
+                writing.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        writing.wait(5)
+        try:
+            self.assertEqual(self.executor.execute_query("SELECT COUNT(*) AS n FROM items"), [{"n": 5}])
+            self.assertEqual(len(self.crud.read("items")), 5)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(self.executor.execute_query("SELECT COUNT(*) AS n FROM items"), [{"n": 6}])
+
+    def test_reads_in_unit_of_work_see_pending_writes(self):
+        """Dans une unit_of_work, les lectures voient les écritures non validées du bloc"""
+        with self.crud.unit_of_work():
+            self.crud.create("items", {"name": "pending"})
+            self.assertEqual(len(self.crud.read("items")), 6)
+            self.assertEqual(self.executor.execute_query("SELECT COUNT(*) AS n FROM items"), [{"n": 6}])
+
+    def test_with_write_runs_on_writer(self):
+        """WITH ... DELETE est refusée par la connexion de lecture puis exécutée en écriture"""
+        self.executor.execute_query("WITH old AS (SELECT id FROM items WHERE id < 3) "
+                                    "DELETE FROM items WHERE id IN (SELECT id FROM old)")
+        self.assertEqual(self.executor.execute_query("SELECT COUNT(*) AS n FROM items"), [{"n": 3}])
+
+
+if __name__ == '__main__':
+    unittest.main()
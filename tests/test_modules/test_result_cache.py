@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from src.modules.database_connector import DatabaseConnector
+from src.modules.crud_operator import CRUDOperator
+from src.modules.query_executor import QueryExecutor
+from src.modules.result_cache import normalize_sql, referenced_tables
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        """Deux tables peuplées, cache de résultats partagé par CRUDOperator et QueryExecutor"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        self.executor = QueryExecutor(":memory:")
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            cursor.execute("CREATE TABLE other (id INTEGER PRIMARY KEY, label TEXT)")
+        self.crud.create_many("items", [(f"item{i}",) for i in range(20)], columns=["name"])
+        self.crud.create("other", {"label": "x"})
+        self.cache = self.crud.connector.get_result_cache()
+        self.statements = []
+
+    def tearDown(self):
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def _trace(self):
+        self.statements.clear()
+        self.crud.connector.get_connection().set_trace_callback(self.statements.append)
+
+    def _selects(self, table):
+        return [sql for sql in self.statements if sql.lstrip().upper().startswith("SELECT") and table in sql]
+
+    def test_repeated_reads_hit(self):
+        """Une lecture répétée (même SQL normalisé et paramètres) ne touche plus la base"""
+        first = self.crud.read("items", "WHERE id <= ?", (5,))
+        first[0]["name"] = "changed"
+        self._trace()
+        self.assertEqual(self.crud.read("items", "WHERE id <= ?", (5,))[0]["name"], "item0")
+        self.assertEqual(len(self.executor.execute_query("SELECT * FROM items  WHERE id <= ?", (5,))), 5)
+        self.assertEqual(len(self.executor.execute_query("SELECT *\n FROM items WHERE id <= ?", (5,))), 5)
+        self.assertEqual(self._selects("items"), [])
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["entries"]), (3, 1))
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_writes_invalidate_per_table(self):
+        """Les écritures n'invalident que les résultats des tables modifiées"""
+        self.crud.read("items")
+        self.crud.read("other")
+        self.crud.update("items", {"name": "renamed"}, "id = ?", (1,))
+        self.assertEqual(self.crud.read("items", "WHERE id = 1"), [{"id": 1, "name": "renamed"}])
+        self._trace()
+        self.crud.read("other")
+        self.assertEqual(self._selects("other"), [])
+
+        self.executor.execute_query("DELETE FROM items WHERE id > 10")
+        self.assertEqual(len(self.crud.read("items")), 10)
+        self.crud.delete("items", "id = ?", (1,))
+        self.crud.create("items", {"name": "new"})
+        self.assertEqual(len(self.executor.execute_query("SELECT * FROM items")), 10)
+
+        self.executor.execute_query("CREATE VIEW item_names AS SELECT i.name FROM items i JOIN other o ON 1, other p")
+        self.assertEqual(len(self.executor.execute_query("SELECT * FROM item_names")), 10)
+        self.crud.create("other", {"label": "y"})
+        self.assertEqual(len(self.executor.execute_query("SELECT * FROM item_names")), 40)
+
+    def test_triggers_invalidate_everything(self):
+        """Une écriture sur une table à triggers invalide tout le cache (écritures en cascade)"""
+        self.executor.execute_query("""
+            CREATE TRIGGER items_audit AFTER INSERT ON items BEGIN
+                INSERT INTO other (label) VALUES (new.name);
+            END
+        """)
+        self.assertEqual(len(self.crud.read("other")), 1)
+        self.crud.create("items", {"name": "cascade"})
+        self.assertEqual(len(self.crud.read("other")), 2)
+
+    def test_uncacheable_queries(self):
+        """Fonctions volatiles, tables virtuelles et schéma ne sont pas mis en cache"""
+        for query in ("SELECT random() FROM items", "SELECT date('now') FROM items",
+                      "SELECT * FROM pragma_table_info('items')", "SELECT name FROM sqlite_master"):
+            self.executor.execute_query(query)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertEqual(self.cache.stats()["uncacheable"], 4)
+
+    def test_memory_bound_evicts_lru(self):
+        """La mémoire occupée reste sous max_bytes, les entrées les moins récentes sont évincées"""
+        self.cache.max_bytes = self.cache.max_entry_bytes = 8000
+        for i in range(1, 21):
+            self.crud.read("items", "WHERE id <= ?", (i,))
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["bytes"], 8000)
+        self.assertGreater(stats["evictions"], 0)
+        self._trace()
+        self.crud.read("items", "WHERE id <= ?", (20,))
+        self.assertEqual(self._selects("items"), [])
+
+    def test_write_during_read_is_not_cached(self):
+        """Un résultat lu avant une écriture concurrente n'est pas mémorisé"""
+        pending = self.cache.begin("SELECT * FROM items")
+        self.cache.invalidate("items")
+        self.assertFalse(self.cache.put(pending, ["id", "name"], [(1, "stale")]))
+        self.assertIsNone(self.cache.get("SELECT * FROM items"))
+
+    def test_sql_helpers(self):
+        self.assertEqual(normalize_sql("SELECT  *\n FROM t WHERE a = '  x ' ;"), "SELECT * FROM t WHERE a = '  x '")
+        with self.crud.connector.read_cursor() as cursor:
+            self.assertEqual(referenced_tables(
+                cursor, "WITH c AS (SELECT * FROM items) SELECT * FROM c JOIN other ON 1, sys_logs s"),
+                ["items", "other", "sys_logs"])
+            self.assertIsNone(referenced_tables(cursor, "SELECT * FROM pragma_table_info('items')"))
+
+
+class TestResultCacheExternalWriter(unittest.TestCase):
+
+    def test_data_version_change_clears_cache(self):
+        """Une écriture validée par une autre connexion est détectée par PRAGMA data_version"""
+        DatabaseConnector._instance = None
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "results.db")
+            crud = CRUDOperator(db_path)
+            try:
+                with crud.connector.transaction() as cursor:
+                    cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+                crud.create("items", {"name": "a"})
+                cache = crud.connector.get_result_cache()
+                cache.validate_interval = 0
+                self.assertEqual(len(crud.read("items")), 1)
+                other = sqlite3.connect(db_path, timeout=5)
+                other.execute("INSERT INTO items (name) VALUES ('b')")
+                other.commit()
+                other.close()
+                self.assertEqual(len(crud.read("items")), 2)
+            finally:
+                crud.close()
+                DatabaseConnector._instance = None
+
+    def test_cache_hit_does_not_wait_for_writer(self):
+        """Un succès de cache est servi sans attendre la connexion d'écriture occupée par un autre thread"""
+        DatabaseConnector._instance = None
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "results.db")
+            DatabaseConnector(db_path, pool_timeout=0.5)
+            crud = CRUDOperator(db_path)
+            writing, release = threading.Event(), threading.Event()
+
+            def writer():
+                with crud.unit_of_work():
+                    crud.create("other", {"label": "pending"})
+                    writing.set()
+                    release.wait(5)
+
+            try:
+                with crud.connector.transaction() as cursor:
+                    cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+                    cursor.execute("CREATE TABLE other (id INTEGER PRIMARY KEY, label TEXT)")
+                crud.create("items", {"name": "a"})
+                cache = crud.connector.get_result_cache()
+                cache.validate_interval = 0
+                self.assertEqual(len(crud.read("items")), 1)
+                thread = threading.Thread(target=writer)
+                thread.start()
+                writing.wait(5)
+                try:
+                    started = time.perf_counter()
+                    hits = cache.hits
+                    self.assertEqual(len(crud.read("items")), 1)
+                    self.assertEqual(cache.hits, hits + 1)
+                    self.assertLess(time.perf_counter() - started, 0.5)
+                finally:
+                    release.set()
+                    thread.join()
+                self.assertEqual(len(crud.read("other")), 1)
+            finally:
+                crud.close()
+                DatabaseConnector._instance = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import sqlite3
+import unittest
+from unittest import mock
+from src.modules.database_connector import DatabaseConnector
+from src.modules.crud_operator import CRUDOperator
+from src.modules.schema_manager import SchemaManager
+
+
+class TestSchemaAlter(unittest.TestCase):
+
+    def setUp(self):
+        """Table peuplée avec index, contraintes et trigger, catalogue système initialisé"""
+        DatabaseConnector._instance = None
+        self.crud = CRUDOperator(":memory:")
+        self.manager = SchemaManager(":memory:")
+        self.manager.create_table("products", {
+            "id": "INTEGER PRIMARY KEY",
+            "name": "TEXT NOT NULL",
+            "price": "REAL CHECK (price >= 0)",
+            "stock": "INTEGER DEFAULT 0",
+        }, constraints=["UNIQUE (name)"])
+        self.crud.create_many("products", ((f"p{i}", i * 1.5, i) for i in range(250)),
+                              columns=["name", "price", "stock"])
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute("CREATE INDEX idx_products_price ON products(price)")
+            cursor.execute("CREATE INDEX idx_products_stock ON products(stock)")
+            cursor.execute("CREATE TABLE price_log (product_id INTEGER, price REAL)")
+            cursor.execute("""
+                CREATE TRIGGER products_price_log AFTER UPDATE OF price ON products BEGIN
+                    INSERT INTO price_log VALUES (new.id, new.price);
+                END
+            """)
+
+    def tearDown(self):
+        self.crud.close()
+        DatabaseConnector._instance = None
+
+    def _query(self, sql, params=()):
+        with self.crud.connector.transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _catalog_columns(self):
+        return [row[0] for row in self._query("""
+            SELECT c.column_name FROM sys_columns c JOIN sys_tables t ON t.id = c.table_id
+            WHERE t.table_name = 'products' ORDER BY c.ordinal_position
+        """)]
+
+    def _indexes(self):
+        return {row[0] for row in self._query(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'products' AND sql IS NOT NULL")}
+
+    def test_native_rename_keeps_dependents(self):
+        """RENAME COLUMN natif : données, index et catalogue suivent sans reconstruction"""
+        with mock.patch.object(self.manager, "rebuild_table") as rebuild:
+            self.manager.rename_column("products", "price", "unit_price")
+        rebuild.assert_not_called()
+        self.assertEqual(self._catalog_columns(), ["id", "name", "unit_price", "stock"])
+        self.assertEqual(self._indexes(), {"idx_products_price", "idx_products_stock"})
+        self.assertEqual(self._query("SELECT unit_price FROM products WHERE id = 3"), [(3.0,)])
+
+    def test_rebuild_rename_in_batches(self):
+        """Reconstruction par lots : progression, rowid, contraintes, index et triggers conservés"""
+        calls = []
+        copied = self.manager.rebuild_table("products", rename={"price": "unit_price"}, batch_size=100,
+                                            progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(copied, 250)
+        self.assertEqual(calls, [(100, 250), (200, 250), (250, 250)])
+        self.assertEqual(self._catalog_columns(), ["id", "name", "unit_price", "stock"])
+        self.assertEqual(self._indexes(), {"idx_products_price", "idx_products_stock"})
+        self.assertEqual(self._query("SELECT id, name, unit_price FROM products WHERE id = 11"), [(11, "p10", 15.0)])
+        with self.assertRaises(sqlite3.IntegrityError):
+            self._query("UPDATE products SET unit_price = -1 WHERE id = 1")
+        with self.assertRaises(sqlite3.IntegrityError):
+            self._query("INSERT INTO products (name) VALUES ('p1')")
+        self._query("UPDATE products SET unit_price = 99 WHERE id = 2")
+        self.assertEqual(self._query("SELECT * FROM price_log"), [(2, 99.0)])
+        self.assertEqual(self._query(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'products__rebuild%'"), [(0,)])
+
+    def test_rebuild_mirrors_concurrent_writes(self):
+        """Les écritures faites entre deux lots sont reportées dans la nouvelle table"""
+        def write_during_copy(done, total):
+            if done == 100:
+                self._query("UPDATE products SET stock = -1 WHERE id = 5")
+                self._query("UPDATE products SET stock = -2 WHERE id = 200")
+                self._query("DELETE FROM products WHERE id = 201")
+                self._query("INSERT INTO products (name, price) VALUES ('late', 1)")
+        self.manager.alter_column_type("products", "stock", "REAL", batch_size=100, progress=write_during_copy)
+        self.assertEqual(self._query("SELECT stock FROM products WHERE id IN (5, 200) ORDER BY id"),
+                         [(-1.0,), (-2.0,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM products WHERE id = 201"), [(0,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM products"), [(250,)])
+        self.assertEqual(self._query("SELECT type FROM pragma_table_info('products') WHERE name = 'stock'"),
+                         [("REAL",)])
+
+    def test_drop_indexed_column_falls_back_to_rebuild(self):
+        """DROP COLUMN d'une colonne indexée : reconstruction et abandon de son index"""
+        self.manager.drop_column("products", "stock")
+        self.assertEqual(self._catalog_columns(), ["id", "name", "price"])
+        self.assertEqual(self._indexes(), {"idx_products_price"})
+        self.assertEqual(self._query("SELECT COUNT(*) FROM products"), [(250,)])
+        self.manager.drop_column("products", "price")
+        self.assertEqual(self._catalog_columns(), ["id", "name"])
+
+    def test_rebuild_rejects_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.manager.rebuild_table("products", drop=["missing"])
+
+
+if __name__ == '__main__':
+    unittest.main()